@@ -0,0 +1,278 @@
+import sys
+from connect_to_db import commit, rollback, transactional
+from query_utils import period_filter
+from sales_rollups import compare_rows
+from fiscal_years import open_period_filter
+
+# Per-account, per-month totals of journal_entry_lines, kept current by
+# every journal write path so the statement views read one row per
+# account and month instead of every line ever posted.
+# account_balances: one row per (account_code, period) where period is
+# the first day of the month of journal_entries.entry_date.
+
+# Bumped whenever this process changes account_balances; caches of
+# figures derived from it (financial_statements) compare against it.
+balances_version = 0
+
+
+def _changed():
+    global balances_version
+    balances_version += 1
+
+
+def period_of(column):
+    """SQL expression for the first day of column's month."""
+    return f"({column} - INTERVAL (DAY({column}) - 1) DAY)"
+
+
+def record_journal_balances(cursor, journal_id, sign=1):
+    """Add (sign=1) or take off (sign=-1) a journal's lines. Call after
+    inserting the lines, or before deleting them."""
+    cursor.execute(f"""
+    INSERT INTO account_balances (account_code, period, debit_total,
+        credit_total)
+    SELECT l.account_code, {period_of("j.entry_date")},
+        %s * COALESCE(SUM(l.debit), 0), %s * COALESCE(SUM(l.credit), 0)
+    FROM journal_entry_lines l
+    JOIN journal_entries j ON j.journal_id = l.journal_id
+    WHERE l.journal_id = %s AND l.account_code IS NOT NULL
+    GROUP BY l.account_code, j.entry_date
+    ON DUPLICATE KEY UPDATE
+        debit_total = debit_total + VALUES(debit_total),
+        credit_total = credit_total + VALUES(credit_total)
+    """, (sign, sign, journal_id))
+    _changed()
+
+
+def _balances_query(year=None):
+    """SELECT computing account_balances from the journal lines."""
+    where, params = "", []
+    if year:
+        period, params = period_filter("j.entry_date", year)
+        where = f"AND {period}"
+    query = f"""
+    SELECT l.account_code, {period_of("j.entry_date")} AS period,
+        COALESCE(SUM(l.debit), 0) AS debit_total,
+        COALESCE(SUM(l.credit), 0) AS credit_total
+    FROM journal_entry_lines l
+    JOIN journal_entries j ON j.journal_id = l.journal_id
+    WHERE l.account_code IS NOT NULL {where}
+    GROUP BY l.account_code, {period_of("j.entry_date")}
+    """
+    return query, params
+
+
+def _balances_where(year):
+    if not year:
+        return "", []
+    period, params = period_filter("period", year)
+    return f"WHERE {period}", params
+
+
+def fill_account_balances(cursor, year=None):
+    """Recompute account_balances (one year, or all of it) from the
+    journal lines. Returns the number of rows written."""
+    where, params = _balances_where(year)
+    cursor.execute(f"DELETE FROM account_balances {where};", tuple(params))
+    query, params = _balances_query(year)
+    cursor.execute(f"""
+    INSERT INTO account_balances (account_code, period, debit_total,
+        credit_total)
+    {query}
+    """, tuple(params))
+    _changed()
+    return cursor.rowcount
+
+
+@transactional
+def rebuild_account_balances(conn, year=None):
+    """Backfill account_balances from journal_entry_lines."""
+    try:
+        with conn.cursor() as cursor:
+            count = fill_account_balances(cursor, year)
+        commit(conn)
+        return True, f"Account Balances Rebuilt With {count} Row(s)."
+    except Exception as e:
+        rollback(conn)
+        return False, f"Error Rebuilding Account Balances: {str(e)}."
+
+
+def verify_account_balances(conn, year=None):
+    """Reconcile account_balances with the raw journal lines.
+    Returns: (True, message) or (False, message listing differing
+    account periods)."""
+    try:
+        # Rows netting to zero (e.g. after deletions) count as no row
+        key = ("account_code", "period")
+        query, params = _balances_query(year)
+        with conn.cursor(dictionary=True) as cursor:
+            cursor.execute(query, tuple(params))
+            expected = {
+                tuple(row[k] for k in key): row for row in cursor.fetchall()
+                if row["debit_total"] or row["credit_total"]
+            }
+            where, params = _balances_where(year)
+            cursor.execute(f"""
+            SELECT account_code, period, debit_total, credit_total
+            FROM account_balances {where}
+            """, tuple(params))
+            actual = {
+                tuple(row[k] for k in key): row for row in cursor.fetchall()
+                if row["debit_total"] or row["credit_total"]
+            }
+        return compare_rows(expected, actual, lambda want, have: (
+            round(want["debit_total"], 2) == round(have["debit_total"], 2)
+            and round(want["credit_total"], 2)
+            == round(have["credit_total"], 2)
+        ), "Account Balances")
+    except Exception as e:
+        return False, f"Error Verifying Account Balances: {str(e)}."
+
+
+# Financial statement views over account_balances. Closed years are
+# carried into the next year by its opening entry, so only open years are
+# joined; summing every period would count closed balances twice.
+_OPEN_BALANCES = f"""LEFT JOIN account_balances b ON a.code = b.account_code
+            AND {open_period_filter("b.period")}"""
+STATEMENT_VIEWS = {
+    "trial_balance": f"""
+        SELECT
+            a.code,
+            a.account_name,
+            a.account_type,
+            SUM(b.debit_total) AS total_debit,
+            SUM(b.credit_total) AS total_credit,
+            SUM(b.debit_total - b.credit_total) AS balance
+        FROM chart_of_accounts a
+        {_OPEN_BALANCES}
+        GROUP BY a.code, a.account_name, a.account_type
+    """,
+    "income_statement": f"""
+        SELECT
+            'Revenue' AS category,
+            a.code AS account_code,
+            a.account_name,
+            COALESCE(SUM(b.credit_total - b.debit_total), 0.00) AS amount
+        FROM chart_of_accounts a
+        {_OPEN_BALANCES}
+        WHERE a.account_type = 'Revenue'
+        GROUP BY a.code, a.account_name
+
+        UNION ALL
+
+        SELECT
+            'Expense' AS category,
+            a.code AS account_code,
+            a.account_name,
+            COALESCE(SUM(b.debit_total - b.credit_total), 0.00) AS amount
+        FROM chart_of_accounts a
+        {_OPEN_BALANCES}
+        WHERE a.account_type = 'Expense'
+        GROUP BY a.code, a.account_name
+    """,
+    "balance_sheet": f"""
+        SELECT
+            a.account_type AS category,
+            a.code AS account_code,
+            a.account_name,
+            COALESCE(
+                CASE
+                    WHEN a.account_type = 'Asset'
+                        THEN SUM(b.debit_total - b.credit_total)
+                    WHEN a.account_type IN ('Liability', 'Equity')
+                        THEN SUM(b.credit_total - b.debit_total)
+                    ELSE 0
+                END, 0.00
+            ) AS amount
+        FROM chart_of_accounts a
+        {_OPEN_BALANCES}
+        WHERE a.account_type IN ('Asset', 'Liability', 'Equity')
+        GROUP BY a.account_type, a.code, a.account_name
+    """,
+    "cash_flow_statement": f"""
+        SELECT
+            'Operating Activity' AS category,
+            a.code AS account_code,
+            a.account_name,
+            CASE
+                WHEN SUM(b.credit_total - b.debit_total) >= 0
+                    THEN 'inflow' ELSE 'outflow'
+            END AS cash_flow_type,
+            COALESCE(SUM(b.credit_total - b.debit_total), 0.00) AS amount
+        FROM chart_of_accounts a
+        {_OPEN_BALANCES}
+        -- Remove non-cash
+        WHERE a.account_type IN ('Revenue', 'Expense')
+        AND account_name NOT LIKE '%Depreciation%'
+        GROUP BY a.code, a.account_name
+
+        UNION ALL
+
+        -- Financing Activities
+        SELECT
+            'Financing Activity' AS category,
+            a.code AS account_code,
+            a.account_name,
+            CASE
+                WHEN SUM(b.credit_total - b.debit_total) >= 0
+                    THEN 'inflow' ELSE 'outflow'
+            END AS cash_flow_type,
+            COALESCE(SUM(b.credit_total - b.debit_total), 0.00) AS amount
+        FROM chart_of_accounts a
+        {_OPEN_BALANCES}
+        WHERE a.account_type IN ('Equity', 'Liability')
+        GROUP BY a.code, a.account_name
+
+        UNION ALL
+
+        -- Investing Activities
+        SELECT
+            'Investing Activities' AS category,
+            a.code AS account_code,
+            a.account_name,
+            CASE
+                WHEN SUM(b.credit_total - b.debit_total) >= 0
+                    THEN 'inflow' ELSE 'outflow'
+            END AS cash_flow_type,
+            COALESCE(SUM(b.credit_total - b.debit_total), 0.00) AS amount
+        FROM chart_of_accounts a
+        {_OPEN_BALANCES}
+        WHERE a.account_type = 'Asset'
+        GROUP BY a.code, a.account_name
+    """,
+}
+
+
+def create_account_balances_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS account_balances (
+            account_code VARCHAR(20) NOT NULL,
+            period DATE NOT NULL,
+            debit_total DECIMAL(15, 2) NOT NULL DEFAULT 0,
+            credit_total DECIMAL(15, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (account_code, period),
+            INDEX idx_account_balances_period (period),
+            FOREIGN KEY (account_code) REFERENCES chart_of_accounts(code)
+                ON UPDATE CASCADE
+                ON DELETE CASCADE
+        );
+    """)
+
+
+def create_statement_views(cursor):
+    """(Re)create the financial statement views over account_balances."""
+    for name, query in STATEMENT_VIEWS.items():
+        cursor.execute(f"CREATE OR REPLACE VIEW {name} AS {query};")
+
+
+if __name__ == "__main__":
+    # python account_balances.py rebuild|verify [year]
+    from connect_to_db import connect_db
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    year = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    conn = connect_db()
+    if command == "rebuild":
+        success, msg = rebuild_account_balances(conn, year)
+    else:
+        success, msg = verify_account_balances(conn, year)
+    print(success, msg)
@@ -1,16 +1,20 @@
 import tkinter as tk
 from base_window import BaseWindow
 from tkinter import ttk, messagebox
-from datetime import datetime
+from datetime import datetime, timedelta
 from authentication import VerifyPrivilegePopup
 from accounting_export import ReportExporter
-from table_utils import TreeviewSorter
-from windows_utils import CurrencyFormatter, SentenceCapitalizer
+from table_utils import TreeviewSorter, VirtualTreeview
+from paged_loader import PagedLoader
+from windows_utils import (
+    CurrencyFormatter, SentenceCapitalizer, PeriodSelector
+)
+from financial_statements import fetch_statement_years
 from working_on_accounting import (
     count_accounts_by_type, check_account_name_exists, insert_account,
     get_account_name_and_code, insert_opening_balance, insert_journal_entry,
     fetch_journal_lines_by_account_code, get_account_by_name_or_code,
-    reverse_journal_entry, fetch_all_journal_lines_with_names,
+    reverse_journal_entry, journal_lines_query,
     get_balance_sheet, fetch_trial_balance, get_income_statement,
     CashFlowStatement, delete_journal_entry, insert_finance_log
 )
@@ -755,6 +759,12 @@ class ReverseJournalPopup(BaseWindow):
         self.sorter.apply_style(style)
         self.sorter.attach_sorting()
         self.sorter.bind_mousewheel()
+        self.loader = PagedLoader(
+            self.window, self.show_rows,
+            on_error=lambda msg: messagebox.showerror(
+                "Error", msg, parent=self.window
+            )
+        )
 
         self.build_ui()
         self.populate_table()
@@ -788,20 +798,20 @@ class ReverseJournalPopup(BaseWindow):
         y_scroll = ttk.Scrollbar(
             self.table_frame, orient="vertical", command=self.tree.yview
         )
-        self.tree.configure(yscrollcommand=y_scroll.set)
+        self.loader.watch(self.tree, y_scroll)
         self.tree.pack(side="left", fill="both", expand=True)
         y_scroll.pack(side="right", fill="y")
         self.tree.tag_configure("evenrow", background="#fffde7")
         self.tree.tag_configure("oddrow", background="#e0f7e9")
 
     def populate_table(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        rows = fetch_all_journal_lines_with_names(self.conn)
-        if isinstance(rows, str):
-            messagebox.showerror("Error", rows)
-            return
-        for i, row in enumerate(rows, start=1):
+        self.loader.start(journal_lines_query())
+
+    def show_rows(self, rows, start, first):
+        """Append a page of journal lines; the first page replaces them."""
+        if first:
+            self.tree.delete(*self.tree.get_children())
+        for i, row in enumerate(rows, start=start + 1):
             tag = "evenrow" if i % 2 == 0 else "oddrow"
             self.tree.insert("", "end", values=(
                 i,
@@ -914,7 +924,7 @@ class ViewJournalWindow(BaseWindow):
         self.tree = ttk.Treeview(
             self.table_frame, columns=self.columns, show="headings"
         )
-        self.sorter = TreeviewSorter(self.tree, self.columns, "No.")
+        self.sorter = VirtualTreeview(self.tree, self.columns, "No.")
         self.sorter.apply_style(style)
         self.sorter.attach_sorting()
         self.sorter.bind_mousewheel()
@@ -970,10 +980,8 @@ class ViewJournalWindow(BaseWindow):
         for col in self.columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, anchor="center", width=30)
-        vsb = ttk.Scrollbar(
-            self.table_frame, orient="vertical", command=self.tree.yview
-        )
-        self.tree.configure(yscrollcommand=vsb.set)
+        vsb = ttk.Scrollbar(self.table_frame, orient="vertical")
+        self.sorter.attach_scrollbar(vsb)
         vsb.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
         self.tree.tag_configure("evenrow", background="#fffde7")
@@ -1001,8 +1009,7 @@ class ViewJournalWindow(BaseWindow):
             )
 
     def display_journal_lines(self, account_code, account_name):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        self.sorter.clear()
         lines = fetch_journal_lines_by_account_code(self.conn, account_code)
         if not lines:
             return
@@ -1012,14 +1019,14 @@ class ViewJournalWindow(BaseWindow):
         self.title_var.set(f"{account_name}({account_code})")
         for idx, line in enumerate(lines, start=1):
             tag = "evenrow" if idx % 2 == 0 else "oddrow"
-            self.tree.insert("", "end", values=(
+            self.sorter.insert((
                 idx,
                 line["entry_date"].strftime("%d/%m/%Y"),
                 line["journal_id"],
                 line["description"],
                 f"{line['debit']:,.2f}",
                 f"{line['credit']:,.2f}",
-            ), tags=(tag,))
+            ), (tag,))
             total_debit += line["debit"]
             total_credit += line["credit"]
         # Insert balance carried down if necessary
@@ -1028,24 +1035,24 @@ class ViewJournalWindow(BaseWindow):
         if total_debit > total_credit:
             desc = f"Balance C/d as at {today}"
             balance = total_debit - total_credit
-            self.tree.insert("", "end", values=(
+            self.sorter.insert((
                 "", "", "", desc, 0.00, f"{balance:,}"
-            ), tags=("totalrow",))
+            ), ("totalrow",))
         elif total_credit > total_debit:
             desc = f"Balance C/d as at {today}"
             balance = total_credit - total_debit
-            self.tree.insert("", "end", values=(
+            self.sorter.insert((
                 "", "", "", desc, f"{balance:,}", 0.00
-            ), tags=("totalrow",))
-        self.tree.insert("", "end", values=(
+            ), ("totalrow",))
+        self.sorter.insert((
             "", "", "", "Total", f"{balancing:,}", f"{balancing:,}"
-        ), tags=("total",))
+        ), ("total",))
+        self.sorter.render()
         self.sorter.autosize_columns()
 
     def _collect_current_rows(self):
         rows = []
-        for item in self.tree.get_children():
-            vals = self.tree.item(item, "values")
+        for vals in self.sorter.values():
             rows.append(
                 {
                     "No.": vals[0],
@@ -1181,7 +1188,11 @@ class TrialBalanceWindow(BaseWindow):
         )
 
     def populate_table(self):
-        data = fetch_trial_balance(self.conn)
+        self.run_in_background(
+            self.window, fetch_trial_balance, on_done=self.show_rows
+        )
+
+    def show_rows(self, data):
         if isinstance(data, str):
             messagebox.showerror("Error", data, parent=self.window)
             return
@@ -1284,6 +1295,9 @@ class IncomeStatementWindow(BaseWindow):
         self.window.grab_set()
 
         self.conn = conn
+        self.years, error = fetch_statement_years(conn)
+        if error:
+            messagebox.showerror("Error", error, parent=self.window)
         self.columns = (
             "No", "Category", "Account Name", "Code", "Amount"
         )
@@ -1313,12 +1327,15 @@ class IncomeStatementWindow(BaseWindow):
             self.main_frame, bg="lightblue", bd=2, relief="ridge"
         )
         top_frame.pack(fill="x")
-        year = datetime.now().date().year
-        title_text = f"Income Statement For Year Ended {year}."
-        tk.Label(
-            top_frame, text=title_text, bg="lightblue", fg="blue", bd=4,
+        self.title_label = tk.Label(
+            top_frame, bg="lightblue", fg="blue", bd=4,
             relief="flat", font=("Arial", 20, "bold", "underline")
-        ).pack(side="left", ipadx=10, anchor="s")
+        )
+        self.title_label.pack(side="left", ipadx=10, anchor="s")
+        self.period = PeriodSelector(
+            top_frame, self.years, command=self.populate_table
+        )
+        self.period.pack(side="left", padx=10, anchor="s")
         # Buttons Frame
         btn_frame = tk.Frame(top_frame, bg="lightblue")
         btn_frame.pack(side="right", anchor="s")
@@ -1350,8 +1367,24 @@ class IncomeStatementWindow(BaseWindow):
             background="#c5cae9"
         )
 
+    def report_title(self):
+        period = self.period.describe()
+        if not period:
+            return "Income Statement To Date."
+        if period.startswith("Year "):
+            period = period.replace("Year", "Year Ended")
+        return f"Income Statement For {period}."
+
     def populate_table(self):
-        success, result = get_income_statement(self.conn)
+        self.title_label.configure(text=self.report_title())
+        start, end = self.period.bounds()
+        self.run_in_background(
+            self.window, get_income_statement, start, end,
+            on_done=self.show_rows
+        )
+
+    def show_rows(self, result):
+        success, result = result
         if not success:
             messagebox.showerror("Error", result, parent=self.window)
             return
@@ -1396,8 +1429,7 @@ class IncomeStatementWindow(BaseWindow):
         return rows
 
     def _make_exporter(self):
-        year = datetime.now().date().year
-        title = f"Income Statement For Year Ended {year}."
+        title = self.report_title()
         columns = [
             "No", "Category", "Account Name", "Code", "Amount"
         ]
@@ -1427,6 +1459,9 @@ class CashFlowStatementWindow(BaseWindow):
         self.window.grab_set()
 
         self.conn = conn
+        self.years, error = fetch_statement_years(conn)
+        if error:
+            messagebox.showerror("Error", error, parent=self.window)
         self.columns = (
             "No", "Category", "Account Code", "Account Name", "Amount",
             "Total"
@@ -1453,12 +1488,15 @@ class CashFlowStatementWindow(BaseWindow):
         # Title Frame
         top_frame = tk.Frame(self.main_frame, bg="lightblue")
         top_frame.pack(fill="x", padx=5)
-        current_year = datetime.now().year
-        title_text = f"Cash Flow Statement For Year {current_year}."
-        tk.Label(
-            top_frame, text=title_text, bg="lightblue", fg="blue", bd=4,
+        self.title_label = tk.Label(
+            top_frame, bg="lightblue", fg="blue", bd=4,
             relief="flat", font=("Arial", 20, "bold", "underline"),
-        ).pack(side="left", anchor="s", ipadx=10)
+        )
+        self.title_label.pack(side="left", anchor="s", ipadx=10)
+        self.period = PeriodSelector(
+            top_frame, self.years, command=self.populate_table
+        )
+        self.period.pack(side="left", padx=10, anchor="s")
         # Buttons Frame
         btn_frame = tk.Frame(top_frame, bg="lightblue")
         btn_frame.pack(side="right", anchor="s")
@@ -1486,9 +1524,22 @@ class CashFlowStatementWindow(BaseWindow):
         self.tree.tag_configure("evenrow", background="#fffde7")
         self.tree.tag_configure("oddrow", background="#e0f7e9")
 
+    def report_title(self):
+        period = self.period.describe() or "To Date"
+        return f"Cash Flow Statement For {period}."
+
     def populate_table(self):
-        fetch = CashFlowStatement(self.conn)
-        result = fetch.get_cash_flow_statement()
+        self.title_label.configure(text=self.report_title())
+        start, end = self.period.bounds()
+        self.run_in_background(
+            self.window,
+            lambda conn: CashFlowStatement(conn).get_cash_flow_statement(
+                start, end
+            ),
+            on_done=self.show_rows
+        )
+
+    def show_rows(self, result):
         if isinstance(result, str):
             messagebox.showerror("Error", result, parent=self.window)
             return
@@ -1560,7 +1611,7 @@ class CashFlowStatementWindow(BaseWindow):
         return rows
 
     def _make_exporter(self):
-        title = f"Cash Flow Statement For Year {datetime.now().date().year}."
+        title = self.report_title()
         columns = [
             "No", "Category", "Account Code", "Account Name", "Amount",
             "Total"
@@ -1591,6 +1642,9 @@ class BalanceSheetWindow(BaseWindow):
         self.window.grab_set()
 
         self.conn = conn
+        self.years, error = fetch_statement_years(conn)
+        if error:
+            messagebox.showerror("Error", error, parent=self.window)
         style = ttk.Style(self.window)
         style.theme_use("clam")
         self.columns = (
@@ -1617,12 +1671,15 @@ class BalanceSheetWindow(BaseWindow):
         # Title Frame
         title_frame = tk.Frame(self.main_frame, bg="lightblue")
         title_frame.pack(fill="x", ipadx=5)
-        year = datetime.now().year
-        title_text = f"Balance Sheet For Year Ended {year}"
-        tk.Label(
-            title_frame, text=title_text, bg="lightblue", fg="blue", bd=2,
+        self.title_label = tk.Label(
+            title_frame, bg="lightblue", fg="blue", bd=2,
             relief="ridge", font=("Arial", 20, "bold", "underline"),
-        ).pack(side="left", ipadx=10)
+        )
+        self.title_label.pack(side="left", ipadx=10)
+        self.period = PeriodSelector(
+            title_frame, self.years, command=self.populate_table
+        )
+        self.period.pack(side="left", padx=10, anchor="s")
         # Buttons Frame
         btn_frame = tk.Frame(title_frame, bg="lightblue")
         btn_frame.pack(side="right", anchor="s")
@@ -1663,8 +1720,23 @@ class BalanceSheetWindow(BaseWindow):
             background="blue", foreground="white"
         )
 
+    def as_of(self):
+        """Last day of the selected period, or None for today."""
+        _, end = self.period.bounds()
+        return end - timedelta(days=1) if end else None
+
+    def report_title(self):
+        as_of = self.as_of() or datetime.now().date()
+        return f"Balance Sheet As At {as_of:%d/%m/%Y}"
+
     def populate_table(self):
-        result = get_balance_sheet(self.conn)
+        self.title_label.configure(text=self.report_title())
+        self.run_in_background(
+            self.window, get_balance_sheet, self.as_of(),
+            on_done=self.show_rows
+        )
+
+    def show_rows(self, result):
         if isinstance(result, str):
             messagebox.showerror("Error", result)
             return
@@ -1759,8 +1831,7 @@ class BalanceSheetWindow(BaseWindow):
         return rows
 
     def _make_exporter(self):
-        year = datetime.now().year
-        title = f"Balance Sheet For Year Ended {year}"
+        title = self.report_title()
         columns = ["No", "Account Code", "Account Name", "Debit", "Credit"]
         rows = self._collect_rows()
         return ReportExporter(self.window, title, columns, rows)
@@ -1786,7 +1857,7 @@ class CloseYearPopup(BaseWindow):
         self.window = tk.Toplevel(master)
         self.window.title("Close Accounting Year")
         self.window.configure(bg="lightblue")
-        self.center_window(self.window, 300, 250, master)
+        self.center_window(self.window, 300, 280, master)
         self.window.transient(master)
         self.window.grab_set()
 
@@ -1835,6 +1906,11 @@ class CloseYearPopup(BaseWindow):
             relief="groove", font=("Arial", 11, "bold"),
             command=self.perform_action,
         )
+        # Progress of a running close
+        self.status_label = tk.Label(
+            self.middle_frame, text="", bg="lightblue", fg="blue",
+            font=("Arial", 10, "italic")
+        )
 
         self.build_ui()
 
@@ -1853,7 +1929,8 @@ class CloseYearPopup(BaseWindow):
         self.mode_title_label.pack(anchor="center", pady=(3, 0), ipadx=5)
         self.select_label.pack(anchor="w", pady=(5, 0))
         self.combobox.pack(anchor="w", fill="x", pady=(0, 5))
-        self.action_btn.pack(pady=10)
+        self.action_btn.pack(pady=(10, 0))
+        self.status_label.pack(pady=(0, 5))
         # Default to close year
         self.show_close_year()
 
@@ -1906,33 +1983,16 @@ class CloseYearPopup(BaseWindow):
                     "Error", "Invalid Period Format.", parent=self.window
                 )
                 return
-            confirm = messagebox.askyesno(
-                "Confirm",
-                f"Close Accounting Year: {closing_year}?", parent=self.window
+            # Dry run first so the confirmation shows what will change
+            self.status_label.config(text="Preparing Preview...")
+            self.action_btn.config(state="disabled")
+            self.run_in_background(
+                self.window, preview_close_year, closing_year,
+                on_done=lambda result: self.confirm_close(
+                    closing_year, result
+                ),
+                on_error=self.close_failed
             )
-            if confirm:
-                processor = YearEndProcessor(self.conn)
-                success, msg = processor.close_year(closing_year)
-                if success:
-                    messagebox.showinfo(
-                        "Success", f"Closed Year:\n{msg}", parent=self.window
-                    )
-                    receipt = date.today().strftime("%d/%m/%Y")
-                    action = f"Closed Year {closing_year}."
-                    success, status = insert_finance_log(
-                        self.conn, self.user, f"Closing {receipt}", action
-                    )
-                    if success:
-                        messagebox.showinfo(
-                            "Success", status, parent=self.window
-                        )
-                    else:
-                        messagebox.showerror(
-                            "Failed", f"Failed to Log Action:\n{status}.",
-                            parent=self.window
-                        )
-                else:
-                    messagebox.showerror("Failed", msg, parent=self.window)
         else:
             try:
                 reversing_year = int(selected)
@@ -1969,4 +2029,67 @@ class CloseYearPopup(BaseWindow):
                     messagebox.showerror(
                         "Failed", f"Failed to Reverse Closed Year:\n{msg}.",
                         parent=self.window
-                    )
\ No newline at end of file
+                    )
+
+    def confirm_close(self, closing_year, result):
+        self.status_label.config(text="")
+        self.action_btn.config(state="normal")
+        success, preview = result
+        if not success:
+            messagebox.showerror("Failed", preview, parent=self.window)
+            return
+        if not preview["lines"]:
+            messagebox.showinfo(
+                "Nothing to Close",
+                f"No Journal Lines Found For {closing_year}.",
+                parent=self.window
+            )
+            return
+        confirm = messagebox.askyesno(
+            "Confirm",
+            f"Close Accounting Year: {closing_year}?\n\n"
+            f"{YearEndProcessor.describe(closing_year, preview)}",
+            parent=self.window
+        )
+        if not confirm:
+            return
+        self.action_btn.config(state="disabled")
+        self.run_in_background(
+            self.window, close_year, closing_year, with_task=True,
+            on_progress=self.show_close_progress,
+            on_done=lambda result: self.finish_close(closing_year, result),
+            on_error=self.close_failed
+        )
+
+    def close_failed(self, message):
+        """Background preview or close raised: re-enable the form."""
+        self.status_label.config(text="")
+        self.action_btn.config(state="normal")
+        messagebox.showerror("Error", message, parent=self.window)
+
+    def show_close_progress(self, step, steps, name):
+        self.status_label.config(text=f"Step {step} of {steps}: {name}...")
+
+    def finish_close(self, closing_year, result):
+        self.status_label.config(text="")
+        self.action_btn.config(state="normal")
+        success, msg = result
+        if not success:
+            messagebox.showerror("Failed", msg, parent=self.window)
+            return
+        messagebox.showinfo(
+            "Success", f"Closed Year:\n{msg}", parent=self.window
+        )
+        receipt = date.today().strftime("%d/%m/%Y")
+        action = f"Closed Year {closing_year}."
+        success, status = insert_finance_log(
+            self.conn, self.user, f"Closing {receipt}", action
+        )
+        if success:
+            messagebox.showinfo("Success", status, parent=self.window)
+        else:
+            messagebox.showerror(
+                "Failed", f"Failed to Log Action:\n{status}.",
+                parent=self.window
+            )
+        self.show_close_year()
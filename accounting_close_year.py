@@ -1,131 +1,268 @@
 from datetime import date
 import calendar
+from working_on_accounting import account_cache
+from query_utils import period_filter
+from connect_to_db import commit, rollback, on_rollback, transactional
+from account_balances import fill_account_balances, record_journal_balances
+from fiscal_years import (
+    latest_closed_year, earliest_open_year, fetch_opening_journal,
+    mark_closed, mark_open, open_period_filter
+)
 
 class YearEndProcessor:
+    """Closes a year set-wise: balances are summed once into a temporary
+    table, the opening entry is written with INSERT ... SELECT and the
+    year is flagged closed in fiscal_years, all in a single transaction.
+    The year's journals stay in place. Periods use entry_date ranges, not
+    YEAR(entry_date)."""
+    RETAINED_CODE = "3000"
+    STEPS = (
+        "Summing Balances", "Posting Opening Balances", "Closing Period"
+    )
+
     def __init__(self, conn):
         self.conn = conn
 
-    def close_year(self, closing_year):
+    @staticmethod
+    def _unclosable(closing_year):
+        """Error message if closing_year has not ended yet, else None.
+        Postings dated today would land in the closed year and drop out
+        of the live ledger."""
+        if closing_year >= date.today().year:
+            return f"Year {closing_year} Has Not Ended Yet."
+        return None
+
+    @staticmethod
+    def _out_of_order(cursor, closing_year):
+        """Error message unless closing_year is the earliest open year.
+        Its opening entry carries the balances the next close sums, so
+        years are closed one by one, oldest first."""
+        earliest = earliest_open_year(cursor)
+        if earliest is None or closing_year == earliest:
+            return None
+        if closing_year < earliest:
+            return f"Year {closing_year} Is Already Closed."
+        return f"Close Year {earliest} Before Year {closing_year}."
+
+    def preview(self, closing_year):
+        """Dry run: what close_year would do, without writing anything.
+        Returns: (True, summary dict) or (False, error_message)."""
+        error = self._unclosable(closing_year)
+        if error:
+            return False, error
         try:
-            cursor = self.conn.cursor()
-            # 1. Ensure Retained Earnings Account Exists
-            retained_code = "3000"
-            retained_name = f"Retained Earnings For {date.today().year}"
-            cursor.execute(
-                "SELECT * FROM chart_of_accounts WHERE code=%s;",
-                (retained_code,)
+            with self.conn.cursor() as cursor:
+                error = self._out_of_order(cursor, closing_year)
+            if error:
+                return False, error
+            period, bounds = period_filter("j.entry_date", closing_year)
+            with self.conn.cursor(dictionary=True) as cursor:
+                cursor.execute(f"""
+                    SELECT
+                        COUNT(DISTINCT j.journal_id) AS journals,
+                        COUNT(l.line_id) AS lines
+                    FROM journal_entries j
+                    LEFT JOIN journal_entry_lines l
+                        ON l.journal_id = j.journal_id
+                    WHERE {period}
+                    """, tuple(bounds))
+                summary = cursor.fetchone()
+                cursor.execute(f"""
+                    SELECT
+                        SUM(b.account_type IN ('Asset', 'Liability', 'Equity')
+                            AND b.net <> 0) AS carried_accounts,
+                        COALESCE(SUM(CASE
+                            WHEN b.account_type IN ('Revenue', 'Expense')
+                                THEN b.net END), 0) AS retained_net
+                    FROM ({self._balances_query(period)}) b
+                    """, tuple(bounds))
+                summary.update(cursor.fetchone())
+            summary["carried_accounts"] = int(
+                summary["carried_accounts"] or 0
             )
-            if not cursor.fetchone():
-                desc = "Year-end retained earnings"
-                cursor.execute("""
-                INSERT INTO chart_of_accounts(account_name, account_type,
-                    code, description)
-                VALUES (%s, %s, %s, %s)
-                """, (retained_name, 'Equity', retained_code, desc))
-            # 2. Calculate Balances per Account
-            cursor.execute("""
-                SELECT
-                    l.account_code,
-                    a.account_name,
-                    a.account_type,
-                    SUM(l.debit) AS total_debit,
-                    SUM(l.credit) AS total_credit
-                FROM journal_entry_lines l
-                JOIN chart_of_accounts a ON l.account_code = a.code
-                JOIN journal_entries j ON l.journal_id = j.journal_id
-                WHERE YEAR(j.entry_date) = %s
-                GROUP BY l.account_code
-                """, (closing_year,))
-            balances = cursor.fetchall()
-            # 3. Archive to journal archive
-            cursor.execute("""
-            INSERT INTO journal_archive (date, account_code, account_name,
-                description, debit, credit, period_end_year)
+            # Profit (credits over debits) is credited to retained earnings
+            summary["retained_earnings"] = -summary.pop("retained_net")
+            return True, summary
+        except Exception as e:
+            return False, f"Year End Preview Failed: {str(e)}."
+
+    @staticmethod
+    def describe(closing_year, summary):
+        """One paragraph summary of a preview for confirmation dialogs."""
+        return (
+            f"Closing {closing_year} locks {summary['lines']:,} "
+            f"line(s) from {summary['journals']:,} journal(s), carries "
+            f"{summary['carried_accounts']:,} balance sheet account(s) "
+            f"into {closing_year + 1} and posts retained earnings of "
+            f"{summary['retained_earnings']:,.2f}."
+        )
+
+    @staticmethod
+    def _balances_query(period):
+        """Net (debit - credit) per account over a period of journals."""
+        return f"""
             SELECT
-                j.entry_date,
                 l.account_code,
-                a.account_name,
-                l.description,
-                l.debit,
-                l.credit,
-                %s
+                a.account_type,
+                COALESCE(SUM(l.debit), 0) - COALESCE(SUM(l.credit), 0) AS net
             FROM journal_entry_lines l
             JOIN chart_of_accounts a ON l.account_code = a.code
             JOIN journal_entries j ON l.journal_id = j.journal_id
-            WHERE YEAR(j.entry_date) = %s
-            """, (closing_year, closing_year))
-            # 4. Clear existing journal data
-            cursor.execute("""
-            DELETE FROM journal_entry_lines
-            WHERE journal_id IN (SELECT journal_id FROM journal_entries WHERE YEAR(entry_date) = %s)
-            """, (closing_year,))
-            cursor.execute(
-                "DELETE FROM journal_entries WHERE YEAR(entry_date) = %s;",
-                (closing_year,)
-            )
-            # 5. Insert opening balances for Asset, Liability and Equity
-            today = date.today()
-            cursor.execute("""
-                INSERT INTO journal_entries (entry_date, reference_no)
-                VALUES (%s, %s)
-                """, (today, f"Opening Balance {closing_year + 1}"))
-            opening_journal_id = cursor.lastrowid
-            retained_earnings = 0
-            for account in balances:
-                code, name, acc_type, debit, credit = account
-                net = (debit or 0) - (credit or 0)
-                # For opening only carry forward Assets, Liabilities, Equity
-                if acc_type in ('Asset', 'Liability', 'Equity'):
-                    if net != 0:
-                        if acc_type in ('Asset', 'Expense'):
-                            cursor.execute("""
-                                INSERT INTO journal_entry_lines (journal_id, account_code, description, debit, credit)
-                                VALUES (%s, %s, %s, %s, %s)
-                                """,(opening_journal_id, code, f"Opening balance {closing_year+1}", abs(net), 0.00))
-                        else:
-                            cursor.execute("""
-                                INSERT INTO journal_entry_lines (journal_id, account_code, description, debit, credit)
-                                VALUES (%s, %s, %s, %s, %s)
-                                """, (opening_journal_id, code, f"Opening balance {closing_year+1}", 0.00, abs(net)))
-                elif acc_type in ('Revenue', 'Expense'):
-                    retained_earnings += net
-                # 6. Post Retained Earnings
-                if retained_earnings != 0:
-                    desc = f"Retained earnings {closing_year}"
-                    if retained_earnings > 0:
-                        cursor.execute("""
-                            INSERT INTO journal_entry_lines (journal_id, account_code, description, debit, credit)
-                            VALUES (%s, %s, %s, %s, %s)
-                            """, (opening_journal_id, retained_code, desc, 0.00, abs(retained_earnings)))
-                    else:
-                        cursor.execute("""
-                            INSERT INTO journal_entry_lines (journal_id, account_code, description, debit, credit)
-                            VALUES (%s, %s, %s, %s, %s)
-                            """, (opening_journal_id, retained_code, desc, abs(retained_earnings), 0.00))
-                self.conn.commit()
-                text = "Opening Balances Set and Retained Earnings Posted."
-                return True, f"Year Closed Successfully. {text}"
+            WHERE {period}
+            GROUP BY l.account_code, a.account_type
+        """
+
+    @transactional
+    def close_year(self, closing_year, task=None):
+        """Post the opening balances and retained earnings of the next
+        year and flag closing_year closed, as one unit of work.
+        task (optional) receives report(step_no, step_count, step_name)."""
+        def step(number):
+            if task is not None:
+                task.report(number, len(self.STEPS), self.STEPS[number - 1])
+
+        error = self._unclosable(closing_year)
+        if error:
+            return False, error
+        try:
+            period, bounds = period_filter("j.entry_date", closing_year)
+            retained_code = self.RETAINED_CODE
+            with self.conn.cursor() as cursor:
+                error = self._out_of_order(cursor, closing_year)
+                if error:
+                    return False, error
+                # 1. Ensure Retained Earnings Account Exists
+                retained_name = f"Retained Earnings For {date.today().year}"
+                cursor.execute(
+                    "SELECT 1 FROM chart_of_accounts WHERE code=%s;",
+                    (retained_code,)
+                )
+                if not cursor.fetchone():
+                    desc = "Year-end retained earnings"
+                    cursor.execute("""
+                    INSERT INTO chart_of_accounts(account_name, account_type,
+                        code, description)
+                    VALUES (%s, %s, %s, %s)
+                    """, (retained_name, 'Equity', retained_code, desc))
+                    account_cache.invalidate()
+                    on_rollback(self.conn, account_cache.invalidate)
+                # 2. Calculate Balances per Account, once
+                step(1)
+                cursor.execute(
+                    "DROP TEMPORARY TABLE IF EXISTS closing_balances;"
+                )
+                cursor.execute(f"""
+                CREATE TEMPORARY TABLE closing_balances
+                    (PRIMARY KEY (account_code))
+                {self._balances_query(period)}
+                """, tuple(bounds))
+                # 3. Opening balances for Asset, Liability and Equity, and
+                # the year's Revenue and Expense net into Retained Earnings,
+                # dated the first day of the next year
+                step(2)
+                cursor.execute("""
+                    INSERT INTO journal_entries (entry_date, reference_no)
+                    VALUES (%s, %s)
+                    """, (
+                        date(closing_year + 1, 1, 1),
+                        f"Opening Balance {closing_year + 1}"
+                    ))
+                opening_journal_id = cursor.lastrowid
+                opening_desc = f"Opening balance {closing_year + 1}"
+                cursor.execute("""
+                INSERT INTO journal_entry_lines (journal_id, account_code,
+                    description, debit, credit)
+                SELECT %s, account_code, %s, GREATEST(net, 0),
+                    GREATEST(-net, 0)
+                FROM closing_balances
+                WHERE account_type IN ('Asset', 'Liability', 'Equity')
+                    AND net <> 0
+                ORDER BY account_code
+                """, (opening_journal_id, opening_desc))
+                cursor.execute("""
+                INSERT INTO journal_entry_lines (journal_id, account_code,
+                    description, debit, credit)
+                SELECT %s, %s, %s, GREATEST(SUM(net), 0),
+                    GREATEST(-SUM(net), 0)
+                FROM closing_balances
+                WHERE account_type IN ('Revenue', 'Expense')
+                HAVING SUM(net) <> 0
+                """, (
+                    opening_journal_id, retained_code,
+                    f"Retained earnings {closing_year}"
+                ))
+                cursor.execute("DROP TEMPORARY TABLE closing_balances;")
+                record_journal_balances(cursor, opening_journal_id)
+                # 4. Flag the year closed
+                step(3)
+                mark_closed(cursor, closing_year, opening_journal_id)
+            commit(self.conn)
+            text = "Opening Balances Set and Retained Earnings Posted."
+            return True, f"Year Closed Successfully. {text}"
         except Exception as e:
-            self.conn.rollback()
+            rollback(self.conn)
             return False, f"Year End Closing Failed: {str(e)}."
 
+
+def preview_close_year(conn, closing_year):
+    """Background entry point for YearEndProcessor.preview."""
+    return YearEndProcessor(conn).preview(closing_year)
+
+
+def close_year(conn, closing_year, task=None):
+    """Background entry point for YearEndProcessor.close_year."""
+    return YearEndProcessor(conn).close_year(closing_year, task=task)
+
 class YearEndReversalManager:
     def __init__(self, conn):
         self.conn = conn
     def reverse_year(self, year):
+        try:
+            with self.conn.cursor() as cursor:
+                opening_journal_id = fetch_opening_journal(cursor, year)
+        except Exception as e:
+            return False, f"Error reversing year {year}: {str(e)}."
+        if opening_journal_id is not None:
+            return self.reopen_year(year, opening_journal_id)
+        # Years closed before fiscal_years were archived and deleted
         try:
             data = self.fetch_archive_data(year)
             if not data:
-                return f"No archived data found for year {year}."
+                return False, f"No archived data found for year {year}."
             new_journal_id = self.create_new_journal_entry(f"Reversal of year {year}")
             self.restore_journal_entries(new_journal_id, data)
             self.cleanup_year_plus_one(year)
             self.delete_orphan_journal_entries(year + 1)
+            with self.conn.cursor() as cursor:
+                # Lines were restored and removed across several years
+                fill_account_balances(cursor)
             self.conn.commit()
             return True, f"year {year} successfully reversed and restored."
         except Exception as e:
             self.conn.rollback()
             return False, f"Error reversing year {year}: {str(e)}."
+    @transactional
+    def reopen_year(self, year, opening_journal_id):
+        """Reopen a year closed in place: drop the opening entry it posted
+        and clear its closed flag. Only the latest closed year can be
+        reopened, since later years open from its balances."""
+        try:
+            with self.conn.cursor() as cursor:
+                if latest_closed_year(cursor) != year:
+                    return False, f"Reopen Years Closed After {year} First."
+                record_journal_balances(cursor, opening_journal_id, -1)
+                cursor.execute("""
+                    DELETE FROM journal_entry_lines WHERE journal_id = %s
+                    """, (opening_journal_id,))
+                cursor.execute("""
+                    DELETE FROM journal_entries WHERE journal_id = %s
+                    """, (opening_journal_id,))
+                mark_open(cursor, year)
+            commit(self.conn)
+            return True, f"Year {year} Reopened."
+        except Exception as e:
+            rollback(self.conn)
+            return False, f"Error reopening year {year}: {str(e)}."
     def fetch_archive_data(self, year):
         with self.conn.cursor(dictionary=True) as cursor:
             # 1. Get all journal_ids for the year
@@ -180,15 +317,16 @@ class YearEndReversalManager:
                 """, (year,))
     def delete_orphan_journal_entries(self, year):
         # Optionally delete the journal entries if they no longer have lines
+        period, bounds = period_filter("je.entry_date", year)
         with self.conn.cursor() as cursor:
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT je.journal_id
                 FROM journal_entries je
                 LEFT JOIN journal_entry_lines jel ON je.journal_id = jel.journal_id
-                WHERE YEAR(je.entry_date) = %s
+                WHERE {period}
                 GROUP BY je.journal_id
                 HAVING COUNT(jel.journal_id) = 0
-                """, (year,))
+                """, tuple(bounds))
             orphan_ids = cursor.fetchall()
             # Delete orphans
             for (journal_id,) in orphan_ids:
@@ -206,11 +344,12 @@ def get_available_periods_from_journal_entries(conn):
     retained_code = "3000" # Retained Earnings account code
     try:
         with (conn.cursor() as cursor):
-            cursor.execute("""
+            cursor.execute(f"""
             SELECT YEAR(j.entry_date) AS year, MONTH(j.entry_date) AS month
             FROM journal_entries j
             JOIN journal_entry_lines l ON j.journal_id = l.journal_id
             WHERE l.account_code != %s
+                AND {open_period_filter("j.entry_date")}
             ORDER BY year, month
             """, (retained_code,))
             rows = cursor.fetchall()
@@ -234,15 +373,18 @@ def get_available_periods_from_journal_entries(conn):
 
 def get_available_years_from_jornal_archive(conn):
     """
-    Fetch distinct years from journal_archive (period_end_year)
-    Returns list like ["2023", 2024]
+    Fetch closed years: flagged in fiscal_years, or archived to
+    journal_archive (period_end_year) before that.
+    Returns list like ["2023", "2024"]
     """
     try:
         with conn.cursor() as cursor:
             cursor.execute("""
+                SELECT year FROM fiscal_years WHERE closed
+                UNION
                 SELECT DISTINCT period_end_year
                 FROM journal_archive
-                ORDER BY period_end_year
+                ORDER BY 1
             """)
             years = [str(row[0]) for row in cursor.fetchall()]
             return years
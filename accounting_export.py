@@ -6,42 +6,128 @@ from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
 from reportlab.lib import colors
 from datetime import datetime
-import pandas as pd
+from itertools import chain, islice
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 from xml.sax.saxutils import escape
 import os
 import platform
 import tempfile
 import subprocess
-from tkinter import messagebox, filedialog
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
 from reportlab.pdfbase import pdfmetrics
+from task_runner import runner
+
+
+class ExportProgress:
+    """Small window showing how many rows an export has written, with a
+    Cancel button that stops the background task."""
+    def __init__(self, parent, title, total=None):
+        self.task = None
+        self.top = tk.Toplevel(parent)
+        self.top.title("Exporting")
+        self.top.configure(bg="lightblue")
+        self.top.transient(parent)
+        self.top.resizable(False, False)
+        self.top.protocol("WM_DELETE_WINDOW", self.cancel)
+        tk.Label(
+            self.top, text=f"Exporting {title}", bg="lightblue", fg="blue",
+            font=("Arial", 12, "bold")
+        ).pack(padx=20, pady=(10, 5))
+        self.bar = ttk.Progressbar(
+            self.top, length=300, maximum=total or 100,
+            mode="determinate" if total else "indeterminate"
+        )
+        self.bar.pack(padx=20)
+        if not total:
+            self.bar.start(15)
+        self.label = tk.Label(
+            self.top, text="Preparing...", bg="lightblue",
+            font=("Arial", 11)
+        )
+        self.label.pack(pady=5)
+        tk.Button(
+            self.top, text="Cancel", bg="red", fg="white", bd=4,
+            relief="groove", font=("Arial", 10, "bold"), command=self.cancel
+        ).pack(pady=(0, 10))
+
+    def update(self, done, stage="Written"):
+        if str(self.bar["mode"]) == "determinate":
+            self.bar["value"] = done
+        self.label.configure(text=f"{done:,} Rows {stage}")
+
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+        self.close()
+
+    def close(self):
+        try:
+            self.top.destroy()
+        except tk.TclError:
+            pass
+
 
 class ReportExporter:
+    # Rows measured for PDF column widths (the rest are assumed similar)
+    SAMPLE_ROWS = 200
+    # Rows per PDF table; small tables keep page splitting cheap
+    CHUNK_ROWS = 200
+    # Rows between progress updates
+    PROGRESS_EVERY = 500
+    FONT_NAME = "Helvetica"
+    FONT_SIZE = 10
+
     def __init__(self, parent, title, columns, rows):
         """
         parent: tk parent for dialogs. title: String title of report
-        Columns: Ordered List of column headers. Rows: List of dicts
-        representing rows.
+        Columns: Ordered List of column headers. Rows: dicts or sequences
+        in column order; a list, any iterable (read once) or a callable
+        taking a connection and returning one (e.g. KeysetQuery.iter_rows)
+        so rows stream from the database while the file is written.
+        Exports run in a background worker with a progress window.
         """
         self.parent = parent
         self.title = title
         self.columns = columns
-        self.rows = self._normalize_rows(rows)
+        self.rows = rows
 
     def _normalize_rows(self, rows):
-        """Ensures rows is a list of dicts; fill missing keys with empty
-        string."""
-        normalized = []
+        """Yield rows as lists of strings in column order; dicts fill
+        missing keys with empty string."""
         for r in rows:
             if isinstance(r, dict):
                 # Only keep expected columns, fill missing
-                normalized.append({col: r.get(col, "") for col in self.columns})
+                values = [r.get(col, "") for col in self.columns]
             else:
                 # If something slips through that's not a dict, try to coerce(zip)
                 try:
-                    normalized.append({col: val for col, val in zip(self.columns, list(r))})
-                except (TypeError, ValueError):
+                    values = list(r)[:len(self.columns)]
+                except TypeError:
                     continue
-        return normalized
+                values += [""] * (len(self.columns) - len(values))
+            yield ["" if v is None else str(v) for v in values]
+
+    def _iter_rows(self, conn, task=None):
+        """Normalized rows, reporting progress and honouring Cancel."""
+        source = self.rows(conn) if callable(self.rows) else self.rows
+        count = 0
+        for row in self._normalize_rows(source):
+            yield row
+            count += 1
+            if task is not None and count % self.PROGRESS_EVERY == 0:
+                task.check()
+                task.report(count)
+        if task is not None:
+            task.report(count)
+
+    def _total(self):
+        try:
+            return len(self.rows)
+        except TypeError:
+            return None
 
     def _default_filename(self, ext):
         safe_title = "".join(
@@ -50,55 +136,83 @@ class ReportExporter:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return f"{safe_title}_report_as_at{timestamp}.{ext.lstrip('.')}"
 
-    def export_excel(self):
-        try:
-            df = pd.DataFrame(self.rows, columns=self.columns)
-        except Exception as e:
+    def _run(self, func, *args, on_done=None, error_title="Error",
+             error_prefix="Failed"):
+        """Run func(conn, *args, task=...) in the background with a
+        progress window; on_done(result) runs on the Tk thread."""
+        progress = ExportProgress(self.parent, self.title, self._total())
+
+        def done(result):
+            progress.close()
+            if on_done is not None:
+                on_done(result)
+
+        def failed(message):
+            progress.close()
+            print(f"{error_prefix}: {message}")
             messagebox.showerror(
-                "Error", f"Failed to build Excel data: {str(e)}",
+                error_title, f"{error_prefix}: {message}",
                 parent=self.parent
             )
-            return
+        progress.task = runner.submit(
+            self.parent, func, *args, with_task=True, on_done=done,
+            on_error=failed, on_progress=progress.update
+        )
+
+    def export_excel(self):
         default_name = self._default_filename("xlsx")
-        try:
-            filename = filedialog.asksaveasfilename(
-                parent=self.parent,
-                defaultextension=".xlsx",
-                initialfile=default_name,
-                filetypes=[("Excel", "*.xlsx")],
-                title=f"Save {self.title} as Excel"
-            )
-            if not filename:
-                return
-            df.to_excel(filename, index=False)
-            messagebox.showinfo(
+        filename = filedialog.asksaveasfilename(
+            parent=self.parent,
+            defaultextension=".xlsx",
+            initialfile=default_name,
+            filetypes=[("Excel", "*.xlsx")],
+            title=f"Save {self.title} as Excel"
+        )
+        if not filename:
+            return
+        self._run(
+            self._write_excel, filename,
+            on_done=lambda _: messagebox.showinfo(
                 "Exported",
                 f"Excel report saved to:\n{filename}", parent=self.parent
-            )
-        except Exception as e:
-            messagebox.showerror(
-                "Error", f"Failed to save Excel: {str(e)}", parent=self.parent
-            )
+            ),
+            error_prefix="Failed to save Excel"
+        )
 
-    def _calculate_column_widths(self, page_width):
+    def _write_excel(self, conn, filename, task=None):
+        """Stream rows into a write-only workbook (rows are not kept)."""
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        bold = Font(bold=True)
+        header = []
+        for col in self.columns:
+            cell = WriteOnlyCell(ws, value=str(col))
+            cell.font = bold
+            header.append(cell)
+        ws.append(header)
+        for row in self._iter_rows(conn, task):
+            ws.append(row)
+        wb.save(filename)
+
+    def _calculate_column_widths(self, page_width, sample):
         """
-        Calculate column widths based on content. Usable width of the page.
+        Calculate column widths from the header and a sample of rows.
+        Usable width of the page.
         """
-        font_name = "Helvetica"
-        font_size = 10
+        font_name = self.FONT_NAME
+        font_size = self.FONT_SIZE
         padding = 12 # Left + Right padding
         min_width = 30
         col_widths = []
 
-        for col in self.columns:
+        for i, col in enumerate(self.columns):
             max_width = pdfmetrics.stringWidth(
                 str(col), font_name, font_size
             )
-            # Check each row's value for this column
-            for row in self.rows:
-                value = str(row.get(col, ""))
+            # Check each sampled row's value for this column
+            for row in sample:
                 text_width = pdfmetrics.stringWidth(
-                    value, font_name, font_size
+                    row[i], font_name, font_size
                 )
                 max_width = max(max_width, text_width)
             col_widths.append(max(max_width + padding, min_width))
@@ -122,11 +236,13 @@ class ReportExporter:
                         )
         return col_widths
 
-    def _build_pdf_story(self):
+    def _build_pdf_story(self, conn=None, task=None):
         # Page setup
         page_width, _ = landscape(A4)
         usable_width = page_width - 40 # Margins left 40 and right 40
-        col_widths = self._calculate_column_widths(usable_width)
+        rows = self._iter_rows(conn, task)
+        sample = list(islice(rows, self.SAMPLE_ROWS))
+        col_widths = self._calculate_column_widths(usable_width, sample)
         # Title style
         title_style = ParagraphStyle(
             name="Title",
@@ -143,42 +259,82 @@ class ReportExporter:
         )
         cell_style = ParagraphStyle(
             name="Cell",
-            fontName="Helvetica",
-            fontSize=10,
+            fontName=self.FONT_NAME,
+            fontSize=self.FONT_SIZE,
             alignment=TA_CENTER
         )
-
-        # Build table data: header + each row
-        table_data = []
         header_row = [
             Paragraph(escape(str(col)), header_style) for col in self.columns
         ]
-        table_data.append(header_row)
-
-        for r in self.rows:
-            row = []
-            for col in self.columns:
-                val_str = str(r.get(col, ""))
-                row.append(Paragraph(val_str, cell_style))
-            table_data.append(row)
+        # Cells short enough to fit their column on one line (no glyph is
+        # wider than 1em) stay plain strings; only longer ones are wrapped
+        # in a Paragraph
+        fits = [
+            int((width - 12) // self.FONT_SIZE) for width in col_widths
+        ]
         # Table Styling
-        tbl_style = TableStyle([
+        head_cmds = [
             ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f0f0f0")),
             ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 0), (-1, -1), 9),
             ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
             ("LINEBELOW", (0, 0), (-1, 0), 0.5, colors.grey),
-        ])
+        ]
+        body_cmds = [
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("FONTNAME", (0, 0), (-1, -1), self.FONT_NAME),
+            ("FONTSIZE", (0, 0), (-1, -1), self.FONT_SIZE),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ]
+        head_style = TableStyle(head_cmds + body_cmds)
+        body_style = TableStyle(body_cmds)
+        # Header drawn in the top margin of every page after the first
+        header = Table([header_row], colWidths=col_widths)
+        header.setStyle(head_style)
 
-        # Create table; allow header to repeat
-        table = Table(table_data, colWidths=col_widths, repeatRows=1)
-        table.setStyle(tbl_style)
-        story = [Paragraph(self.title, title_style), Spacer(1, 6), table]
+        story = [Paragraph(self.title, title_style), Spacer(1, 6)]
+        # One table per CHUNK_ROWS rows: reportlab measures a table again
+        # each time it splits it at a page break, so one big table makes
+        # the layout quadratic in the row count. Only the first chunk
+        # starts with the header row; later pages get it from the page
+        # template, so it never shows mid-page between chunks
+        rows = chain(sample, rows)
+        chunk, style = [header_row], head_style
+        while True:
+            start = len(chunk)
+            for values in islice(rows, self.CHUNK_ROWS):
+                chunk.append([
+                    value if len(value) <= fits[i] and "\n" not in value
+                    else Paragraph(escape(value), cell_style)
+                    for i, value in enumerate(values)
+                ])
+            if chunk:
+                table = Table(chunk, colWidths=col_widths)
+                table.setStyle(style)
+                story.append(table)
+            if len(chunk) - start < self.CHUNK_ROWS:
+                break
+            chunk, style = [], body_style
+        return story, header
 
-        return story
+    def _write_pdf(self, conn, filename, task=None):
+        story, header = self._build_pdf_story(conn, task)
+        if task is not None:
+            # Cancelled while rows were read: write nothing
+            task.check()
+        # Always landscape
+        doc = SimpleDocTemplate(
+            filename, pagesize=landscape(A4), rightMargin=40,
+            leftMargin=40, topMargin=60, bottomMargin=40
+        )
+
+        def draw_header(canvas, doc):
+            # Sits in the top margin, its bottom edge on the frame's top
+            header.wrapOn(canvas, doc.width, doc.topMargin)
+            header.drawOn(
+                canvas, doc.leftMargin, doc.pagesize[1] - doc.topMargin
+            )
+
+        doc.build(story, onLaterPages=draw_header)
 
     def export_pdf(self):
         default_name = self._default_filename("pdf")
@@ -191,63 +347,52 @@ class ReportExporter:
         )
         if not filename:
             return
-        try:
-            story = self._build_pdf_story()
-            # Always landscape
-            doc = SimpleDocTemplate(
-                filename, pagesize=landscape(A4), rightMargin=40,
-                leftMargin=40, topMargin=60, bottomMargin=40
-            )
-            doc.build(story)
-            messagebox.showinfo(
+        self._run(
+            self._write_pdf, filename,
+            on_done=lambda _: messagebox.showinfo(
                 "Exported",
-                f"PDF report saved to:\n{filename}", parent=self.parent)
-        except Exception as e:
-            print(f"Failed to write pdf: {str(e)}")
-            messagebox.showerror(
-                "Error",
-                f"Failed to write PDF: {str(e)}", parent=self.parent
-            )
+                f"PDF report saved to:\n{filename}", parent=self.parent
+            ),
+            error_prefix="Failed to write PDF"
+        )
 
     def print(self):
         """Export report as PDF, send directly to printer and delete temp
         file after."""
-        pdf_path = None
-        try:
-            # Always landscape orientation
-            default_name = self._default_filename("pdf")
-            pdf_path = os.path.join(tempfile.gettempdir(), default_name)
-            story = self._build_pdf_story()
-            doc = SimpleDocTemplate(
-                pdf_path, pagesize=landscape(A4), rightMargin=40,
-                leftMargin=40, topMargin=60, bottomMargin=40
+        system_name = platform.system()
+        if system_name not in ("Windows", "Darwin", "Linux"):
+            messagebox.showwarning(
+                "Print Failed", f"Unsupported OS: {system_name}",
+                parent=self.parent
             )
-            doc.build(story)
+            return
+        # Always landscape orientation
+        default_name = self._default_filename("pdf")
+        pdf_path = os.path.join(tempfile.gettempdir(), default_name)
+        self._run(
+            self._print_pdf, pdf_path, system_name,
+            on_done=lambda _: messagebox.showinfo(
+                "Printing", "Report sent to printer successfully.",
+                parent=self.parent
+            ),
+            error_title="Print Failed", error_prefix="Print Failed"
+        )
 
-            system_name = platform.system()
+    def _print_pdf(self, conn, pdf_path, system_name, task=None):
+        try:
+            self._write_pdf(conn, pdf_path, task)
+            if task is not None:
+                # Cancelled while the PDF was laid out: do not print
+                task.check()
             if system_name == "Windows":
                 os.startfile(pdf_path, "print")
             elif system_name == "Darwin": # macOS
                 subprocess.run(["lpr", pdf_path], check=True,)
-            elif system_name == "Linux":
-                subprocess.run(["lp", pdf_path], check=True)
             else:
-                messagebox.showwarning(
-                    "Print Failed", f"Unsupported OS: {system_name}",
-                    parent=self.parent
-                )
-                return
-            messagebox.showinfo(
-                "Printing", "Report sent to printer successfully.",
-                parent=self.parent
-            )
-        except Exception as e:
-            messagebox.showerror(
-                "Print Failed", f"Print Failed: {str(e)}", parent=self.parent
-            )
+                subprocess.run(["lp", pdf_path], check=True)
         finally:
-            if pdf_path and os.path.exists(pdf_path):
+            if os.path.exists(pdf_path):
                 try:
                     os.remove(pdf_path)
                 except Exception:
-                    pass
\ No newline at end of file
+                    pass
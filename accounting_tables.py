@@ -1,4 +1,8 @@
 from connect_to_db import connect_db
+from account_balances import (
+    create_account_balances_table, create_statement_views
+)
+from fiscal_years import create_fiscal_years_table
 
 def create_accounting_tables(conn):
     try:
@@ -35,116 +39,9 @@ def create_accounting_tables(conn):
             );
             """)
             print("Tables created successfully.")
-            # 4. Create trial balance view
-            cursor.execute("""
-                CREATE OR REPLACE VIEW trial_balance AS
-                SELECT
-                    a.code,
-                    a.account_name,
-                    a.account_type,
-                    SUM(l.debit) AS total_debit,
-                    SUM(l.credit) AS total_credit,
-                    SUM(l.debit - l.credit) AS balance
-                FROM chart_of_accounts a
-                LEFT JOIN journal_entry_lines l ON a.code = l.account_code
-                GROUP BY a.code, a.account_name, a.account_type;
-                """)
-            print("Trial Balance view created successfully.")
-            cursor.execute("""
-                CREATE OR REPLACE VIEW income_statement AS
-                SELECT
-                    'Revenue' AS category,
-                    a.code AS account_code,
-                    a.account_name,
-                    COALESCE(SUM(l.credit - l.debit), 0.00) AS amount
-                FROM chart_of_accounts a
-                LEFT JOIN journal_entry_lines l ON a.code=l.account_code
-                WHERE a.account_type='Revenue'
-                GROUP BY a.code, a.account_name
-                
-                UNION ALL
-                
-                SELECT
-                    'Expense' AS category,
-                    a.code AS account_code,
-                    a.account_name,
-                    COALESCE(SUM(l.debit - l.credit), 0.00) AS amount
-                FROM chart_of_accounts a
-                LEFT JOIN journal_entry_lines l ON a.code=l.account_code
-                WHERE a.account_type='Expense'
-                GROUP BY a.code, a.account_name;
-                """)
-            print("Income Statement View Created Successfully.")
-            cursor.execute("""
-                CREATE OR REPLACE VIEW balance_sheet AS
-                SELECT
-                    a.account_type AS category,
-                    a.code AS account_code,
-                    a.account_name,
-                    COALESCE(
-                        CASE
-                            WHEN a.account_type = 'Asset' THEN SUM(l.debit - l.credit)
-                            WHEN a.account_type IN ('Liability', 'Equity') THEN SUM(l.credit - l.debit)
-                            ELSE 0
-                        END, 0.00
-                    ) AS amount
-                FROM chart_of_accounts a
-                LEFT JOIN journal_entry_lines l ON a.code = l.account_code
-                WHERE a.account_type IN ('Asset', 'Liability', 'Equity')
-                GROUP BY a.account_type, a.code, a.account_name;
-                """)
-            print("Balance Sheet View Created Successfully.")
-
-            cursor.execute("""
-                CREATE OR REPLACE VIEW cash_flow_statement AS
-                SELECT
-                    'Operating Activity' AS category,
-                    a.code AS account_code,
-                    a.account_name,
-                    CASE
-                        WHEN SUM(l.credit - l.debit) >= 0 THEN 'inflow' ELSE 'outflow'
-                    END AS cash_flow_type,
-                    COALESCE(SUM(l.credit - l.debit), 0.00) AS amount
-                FROM chart_of_accounts a
-                LEFT JOIN journal_entry_lines l ON a.code = l.account_code
-                 -- Remove non-cash
-                WHERE a.account_type IN ('Revenue', 'Expense')
-                AND account_name NOT LIKE '%Depreciation%'
-                GROUP BY a.code, a.account_name
-                
-                UNION ALL
-                
-                -- Financing Activities
-                SELECT
-                    'Financing Activity' AS category,
-                    a.code AS account_code,
-                    a.account_name,
-                    CASE
-                        WHEN SUM(l.credit - l.debit) >= 0 THEN 'inflow' ELSE 'outflow'
-                    END AS cash_flow_type,
-                    COALESCE(SUM(l.credit - l.debit), 0.00) AS amount
-                FROM chart_of_accounts a
-                LEFT JOIN journal_entry_lines l ON a.code = l.account_code
-                WHERE a.account_type IN ('Equity', 'Liability')
-                GROUP BY a.code, a.account_name
-                
-                UNION ALL
-                
-                -- Investing Activities
-                SELECT
-                    'Investing Activities' AS category,
-                    a.code AS account_code,
-                    a.account_name,
-                    CASE
-                        WHEN SUM(l.credit - l.debit) >= 0 THEN 'inflow' ELSE 'outflow'
-                    END AS cash_flow_type,
-                    COALESCE(SUM(l.credit - l.debit), 0.00) AS amount
-                FROM chart_of_accounts a
-                LEFT JOIN journal_entry_lines l ON a.code = l.account_code
-                WHERE a.account_type = 'Asset'
-                GROUP BY a.code, a.account_name;
-                """)
-            print("Cash Flow Statement View Created Successfully.")
+            # 4. Per-account monthly balances
+            create_account_balances_table(cursor)
+            print("Account Balances Table created successfully.")
             cursor.execute("""
                     CREATE TABLE IF NOT EXISTS journal_archive (
                         id INT PRIMARY KEY AUTO_INCREMENT,
@@ -161,6 +58,13 @@ def create_accounting_tables(conn):
                     );
                     """)
             print("Table Journal Archive created successfully.")
+            # Closed flags for fiscal years (closing leaves journals in
+            # place)
+            create_fiscal_years_table(cursor)
+            print("Fiscal Years Table created successfully.")
+            # Statement views read account_balances for open years
+            create_statement_views(cursor)
+            print("Financial Statement Views Created Successfully.")
             cursor.execute("""
                     CREATE TABLE IF NOT EXISTS system_settings(
                         setting_key VARCHAR(50) PRIMARY KEY,
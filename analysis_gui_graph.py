@@ -2,18 +2,20 @@ import tkinter as tk
 from tkinter import ttk
 import mplcursors
 import matplotlib.dates as mdates
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-from matplotlib.ticker import MaxNLocator, FuncFormatter
-from dateutil import parser
+from matplotlib.ticker import FuncFormatter
+from chart_host import ChartHost
 
 
 class LineAnalysisWindow:
-    def __init__(self, title, rows, metrics, date_field):
+    COLORS = ["blue", "green", "red", "orange", "purple", "brown"]
+    TOOLTIP_DATE = "%d %b %Y"
+
+    def __init__(self, title, metrics):
         """
-        parent: Tk parent window. title: Window title (String). Rows: List of
-        Dicts(query results). date_field: Key in row that holds data.
-        Metrics: Dict{label: function(row) -> value}
+        title: Window title (String). Metrics: Dict{label: (dates, values)}
+        with dates sorted, e.g. built by sales_analytics.SalesSeries.
+        The figure and one line per metric are built once; choosing a
+        metric only toggles lines and redraws.
         """
         self.master = tk.Toplevel()
         self.master.title(title)
@@ -22,9 +24,10 @@ class LineAnalysisWindow:
         self.master.transient()
         self.master.grab_set()
 
-        self.rows = rows
-        self.metrics = metrics
-        self.date_field = date_field
+        self.metrics = {
+            label: self.prepare_series(dates, values)
+            for label, (dates, values) in metrics.items() if len(dates)
+        }
         self.title = title
 
         style = ttk.Style(self.master)
@@ -41,11 +44,16 @@ class LineAnalysisWindow:
         )
         self.option_cb.current(0)
         self.chart_container = tk.Frame(self.main_frame, bg="lightblue")
-        self.chart_widget = None
+        self.chart_title = tk.Label(
+            self.chart_container, bg="lightblue",
+            font=("Arial", 16, "bold", "underline")
+        )
 
         self._build_ui()
-        self.chart_container.bind("<Configure>", self.update_chart)
-        self.update_chart()
+        self.chart = None
+        if self.metrics:
+            self._build_chart()
+            self.update_chart()
 
     def _build_ui(self):
         """Pack and arrange widgets."""
@@ -63,88 +71,25 @@ class LineAnalysisWindow:
         self.option_cb.pack(side="left", anchor="s")
         self.option_cb.bind("<<ComboboxSelected>>", self.update_chart)
         self.chart_container.pack(fill="both", expand=True)
-
-    def update_chart(self, event=None):
-        """Refresh line chart based on selected metrics."""
-        for widget in self.chart_container.winfo_children():
-            widget.destroy()
-            if self.chart_widget:
-                self.chart_widget.destroy()
-                self.chart_widget = None
-        if not self.rows:
-            return
-        metric_choice = self.option_cb.get()
-        # Extract dates once
-        data_by_metric = {}
-        for label, metric_fn in self.metrics.items():
-            data = []
-            for row in self.rows:
-                raw_date = row[self.date_field]
-                try:
-                    dt = parser.parse(str(raw_date))
-                except (ValueError, TypeError):
-                    continue
-                data.append((dt, metric_fn(row)))
-            if data:
-                data.sort(key=lambda x: x[0])
-                data_by_metric[label] = list(zip(*data)) # (dates, values)
-        # Build figure
-        fig_title = (
-            f"Line Graph For {self.title} (All Metrics)."
-            if metric_choice == "Show All"
-            else f"Line Graph For {self.title} By {metric_choice}."
-        )
-        tk.Label(
-            self.chart_container, text=fig_title, bg="lightblue",
-            font=("Arial", 16, "bold", "underline")
-        ).pack(side="top", anchor="s")
-        dpi = 100
-        fig = Figure(figsize=(8, 6), dpi=dpi)
-        ax = fig.add_subplot(111)
-        colors = ["blue", "green", "red", "orange", "purple", "brown"]
-        lines, labels = [], [] # For legend
-        if metric_choice == "Show All":
-            for i, (label, (dates, values)) in enumerate(data_by_metric.items()):
-                color = colors[i % len(colors)]
-                line, = ax.plot(
-                    dates, values, marker="o", linestyle="-", color=color,
-                    label=label
-                )
-                lines.append(line)
-                labels.append(label)
-        else:  # Plot only the selected metric
-            if metric_choice in data_by_metric:
-                dates, values = data_by_metric[metric_choice]
-                line, = ax.plot(
-                    dates, values, marker="o", linestyle="-", color=colors[0],
-                    label=metric_choice
-                )
-                lines.append(line)
-                labels.append(metric_choice)
-        if lines and labels:
-            legend = ax.legend(
-                lines, labels, loc="best", frameon=True, framealpha=0.7,
-                facecolor="white"
+        self.chart_title.pack(side="top", anchor="s")
+
+    def prepare_series(self, dates, values):
+        """Hook to adjust a metric's points before plotting."""
+        return dates, values
+
+    def _build_chart(self):
+        """Create the figure, every metric line and the hover cursor."""
+        self.chart = ChartHost(self.chart_container)
+        self.ax = self.chart.figure.add_subplot(111)
+        for i, (label, (dates, values)) in enumerate(self.metrics.items()):
+            self.chart.line(
+                self.ax, label, dates, values, marker="o", linestyle="-",
+                color=self.COLORS[i % len(self.COLORS)]
             )
-            legend.set_draggable(True)
-
-        # Format x-axis dates
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%d %b"))
-        year = ""
-        if data_by_metric:
-            for dates, _ in data_by_metric.values():
-                if dates: # Only pick if we have at least one date
-                    year = dates[0].year
-                    break
-        ax.set_xlabel(f"Date ({year})")
-        ax.set_ylabel(metric_choice)
-        ax.grid(True, linestyle="--", alpha=0.7)
-        fig.autofmt_xdate(rotation=45)
-        fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=self.chart_container)
-        self.chart_widget = canvas.get_tk_widget()
-        self.chart_widget.pack(fill="both", expand=True)
-        canvas.draw()
+        self.ax.grid(True, linestyle="--", alpha=0.7)
+        self.format_x_axis(self.ax)
+        self.chart.figure.autofmt_xdate(rotation=45)
+        lines = list(self.chart.lines.values())
         # Enable tooltip on hover
         cursor = mplcursors.cursor(lines, hover=True)
         @cursor.connect("add")
@@ -156,218 +101,74 @@ class LineAnalysisWindow:
             idx = int(sel.index)
             if idx < 0 or idx >= len(x):
                 return # Out of range safety
-            date_str = x[idx].strftime("%d %b %Y")
+            date_str = x[idx].strftime(self.TOOLTIP_DATE)
             sel.annotation.set_text(
                 f"{line.get_label()}\nDate: {date_str}\nValue: {y[idx]:,.2f}"
             )
             sel.annotation.get_bbox_patch().set(fc="lightyellow", alpha=0.9)
-        # @cursor.connect("remove")
+
         def on_motion(event):
-            if not event.inaxes:
-                for sel in cursor.selections:
-                    sel.annotation.set_visible(False)
-                canvas.draw_idle()
+            shown = [
+                sel for sel in cursor.selections
+                if sel.annotation.get_visible()
+            ]
+            if not shown:
                 return
-            over_line = any(line.contains(event)[0] for line in lines)
-            if not over_line:
-                for sel in cursor.selections:
-                    sel.annotation.set_visible(False)
-                canvas.draw_idle()
-        fig.canvas.mpl_connect("motion_notify_event", on_motion)
-
-
-class MonthLineAnalysis:
-    def __init__(self, title, rows, metrics, date_field):
-        """
-        parent: Tk parent window. title: Window title (String). Rows: List of
-        Dicts(query results). date_field: Key in row that holds data.
-        Metrics: Dict{label: function(row) -> value}
-        """
-        self.master = tk.Toplevel()
-        self.master.title(title)
-        self.master.state("zoomed")
-        self.master.configure(bg="lightblue")
-        self.master.transient()
-        self.master.grab_set()
-
-        self.rows = rows
-        self.metrics = metrics
-        self.date_field = date_field
-        self.title = title
-
-        style = ttk.Style(self.master)
-        style.theme_use("clam")
-        # Frames
-        self.main_frame = tk.Frame(
-            self.master, bg="lightblue", bd=4, relief="solid"
-        )
-        self.title_frame = tk.Frame(self.main_frame, bg="lightblue")
-        self.control_frame = tk.Frame(self.title_frame, bg="lightblue")
-        self.option_cb = ttk.Combobox(
-            self.control_frame, width=15, state="readonly", font=("Arial", 12),
-            values=["Show All"] + list(metrics.keys())
-        )
-        self.option_cb.current(0)
-        self.chart_container = tk.Frame(self.main_frame, bg="lightblue")
-        self.chart_widget = None
-
-        self._build_ui()
-        self.chart_container.bind("<Configure>", self.update_chart)
-        self.update_chart()
-
-    def _build_ui(self):
-        """Pack and arrange widgets."""
-        self.main_frame.pack(fill="both", expand=True, pady=(0, 10), padx=10)
-        self.title_frame.pack(side="top", fill="x", pady=(5, 0))
-        self.control_frame.pack(side="right", padx=10)
-        tk.Label(
-            self.title_frame, text=self.title, bg="lightblue", fg="blue",
-            font=("Arial", 20, "bold", "underline"), width=60
-        ).pack(side="right", anchor="sw")
-        tk.Label(
-            self.control_frame, text="View By:", bg="lightblue", fg="green",
-            font=("Arial", 12, "bold")
-        ).pack(side="left", anchor="s")
-        self.option_cb.pack(side="left", anchor="s")
-        self.option_cb.bind("<<ComboboxSelected>>", self.update_chart)
-        self.chart_container.pack(fill="both", expand=True)
+            if event.inaxes and any(
+                line.contains(event)[0] for line in lines
+                if line.get_visible()
+            ):
+                return
+            for sel in shown:
+                sel.annotation.set_visible(False)
+            self.chart.redraw()
+        self.chart.canvas.mpl_connect("motion_notify_event", on_motion)
 
     def update_chart(self, event=None):
-        """Refresh line chart based on selected metrics."""
-        for widget in self.chart_container.winfo_children():
-            widget.destroy()
-            if self.chart_widget:
-                self.chart_widget.destroy()
-                self.chart_widget = None
-        if not self.rows:
+        """Show the selected metric (or all) on the existing figure."""
+        if not self.chart:
             return
         metric_choice = self.option_cb.get()
-        # Extract dates once
-        data_by_metric = {}
-        for label, metric_fn in self.metrics.items():
-            data = []
-            for row in self.rows:
-                raw_date = row[self.date_field]
-                try:
-                    dt = parser.parse(str(raw_date))
-                except (ValueError, TypeError):
-                    continue
-                data.append((dt, metric_fn(row)))
-            if data:
-                data.sort(key=lambda x: x[0])
-                first_date = data[0][0]
-                month_start = first_date.replace(day=1)
-                if month_start < first_date:
-                    data.insert(0, (month_start, 0))
-                data_by_metric[label] = list(zip(*data)) # (dates, values)
-        # Build figure
-        fig_title = (
-            f"Graph Of {self.title} (All Metrics)."
+        self.chart_title.configure(text=(
+            f"Line Graph For {self.title} (All Metrics)."
             if metric_choice == "Show All"
-            else f"Graph Of {self.title} By {metric_choice}."
-        )
-        tk.Label(
-            self.chart_container, text=fig_title, bg="lightblue",
-            font=("Arial", 16, "bold", "underline")
-        ).pack(side="top", anchor="s")
-        dpi = 100
-        fig = Figure(figsize=(8, 6), dpi=dpi)
-        ax = fig.add_subplot(111)
-        colors = ["blue", "green", "red", "orange", "purple", "brown"]
-        lines, labels = [], [] # For legend
-        if metric_choice == "Show All":
-            for i, (label, (dates, values)) in enumerate(data_by_metric.items()):
-                color = colors[i % len(colors)]
-                line, = ax.plot(
-                    dates, values, marker="o", linestyle="-", color=color,
-                    label=label
-                )
-                lines.append(line)
-                labels.append(label)
-        else:  # Plot only the selected metric
-            if metric_choice in data_by_metric:
-                dates, values = data_by_metric[metric_choice]
-                line, = ax.plot(
-                    dates, values, marker="o", linestyle="-", color=colors[0],
-                    label=metric_choice
+            else f"Line Graph For {self.title} By {metric_choice}."
+        ))
+        visible = []
+        for i, (label, line) in enumerate(self.chart.lines.items()):
+            show = metric_choice in ("Show All", label)
+            line.set_visible(show)
+            if show:
+                # A single metric is always drawn in the first colour
+                line.set_color(
+                    self.COLORS[i % len(self.COLORS)]
+                    if metric_choice == "Show All" else self.COLORS[0]
                 )
-                lines.append(line)
-                labels.append(metric_choice)
-        if lines and labels:
-            legend = ax.legend(
-                lines, labels, loc="best", frameon=True, framealpha=0.7,
-                facecolor="white"
+                visible.append(line)
+        if visible:
+            legend = self.ax.legend(
+                visible, [line.get_label() for line in visible], loc="best",
+                frameon=True, framealpha=0.7, facecolor="white"
             )
             legend.set_draggable(True)
+        self.ax.relim(visible_only=True)
+        self.ax.set_autoscaley_on(True)
+        self.ax.autoscale_view()
+        self.format_y_axis(self.ax, metric_choice, visible)
+        self.chart.redraw()
 
-        # Format x-axis MONTHLY-ONLY
-        all_dates = []
-        for dates, _ in data_by_metric.values():
-            all_dates.extend(dates)
-
-        if all_dates:
-            month_start = min(all_dates).replace(day=1)
-            if month_start.month == 12:
-                month_end = month_start.replace(year=month_start.year + 1, month=1)
-            else:
-                month_end = month_start.replace(month=month_start.month + 1)
-
-            ax.set_xlim(month_start, month_end)
-
-        # Date formatting (clear daily labels)
+    def format_x_axis(self, ax):
         ax.xaxis.set_major_formatter(mdates.DateFormatter("%d %b"))
-        ax.xaxis.set_major_locator(MaxNLocator(integer=True))
-        ax.xaxis.set_major_locator(mdates.DayLocator(interval=1))
-        ax.set_xlabel(f"Day of Month")
-        all_values = []
-        for _, (_, values) in data_by_metric.items():
-            all_values.extend(values)
-        formatter_func, suffix = self.auto_scale_formatter(all_values)
-        ax.yaxis.set_major_formatter(FuncFormatter(formatter_func))
-        ax.set_ylabel(f"{metric_choice}{suffix}")
-        ax.set_ylim(bottom=0)
-        ax.axhline(0, color="black", linewidth=1)
-        ax.grid(True, linestyle="--", alpha=0.7)
-        fig.autofmt_xdate(rotation=45)
-        fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=self.chart_container)
-        self.chart_widget = canvas.get_tk_widget()
-        self.chart_widget.pack(fill="both", expand=True)
-        canvas.draw()
-        # Enable tooltip on hover
-        cursor = mplcursors.cursor(lines, hover=True)
-        @cursor.connect("add")
-        def on_add(sel):
-            line = sel.artist
-            x, y = line.get_data()
-            if sel.index is None:
-                return
-            idx = int(sel.index)
-            if idx < 0 or idx >= len(x):
-                return # Out of range safety
-            date_str = x[idx].strftime("%d %b")
-            sel.annotation.set_text(
-                f"{line.get_label()}\nDate: {date_str}\nValue: {y[idx]:,.2f}"
-            )
-            sel.annotation.get_bbox_patch().set(fc="lightyellow", alpha=0.9)
-        # @cursor.connect("remove")
-        def on_motion(event): # type: ignore
-            if not event.inaxes:
-                for sel in cursor.selections:
-                    sel.annotation.set_visible(False)
-                canvas.draw_idle()
-                return
-            over_line = any(l.contains(event)[0] for l in lines)
-            if not over_line:
-                for sel in cursor.selections:
-                    sel.annotation.set_visible(False)
-                canvas.draw_idle()
-        fig.canvas.mpl_connect("motion_notify_event", on_motion)
+        first = next(iter(self.metrics.values()))[0]
+        ax.set_xlabel(f"Date ({first[0].year})")
+
+    def format_y_axis(self, ax, metric_choice, lines):
+        ax.set_ylabel(metric_choice)
 
     @staticmethod
     def auto_scale_formatter(values):
         """Returns (formatter_function, label_suffix)."""
-        max_val = max(values) if values else 0
+        max_val = max(values) if len(values) else 0
         if max_val >= 1_000_000:
             return (
                 lambda x, _: f"{x / 1_000_000:.2f}", " (* 1,000,000)"
@@ -379,4 +180,42 @@ class MonthLineAnalysis:
         else:
             return (
                 lambda x, _: f"{x:.0f}", ""
-            )
\ No newline at end of file
+            )
+
+
+class MonthLineAnalysis(LineAnalysisWindow):
+    """Line chart of one month: daily ticks and scaled amounts."""
+    TOOLTIP_DATE = "%d %b"
+
+    def prepare_series(self, dates, values):
+        # Start each line at 0 on the first of the month
+        month_start = dates[0].replace(day=1)
+        if month_start < dates[0]:
+            dates = [month_start, *dates]
+            values = [0, *values]
+        return dates, values
+
+    def format_x_axis(self, ax):
+        # Format x-axis MONTHLY-ONLY
+        month_start = min(
+            dates[0] for dates, _ in self.metrics.values()
+        ).replace(day=1)
+        if month_start.month == 12:
+            month_end = month_start.replace(year=month_start.year + 1, month=1)
+        else:
+            month_end = month_start.replace(month=month_start.month + 1)
+        ax.set_xlim(month_start, month_end)
+        # Date formatting (clear daily labels)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%d %b"))
+        ax.xaxis.set_major_locator(mdates.DayLocator(interval=1))
+        ax.set_xlabel("Day of Month")
+        ax.axhline(0, color="black", linewidth=1)
+
+    def format_y_axis(self, ax, metric_choice, lines):
+        all_values = []
+        for line in lines:
+            all_values.extend(line.get_ydata())
+        formatter_func, suffix = self.auto_scale_formatter(all_values)
+        ax.yaxis.set_major_formatter(FuncFormatter(formatter_func))
+        ax.set_ylabel(f"{metric_choice}{suffix}")
+        ax.set_ylim(bottom=0)
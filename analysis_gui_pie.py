@@ -2,9 +2,8 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
 from matplotlib.backends.backend_pdf import PdfPages
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 from base_window import BaseWindow
+from chart_host import ChartHost
 
 
 class AnalysisWindow(BaseWindow):
@@ -43,10 +42,13 @@ class AnalysisWindow(BaseWindow):
         self.option_cb.current(0)
         # Chart Frames (Scrollable Frame)
         self.chart_container = tk.Frame(self.main_frame, bg="lightblue")
-        self.chart_widget = None
+        self.chart_title = tk.Label(
+            self.chart_container, bg="lightblue", fg="dodgerblue",
+            font=("Arial", 16, "bold", "underline")
+        )
 
         self._build_ui()
-        self.chart_container.bind("<Configure>", self.update_charts)
+        self._build_chart()
         self.update_charts()
 
     def _build_ui(self):
@@ -75,43 +77,68 @@ class AnalysisWindow(BaseWindow):
         self.option_cb.bind("<<ComboboxSelected>>",  self.update_charts)
         # Chart container
         self.chart_container.pack(fill="both", expand=True)
+        self.chart_title.pack(side="top", anchor="s")
 
-    def update_charts(self, _event=None):
-        """Refresh pie and bar charts based on selected metric.
-        Filling container."""
-        for widget in self.chart_container.winfo_children():
-            widget.destroy()
-            if self.chart_widget:
-                self.chart_widget.destroy()
-                self.chart_widget = None
+    def _build_chart(self):
+        """Create the figure, its axes and the hover handler once."""
+        # Axes are placed by hand, so no tight layout
+        self.chart = ChartHost(
+            self.chart_container, figsize=(10, 6), tight=False
+        )
+        fig = self.chart.figure
+        self.current_figure = fig
+        # Big pie area (=78% width)
+        self.ax_pie = fig.add_axes((0.01, 0.05, 0.66, 0.9))
+        # SMALL legend area (=22% width)
+        self.ax_leg = fig.add_axes((0.70, 0.1, 0.28, 0.8))
+        self.wedges = []
+        self.labels = []
+        self.values = []
+        self.hover_title = None
+        self.chart.canvas.mpl_connect("motion_notify_event", self.on_motion)
+
+    def on_motion(self, event):
+        """Show the hovered slice in the pie title; only the title is
+        repainted (blit), not the whole figure."""
+        if self.hover_title is None:
+            return
+        text = ""
+        if event.inaxes == self.ax_pie:
+            total = sum(self.values)
+            for wedge, label, value in zip(
+                self.wedges, self.labels, self.values
+            ):
+                contains, _ = wedge.contains(event)
+                if contains:
+                    percent = (value / total) * 100
+                    text = f"{label}: {value:,} ({percent:.1f}%)"
+                    break
+        if text != self.hover_title.get_text():
+            self.hover_title.set_text(text)
+            self.chart.blit(self.hover_title)
 
+    def update_charts(self, _event=None):
+        """Redraw pie and legend for the selected metric on the existing
+        figure."""
+        self.ax_pie.clear()
+        self.ax_leg.clear()
+        self.ax_leg.axis("off")
+        self.wedges, self.hover_title = [], None
         if not self.rows:
+            self.chart.redraw()
             return
         labels = [r[self.label_field] for r in self.rows]
         metric_name = self.option_cb.get()
         metric_fn = self.metrics[metric_name]
         values = [metric_fn(r) for r in self.rows]
+        self.labels, self.values = labels, values
 
-        fig_title = f"Chart For {self.title} By {metric_name}."
-        tk.Label(
-            self.chart_container, text=fig_title, bg="lightblue",
-            fg="dodgerblue", font=("Arial", 16, "bold", "underline")
-        ).pack(side="top", anchor="s")
-
-        dpi = 100
-        fig_w = 10
-        fig_h = 6
-        fig = Figure(figsize=(fig_w, fig_h), dpi=dpi)
-        self.current_figure = fig
-        # Big pie area (=78% width)
-        ax_pie = fig.add_axes((0.01, 0.05, 0.66, 0.9))
-        # SMALL legend area (=22% width)
-        ax_leg = fig.add_axes((0.70, 0.1, 0.28, 0.8))
-        ax_leg.axis("off")
-
+        self.chart_title.configure(
+            text=f"Chart For {self.title} By {metric_name}."
+        )
         # Pie Chart
         if sum(values) > 0:
-            wedges, _, autotexts = ax_pie.pie(
+            wedges, _, autotexts = self.ax_pie.pie(
                 values,
                 labels=None,
                 autopct="%1.1f%%",
@@ -120,13 +147,14 @@ class AnalysisWindow(BaseWindow):
                 pctdistance=0.75,
                 textprops={'fontsize': 10}
             )
-            ax_pie.set_aspect("equal") # Keep pie circular
+            self.wedges = wedges
+            self.ax_pie.set_aspect("equal") # Keep pie circular
             total_value = sum(values)
             legend_labels = [
                 f"{label} → {value:,}   ({(value / total_value) * 100:.1f}%)"
                 for label, value in zip(labels, values)
             ]
-            ax_leg.legend(
+            self.ax_leg.legend(
                 wedges,
                 legend_labels,
                 title="Items",
@@ -135,37 +163,17 @@ class AnalysisWindow(BaseWindow):
                 title_fontsize=13,
                 frameon=True
             )
-            def on_motion(event):
-                if event.inaxes != ax_pie:
-                    ax_pie.set_title("")
-                    fig.canvas.draw_idle()
-                    return
-                for i, w in enumerate(wedges):
-                    contains, _ = w.contains(event)
-                    if contains:
-                        label = labels[i]
-                        value = values[i]
-                        percent = (value / sum(values)) * 100
-                        ax_pie.set_title(
-                            f"{label}: {value:,} ({percent:.1f}%)",
-                            fontsize=12,
-                            pad=12
-                        )
-                        fig.canvas.draw_idle()
-                        return
-            fig.canvas.mpl_connect("motion_notify_event", on_motion)
+            # Hover title is drawn by blitting, not by full redraws
+            self.hover_title = self.ax_pie.set_title("", fontsize=12, pad=12)
+            self.hover_title.set_animated(True)
         else:
-            ax_pie.text(
+            self.ax_pie.text(
                 0.5, 0.5,
                 f"No data to display for '{metric_name}'",
                 ha="center", va="center", fontsize=12,
-                color="red", transform=ax_pie.transAxes
+                color="red", transform=self.ax_pie.transAxes
             )
-        # Embed chart into scroll frame
-        canvas = FigureCanvasTkAgg(fig, master=self.chart_container)
-        self.chart_widget = canvas.get_tk_widget()
-        self.chart_widget.pack(fill="both", expand=True)
-        canvas.draw()
+        self.chart.redraw()
 
     def export_pdf(self):
         """Export the current display chart to PDF."""
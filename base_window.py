@@ -1,5 +1,7 @@
 import tkinter as tk
 import os
+from tkinter import messagebox
+from task_runner import runner
 
 
 class BaseWindow:
@@ -103,4 +105,23 @@ class BaseWindow:
             else:
                 window.destroy()
 
-        _fade()
\ No newline at end of file
+        _fade()
+
+    @staticmethod
+    def run_in_background(window, func, *args, on_done=None, on_error=None,
+                          key=None, **kwargs):
+        """Run func(conn, *args) off the Tk thread on a pooled connection
+        and pass its return value to on_done(result) on the Tk thread.
+        A newer call for the same window and func supersedes an older one.
+        Unexpected failures go to on_error(message), by default a message
+        box."""
+        return runner.submit(
+            window, func, *args, on_done=on_done,
+            on_error=on_error or (lambda msg: messagebox.showerror(
+                "Error", msg, parent=window
+            )),
+            key=key if key is not None else (
+                window, getattr(func, "__name__", func)
+            ),
+            **kwargs
+        )
@@ -0,0 +1,74 @@
+import tkinter as tk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+
+class ChartHost:
+    """Matplotlib figure embedded once in a Tk container.
+    - The Figure and FigureCanvasTkAgg live as long as the window; charts
+      update their artists in place (line(), set_data, clearing an axes)
+      and call redraw().
+    - Resizes are debounced: the canvas is resized once the container has
+      stopped changing for RESIZE_DELAY ms, not on every <Configure>.
+    - blit(*artists) repaints only the given animated artists over the
+      background cached at the last full draw (hover titles, markers)."""
+    RESIZE_DELAY = 150
+
+    def __init__(self, container, figsize=(8, 6), dpi=100, tight=True):
+        self.figure = Figure(figsize=figsize, dpi=dpi, tight_layout=tight)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=container)
+        self.widget = self.canvas.get_tk_widget()
+        self.widget.pack(fill="both", expand=True)
+        self.lines = {} # label -> Line2D
+        self._background = None
+        self._resize_id = None
+        self._resize_event = None
+        # Replace the backend's resize-and-draw on every event
+        self.widget.bind("<Configure>", self._on_configure)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def line(self, ax, label, x, y, **style):
+        """Create the line for label once; later calls only set_data."""
+        line = self.lines.get(label)
+        if line is None:
+            line, = ax.plot(x, y, label=label, **style)
+            self.lines[label] = line
+        else:
+            line.set_data(x, y)
+            if style:
+                line.set(**style)
+        return line
+
+    def redraw(self):
+        """Schedule a full draw of the figure (coalesced by matplotlib)."""
+        self.canvas.draw_idle()
+
+    def blit(self, *artists):
+        """Draw artists over the cached background without a full draw."""
+        if self._background is None:
+            self.redraw()
+            return
+        self.canvas.restore_region(self._background)
+        for artist in artists:
+            if artist.get_visible():
+                self.figure.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def _on_draw(self, _event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+    def _on_configure(self, event):
+        self._resize_event = event
+        if self._resize_id is not None:
+            self.widget.after_cancel(self._resize_id)
+        self._resize_id = self.widget.after(self.RESIZE_DELAY, self._resize)
+
+    def _resize(self):
+        self._resize_id = None
+        event, self._resize_event = self._resize_event, None
+        if event is None:
+            return
+        try:
+            self.canvas.resize(event)
+        except tk.TclError:
+            pass # Window closed while the resize was pending
@@ -1,15 +1,251 @@
+import functools
+import os
+import threading
+from contextlib import contextmanager
 import mysql.connector
+from mysql.connector import errorcode, pooling
+
+
+# Connection settings, overridable from the environment
+DB_CONFIG = {
+    "host": os.environ.get("POS_DB_HOST", "localhost"),
+    "user": os.environ.get("POS_DB_USER", "root"),
+    "password": os.environ.get("POS_DB_PASSWORD", "Sniffy@96"),
+    "database": os.environ.get("POS_DB_NAME", "Shop"),
+}
+POOL_NAME = "pos_pool"
+POOL_SIZE = int(os.environ.get("POS_DB_POOL_SIZE", 5))
+# Client errors raised when the server has dropped the connection
+GONE_AWAY_ERRORS = (
+    errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST,
+)
+
+
+def is_gone_away(err):
+    """Return True if err means 'MySQL server has gone away'."""
+    return getattr(err, "errno", None) in GONE_AWAY_ERRORS
+
+
+class ConnectionManager:
+    """Thread-safe pool of MySQL connections.
+    Pooled connections expose the same cursor/commit/rollback interface as
+    a raw connection, so they can be passed to any working_* helper.
+    - connection(): checkout/return context manager.
+    - thread_connection(): one long-lived connection per thread.
+    - run(): call func(conn, ...) and retry once if the server went away."""
+    def __init__(self, config=None, pool_name=POOL_NAME, pool_size=POOL_SIZE):
+        self.config = dict(config or DB_CONFIG)
+        self.pool_name = pool_name
+        self.pool_size = pool_size
+        self._pool = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def pool(self):
+        """Create the MySQLConnectionPool on first use."""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = pooling.MySQLConnectionPool(
+                        pool_name=self.pool_name,
+                        pool_size=self.pool_size,
+                        pool_reset_session=True,
+                        **self.config
+                    )
+        return self._pool
+
+    @staticmethod
+    def ping(conn, reconnect=True):
+        """Health check. Reconnects in place when the server went away.
+        Returns True if the connection is usable."""
+        try:
+            conn.ping(reconnect=reconnect, attempts=2, delay=0)
+            return True
+        except (mysql.connector.Error, AttributeError):
+            return False
+
+    def acquire(self):
+        """Check out a healthy connection from the pool.
+        Call close() on it to return it to the pool."""
+        conn = self.pool.get_connection()
+        if not self.ping(conn):
+            conn.close()
+            raise mysql.connector.Error(
+                msg="Pooled connection failed health check.",
+                errno=errorcode.CR_SERVER_GONE_ERROR
+            )
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the block.
+        Uncommitted work is rolled back if the block raises."""
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except mysql.connector.Error:
+                pass
+            raise
+        finally:
+            conn.close()
+
+    def thread_connection(self):
+        """Return the calling thread's connection, checking one out
+        (or replacing a dead one) when needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or not self.ping(conn):
+            if conn is not None:
+                self.release_thread_connection()
+            conn = self.acquire()
+            self._local.conn = conn
+        return conn
+
+    def release_thread_connection(self):
+        """Return the calling thread's connection to the pool."""
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except mysql.connector.Error:
+                pass
+
+    def run(self, func, *args, retries=1, **kwargs):
+        """Run func(conn, *args, **kwargs) on a pooled connection.
+        Retries on a fresh connection if the server went away."""
+        for attempt in range(retries + 1):
+            try:
+                with self.connection() as conn:
+                    return func(conn, *args, **kwargs)
+            except mysql.connector.Error as err:
+                if not is_gone_away(err) or attempt == retries:
+                    raise
+        return None
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager():
+    """Return the process-wide ConnectionManager."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ConnectionManager()
+    return _manager
+
+
+class TransactionScope:
+    """State of a caller-owned transaction on one connection."""
+    def __init__(self, conn):
+        self.conn = conn
+        self.depth = 0
+        self.failed = False
+        self.rollback_hooks = []
+
+
+# id(conn) -> TransactionScope for connections with an open unit of work
+_open_scopes = {}
+
+
+def current_scope(conn):
+    """Return the open TransactionScope for conn, or None."""
+    return _open_scopes.get(id(conn))
+
+
+@contextmanager
+def transaction(conn):
+    """Unit of work on conn. Scopes nest; only the outermost one commits,
+    once, on exit. Any failure inside rolls the whole unit back."""
+    scope = current_scope(conn)
+    owner = scope is None
+    if owner:
+        scope = _open_scopes[id(conn)] = TransactionScope(conn)
+    scope.depth += 1
+    try:
+        yield scope
+    except Exception:
+        scope.failed = True
+        raise
+    finally:
+        scope.depth -= 1
+        if owner:
+            del _open_scopes[id(conn)]
+            if scope.failed:
+                conn.rollback()
+                _run_hooks(scope.rollback_hooks)
+            else:
+                try:
+                    conn.commit()
+                except mysql.connector.Error:
+                    conn.rollback()
+                    _run_hooks(scope.rollback_hooks)
+                    raise
+
+
+def _run_hooks(hooks):
+    for hook in hooks:
+        hook()
+
+
+def on_rollback(conn, callback):
+    """Call callback if the open unit of work on conn is rolled back.
+    Used to drop in-memory caches that saw uncommitted rows."""
+    scope = current_scope(conn)
+    if scope is not None:
+        scope.rollback_hooks.append(callback)
+
+
+def commit(conn):
+    """Commit conn, unless a caller owns the transaction, in which case
+    the commit is left to the outermost scope."""
+    if current_scope(conn) is None:
+        conn.commit()
+
+
+def rollback(conn):
+    """Roll back conn. Inside a caller-owned transaction the scope is
+    marked failed and rolled back when it closes."""
+    scope = current_scope(conn)
+    if scope is None:
+        conn.rollback()
+    else:
+        scope.failed = True
+
+
+def transactional(func):
+    """Run a business operation as one unit of work. The connection is
+    the first argument, or its .conn attribute for methods. A (False, msg)
+    result rolls the unit back; anything else commits it."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        conn = getattr(args[0], "conn", args[0])
+        if conn is None:
+            return func(*args, **kwargs)
+        try:
+            with transaction(conn) as scope:
+                result = func(*args, **kwargs)
+                if isinstance(result, tuple) and result and result[0] is False:
+                    scope.failed = True
+        except mysql.connector.Error as e:
+            return False, f"Error Committing Transaction: {str(e)}."
+        return result
+    return wrapper
 
 
 # DB Connection Function
 def connect_db():
+    """Check out a connection from the shared pool.
+    Closing it returns it to the pool."""
     try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="Sniffy@96",
-            database="Shop"
-        )
+        connection = get_manager().acquire()
         if connection.is_connected():
             print("Connected to MySQL database successfully!")
             return connection
@@ -21,4 +257,4 @@ def connect_db():
 # if __name__ == "__main__":
 #     conn = connect_db()
 #     if conn:
-#         conn.close()
\ No newline at end of file
+#         conn.close()
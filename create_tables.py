@@ -32,6 +32,9 @@ def create_tables():
                 min_stock_level INT NOT NULL,
                 date_replenished DATE NOT NULL,
                 is_active TINYINT(1) DEFAULT 1,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                    ON UPDATE CURRENT_TIMESTAMP,
+                INDEX idx_products_updated_at (updated_at),
                 FOREIGN KEY (product_code) REFERENCES stock(product_code)
                     ON UPDATE CASCADE
                     ON DELETE CASCADE
@@ -53,7 +56,8 @@ def create_tables():
                 quantity INT,
                 total INT,
                 user VARCHAR(50) NOT NULL,
-                FOREIGN KEY (product_code) REFERENCES products(product_code)
+                FOREIGN KEY (product_code) REFERENCES products(product_code),
+                INDEX idx_pcl_log_date (log_date)
                 );
             """)
             conn.commit()
@@ -68,7 +72,8 @@ def create_tables():
                            sale_date DATE NOT NULL,
                            sale_time TIME NOT NULL,
                            total_amount DECIMAL(10,2) NOT NULL,
-                           user VARCHAR(50) NOT NULL
+                           user VARCHAR(50) NOT NULL,
+                           INDEX idx_sales_date_user (sale_date, user)
                            );
                         """)
             conn.commit()
@@ -89,7 +94,8 @@ def create_tables():
                            total_amount DECIMAL(10, 2) AS (quantity * unit_price) STORED,
                            user VARCHAR(50),
                            FOREIGN KEY (receipt_no) REFERENCES sales(receipt_no),
-                           FOREIGN KEY (product_code) REFERENCES products(product_code)
+                           FOREIGN KEY (product_code) REFERENCES products(product_code),
+                           INDEX idx_sale_items_date_user (date, user)
                            );
                         """)
             conn.commit()
@@ -97,6 +103,63 @@ def create_tables():
         except Exception as e:
             print(f"Error creating sale items table: {e}")
 
+        try:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS product_sales_stats (
+                product_code VARCHAR(50) PRIMARY KEY,
+                first_sold DATE NOT NULL,
+                last_sold DATE NOT NULL,
+                stats_month DATE NOT NULL,
+                units_ytd INT NOT NULL DEFAULT 0,
+                units_mtd INT NOT NULL DEFAULT 0,
+                INDEX idx_pss_last_sold (last_sold),
+                FOREIGN KEY (product_code) REFERENCES products(product_code)
+                    ON UPDATE CASCADE
+                    ON DELETE CASCADE
+                );
+            """)
+            conn.commit()
+            print("Product Sales Stats table created successfully.")
+        except Exception as e:
+            print(f"Error creating product sales stats table: {e}")
+
+        try:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sales_daily_rollup (
+                sale_date DATE NOT NULL,
+                user VARCHAR(50) NOT NULL,
+                receipts INT NOT NULL DEFAULT 0,
+                gross DECIMAL(15, 2) NOT NULL DEFAULT 0,
+                refunds DECIMAL(15, 2) NOT NULL DEFAULT 0,
+                items INT NOT NULL DEFAULT 0,
+                cost DECIMAL(15, 2) NOT NULL DEFAULT 0,
+                PRIMARY KEY (sale_date, user)
+                );
+            """)
+            conn.commit()
+            print("Sales Daily Rollup table created successfully.")
+        except Exception as e:
+            print(f"Error creating sales daily rollup table: {e}")
+
+        try:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS product_sales_monthly (
+                year SMALLINT NOT NULL,
+                month TINYINT NOT NULL,
+                product_code VARCHAR(50) NOT NULL,
+                user VARCHAR(50) NOT NULL,
+                qty INT NOT NULL DEFAULT 0,
+                revenue DECIMAL(15, 2) NOT NULL DEFAULT 0,
+                cogs DECIMAL(15, 2) NOT NULL DEFAULT 0,
+                PRIMARY KEY (year, month, product_code, user),
+                INDEX idx_psm_product (product_code)
+                );
+            """)
+            conn.commit()
+            print("Product Sales Monthly table created successfully.")
+        except Exception as e:
+            print(f"Error creating product sales monthly table: {e}")
+
         try:
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS sales_control (
@@ -108,7 +171,8 @@ def create_tables():
                 description VARCHAR(100) NOT NULL,
                 user VARCHAR(20) NOT NULL,
                 FOREIGN KEY (receipt_no) REFERENCES sales(receipt_no),
-                FOREIGN KEY (product_code) REFERENCES products(product_code)
+                FOREIGN KEY (product_code) REFERENCES products(product_code),
+                INDEX idx_sales_control_date_user (date, user)
                 );
             """)
             conn.commit()
@@ -131,7 +195,8 @@ def create_tables():
                     authorized VARCHAR(50),
                     posted VARCHAR(50),
                     CONSTRAINT fk_sales_receipt FOREIGN KEY (receipt_no)
-                    REFERENCES sales(receipt_no)
+                    REFERENCES sales(receipt_no),
+                    INDEX idx_sales_reversal_date (date)
                     );
                 """)
             conn.commit()
@@ -164,7 +229,8 @@ def create_tables():
                 date_placed DATE NOT NULL,
                 deadline DATE NOT NULL,
                 amount DECIMAL(10, 2) NOT NULL,
-                status ENUM('Pending', 'Delivered') NOT NULL DEFAULT 'Pending'
+                status ENUM('Pending', 'Delivered') NOT NULL DEFAULT 'Pending',
+                INDEX idx_orders_date_placed (date_placed)
                 );
             """)
             conn.commit()
@@ -219,7 +285,8 @@ def create_tables():
                 order_id INT NOT NULL,
                 total_amount DECIMAL(10, 2) NOT NULL,
                 user VARCHAR(50) NOT NULL,
-                action TEXT NOT NULL
+                action TEXT NOT NULL,
+                INDEX idx_orders_logs_date_user (log_date, user)
                 );
             """)
             conn.commit()
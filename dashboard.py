@@ -23,6 +23,7 @@ from employee_gui import EmployeeManagementWindow
 from employee_gui_popup import ChangePasswordPopup
 from stock_summary import  FetchSummary
 from summary_gui import SummaryPreviewWindow
+from task_runner import runner
 
 
 class SystemDashboard:
@@ -38,6 +39,7 @@ class SystemDashboard:
         self.conn = conn
         self.summary = FetchSummary(self.conn)
         self.labels = []
+        self.refresh_id = None
         self.main_frame = tk.Frame(
             self.window, bg="lightblue", bd=4, relief="solid"
         )
@@ -78,7 +80,8 @@ class SystemDashboard:
         ).pack(side="top", fill="x", anchor="center", padx=5)
         tk.Button(
             self.right_frame, text="Refresh The Above List", bg="dodgerblue",
-            fg="white", bd=4, relief="groove", command=self.show_summary,
+            fg="white", bd=4, relief="groove",
+            command=lambda: self.refresh_summary(max_age=0),
             font=("Arial", 12, "bold")
         ).pack(side="bottom", fill="x", padx=(0, 10))
         self.inside_frame.pack(fill="y", expand=True)
@@ -312,135 +315,65 @@ class SystemDashboard:
         ChangePasswordPopup(self.window, self.conn, self.user)
 
     def show_summary(self):
-        self.build_summary_data()
+        """Render the last snapshot at once, then refresh it in the
+        background and re-render when fresh counters arrive."""
+        cached = FetchSummary.cached_snapshot()
+        if cached:
+            self.build_summary_data(cached)
+            self.render_summary_labels()
+        self.refresh_summary()
+
+    def refresh_summary(self, max_age=None):
+        runner.submit(
+            self.window,
+            lambda conn: FetchSummary(conn).snapshot(max_age),
+            on_done=self.on_snapshot, key=(self.window, "summary"),
+            busy=False
+        )
+        # Keep the counters current while the dashboard is open
+        if self.refresh_id is not None:
+            self.window.after_cancel(self.refresh_id)
+        self.refresh_id = self.window.after(
+            FetchSummary.SNAPSHOT_TTL * 1000, self.refresh_summary, 0
+        )
+
+    def on_snapshot(self, result):
+        counters, err = result
+        if err:
+            messagebox.showerror("Error", err, parent=self.window)
+            return
+        self.build_summary_data(counters)
         self.render_summary_labels()
 
-    def build_summary_data(self):
+    def build_summary_data(self, counters):
         self.labels.clear()
-        curr_year = date.today().year
-        curr_month = date.today().month
-        stock_out, err = self.summary.fetch_out_of_stock_count()
-        if not err:
-            if  stock_out > 0:
-                text = f"{stock_out} Products Are Out Of Stock."
-                self.labels.append((text, "out_of_stock"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Stock Out Count.",
-                parent=self.window
-            )
-        low_stock, err = self.summary.fetch_low_stock_count()
-        if not err:
-            if  low_stock > 0:
-                text = f"{low_stock} Products Are Bellow Minimum Level."
-                self.labels.append((text, "low_stock"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Below Stock Level Count.",
-                parent=self.window
-            )
-        falling_low, err = self.summary.fetch_low_stock_warning_count()
-        if not err:
-            if low_stock > 0:
-                text = f"{falling_low} Products Are Falling To Minimum Soon."
-                self.labels.append((text, "stock_warning"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Warning Stock Count.",
-                parent=self.window
-            )
-        orders, err = self.summary.fetch_pending_orders_count()
-        if not err:
-            if low_stock > 0:
-                text = f"{orders} Orders Are Pending Delivery."
-                self.labels.append((text, "orders"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Pending Orders Count.",
-                parent=self.window
-            )
-        deleted, err = self.summary.fetch_inactive_products_count()
-        if not err:
-            if deleted > 0:
-                text = f"{deleted} Products Are Deleted (Archived)."
-                self.labels.append((text, "deleted"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Delete Products Count.",
-                parent=self.window
-            )
-        unsold, err = self.summary.fetch_unsold_product_count()
-        if not err:
-            if unsold > 0:
-                text = f"{unsold} Items In Stock Have Never Been Sold."
-                self.labels.append((text, "unsold"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Unsold Products Count.",
-                parent=self.window
-            )
-        unsold_m, err = self.summary.fetch_unsold_product_count(
-            curr_year, curr_month
-        )
-        if not err:
-            if unsold_m > 0:
-                text = f"{unsold_m} Items Haven't Been Sold This Month."
-                self.labels.append((text, "unsold_month"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Unsold Products Count Monthly.",
-                parent=self.window
-            )
-        unsold_y, err = self.summary.fetch_unsold_product_count(curr_year)
-        if not err:
-            if unsold_y > 0:
-                text = f"{unsold_y} Items Haven't Been Sold This Year."
-                self.labels.append((text, "unsold_year"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Unsold Products Count Yearly.",
-                parent=self.window
-            )
-        stock_items, err = self.summary.fetch_total_products()
-        if not err:
-            if stock_items > 0:
-                text = f"Total Current Items In Stock Are; {stock_items}."
-                self.labels.append((text, "all_stock"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Total Current Stock Items.",
-                parent=self.window
-            )
-        stock_value, err = self.summary.fetch_total_inventory_value()
-        if not err:
-            if stock_value > 0:
-                text = f"Current Stock Value is; {stock_value:,}."
-                self.labels.append((text, "stock_value"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Current Stock Value.",
-                parent=self.window
-            )
-        inactive_u, err = self.summary.fetch_disabled_user_count()
-        if not err:
-            if stock_value > 0:
-                text = f"{inactive_u} Users Disabled From Loging In."
-                self.labels.append((text, "disabled_users"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Disabled Users Count.",
-                parent=self.window
-            )
-        active, err = self.summary.fetch_active_users_count()
-        if not err:
-            if active > 0:
-                text = f"{active} Current Active Users."
-                self.labels.append((text, "active_users"))
-        else:
-            messagebox.showerror(
-                "Error", f"Error Fetching Active Users.", parent=self.window
-            )
-        all_users = active + inactive_u
+        entries = [
+            ("out_of_stock", "{} Products Are Out Of Stock."),
+            ("low_stock", "{} Products Are Bellow Minimum Level."),
+            ("stock_warning", "{} Products Are Falling To Minimum Soon."),
+            ("pending_orders", "{} Orders Are Pending Delivery."),
+            ("inactive", "{} Products Are Deleted (Archived)."),
+            ("unsold", "{} Items In Stock Have Never Been Sold."),
+            ("unsold_month", "{} Items Haven't Been Sold This Month."),
+            ("unsold_year", "{} Items Haven't Been Sold This Year."),
+            ("total_products", "Total Current Items In Stock Are; {}."),
+            ("inventory_value", "Current Stock Value is; {:,}."),
+            ("disabled_users", "{} Users Disabled From Loging In."),
+            ("active_users", "{} Current Active Users."),
+        ]
+        # Snapshot keys -> click actions handled by on_summary_click
+        actions = {
+            "pending_orders": "orders",
+            "inactive": "deleted",
+            "total_products": "all_stock",
+            "inventory_value": "stock_value",
+        }
+        for key, text in entries:
+            if counters[key] > 0:
+                self.labels.append(
+                    (text.format(counters[key]), actions.get(key, key))
+                )
+        all_users = counters["active_users"] + counters["disabled_users"]
         if all_users > 0:
             text = f"Number Of All System Users; {all_users}."
             self.labels.append((text, "all_users"))
@@ -77,7 +77,8 @@ def create_tables(conn):
                 section VARCHAR(30) NOT NULL,
                 action TEXT NOT NULL,
                 INDEX (username),
-                INDEX (section)
+                INDEX (section),
+                INDEX idx_logs_date_user (log_date, username)
                 );
             """)
             print("Logs table created successfully.")
@@ -0,0 +1,278 @@
+import threading
+from datetime import date, timedelta
+import account_balances
+from fiscal_years import open_from, latest_closing
+
+# Statement figures for any date range. Whole months come from the
+# account_balances snapshots; only the days of a partial first or last
+# month are summed from journal_entry_lines. Date ranges are half-open
+# like query_utils.period_bounds: start is included, end is not. An
+# open start means the ledger since the latest closed year (whose
+# balances its opening entry carries), and an open end means unbounded.
+
+
+def next_month(day):
+    """First day of the month after day's month."""
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
+
+
+class StatementEngine:
+    """Per-account totals for a date range, cached for settled ranges.
+    A range is settled when it ends by the end of the latest closed
+    fiscal year: journals in closed years can be neither posted nor
+    deleted, from any terminal. The cache is tied to that close (year,
+    closed_at, opening journal), so a reopen, edit and close from another
+    terminal drops it. A rebuild of account_balances in this process
+    bumps account_balances.balances_version, which drops it too, and a
+    result computed while either moved is not kept."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache = {} # (start, end) -> {code: (debit, credit)}
+        self._version = None
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+
+    def account_totals(self, conn, start=None, end=None):
+        """{account_code: (debit, credit)} for entry dates in
+        [start, end)."""
+        settled = False
+        if end is not None:
+            with conn.cursor() as cursor:
+                closing = latest_closing(cursor)
+            settled = (
+                closing is not None and end <= date(closing[0] + 1, 1, 1)
+            )
+        if settled:
+            with self._lock:
+                version = (account_balances.balances_version, closing)
+                if self._version != version:
+                    self._cache.clear()
+                    self._version = version
+                cached = self._cache.get((start, end))
+            if cached is not None:
+                return cached
+        totals = self._compute(conn, start, end)
+        if settled:
+            with self._lock:
+                # Keep it only if nothing changed while it was computed
+                current = (account_balances.balances_version, closing)
+                if current == version == self._version:
+                    self._cache[(start, end)] = totals
+        return totals
+
+    def opening_totals(self, conn, start=None, end=None):
+        """{account_code: (debit, credit)} of the year-end opening
+        entries that account_totals(conn, start, end) includes."""
+        totals = {}
+        with conn.cursor() as cursor:
+            if start is None:
+                start = open_from(cursor, end)
+            where, params = self._bounds("j.entry_date", start, end)
+            cursor.execute(f"""
+                SELECT l.account_code, SUM(l.debit), SUM(l.credit)
+                FROM fiscal_years f
+                JOIN journal_entries j ON j.journal_id = f.opening_journal_id
+                JOIN journal_entry_lines l ON l.journal_id = j.journal_id
+                WHERE f.closed AND l.account_code IS NOT NULL AND {where}
+                GROUP BY l.account_code
+            """, tuple(params))
+            self._merge(totals, cursor.fetchall())
+        return totals
+
+    def _compute(self, conn, start, end):
+        totals = {}
+        with conn.cursor() as cursor:
+            if start is None:
+                start = open_from(cursor, end)
+            # Whole months inside [start, end)
+            full_start = start
+            if start is not None and start.day != 1:
+                full_start = next_month(start)
+            full_end = end.replace(day=1) if end is not None else None
+            if (full_start is None or full_end is None
+                    or full_start < full_end):
+                self._add_snapshots(cursor, totals, full_start, full_end)
+                partial = []
+                if start is not None and start < full_start:
+                    partial.append((start, full_start))
+                if end is not None and full_end < end:
+                    partial.append((full_end, end))
+            else:
+                # The range lies within one month
+                partial = [(start, end)]
+            for low, high in partial:
+                self._add_lines(cursor, totals, low, high)
+        return totals
+
+    @staticmethod
+    def _bounds(column, start, end):
+        conditions, params = ["1 = 1"], []
+        if start is not None:
+            conditions.append(f"{column} >= %s")
+            params.append(start)
+        if end is not None:
+            conditions.append(f"{column} < %s")
+            params.append(end)
+        return " AND ".join(conditions), params
+
+    @staticmethod
+    def _merge(totals, rows):
+        for code, debit, credit in rows:
+            old_debit, old_credit = totals.get(code, (0, 0))
+            totals[code] = (
+                old_debit + (debit or 0), old_credit + (credit or 0)
+            )
+
+    def _add_snapshots(self, cursor, totals, start, end):
+        where, params = self._bounds("period", start, end)
+        cursor.execute(f"""
+            SELECT account_code, SUM(debit_total), SUM(credit_total)
+            FROM account_balances
+            WHERE {where}
+            GROUP BY account_code
+        """, tuple(params))
+        self._merge(totals, cursor.fetchall())
+
+    def _add_lines(self, cursor, totals, start, end):
+        where, params = self._bounds("j.entry_date", start, end)
+        cursor.execute(f"""
+            SELECT l.account_code, SUM(l.debit), SUM(l.credit)
+            FROM journal_entry_lines l
+            JOIN journal_entries j ON j.journal_id = l.journal_id
+            WHERE l.account_code IS NOT NULL AND {where}
+            GROUP BY l.account_code
+        """, tuple(params))
+        self._merge(totals, cursor.fetchall())
+
+
+statement_engine = StatementEngine()
+
+
+def fetch_accounts(conn, types=None):
+    """Chart of accounts rows (code, account_name, account_type) ordered
+    by code, optionally limited to account types."""
+    where, params = "", ()
+    if types:
+        where = f"WHERE account_type IN ({', '.join(['%s'] * len(types))})"
+        params = tuple(types)
+    with conn.cursor(dictionary=True) as cursor:
+        cursor.execute(f"""
+            SELECT code, account_name, account_type
+            FROM chart_of_accounts
+            {where}
+            ORDER BY code
+        """, params)
+        return cursor.fetchall()
+
+
+def _as_of_end(as_of):
+    """Half-open end for balances as at the close of as_of."""
+    return as_of + timedelta(days=1) if as_of is not None else None
+
+
+def trial_balance_rows(conn, as_of=None):
+    """Rows shaped like the trial_balance view, as at as_of."""
+    totals = statement_engine.account_totals(conn, None, _as_of_end(as_of))
+    rows = []
+    for account in fetch_accounts(conn):
+        debit, credit = totals.get(account["code"], (0, 0))
+        rows.append({
+            **account, "total_debit": debit, "total_credit": credit,
+            "balance": debit - credit
+        })
+    return rows
+
+
+def income_statement_rows(conn, start=None, end=None):
+    """Rows shaped like the income_statement view for [start, end)."""
+    totals = statement_engine.account_totals(conn, start, end)
+    accounts = fetch_accounts(conn, ("Revenue", "Expense"))
+    rows = []
+    for category in ("Revenue", "Expense"):
+        for account in accounts:
+            if account["account_type"] != category:
+                continue
+            debit, credit = totals.get(account["code"], (0, 0))
+            rows.append({
+                "category": category,
+                "account_code": account["code"],
+                "account_name": account["account_name"],
+                "amount": (
+                    credit - debit if category == "Revenue"
+                    else debit - credit
+                )
+            })
+    return rows
+
+
+def balance_sheet_rows(conn, as_of=None):
+    """Rows shaped like the balance_sheet view, as at as_of."""
+    totals = statement_engine.account_totals(conn, None, _as_of_end(as_of))
+    rows = []
+    for account in fetch_accounts(conn, ("Asset", "Liability", "Equity")):
+        debit, credit = totals.get(account["code"], (0, 0))
+        category = account["account_type"]
+        rows.append({
+            "category": category,
+            "account_code": account["code"],
+            "account_name": account["account_name"],
+            "amount": debit - credit if category == "Asset" else credit - debit
+        })
+    return rows
+
+
+# account types -> cash flow category, as in the cash_flow_statement view
+CASH_FLOW_CATEGORIES = (
+    ("Operating Activity", ("Revenue", "Expense")),
+    ("Financing Activity", ("Equity", "Liability")),
+    ("Investing Activities", ("Asset",)),
+)
+
+
+def cash_flow_rows(conn, start=None, end=None):
+    """Rows shaped like the cash_flow_statement view for [start, end).
+    Balances carried in by an opening entry are not flows of the range,
+    so opening entries are left out."""
+    totals = statement_engine.account_totals(conn, start, end)
+    opening = statement_engine.opening_totals(conn, start, end)
+    accounts = fetch_accounts(conn)
+    rows = []
+    for category, types in CASH_FLOW_CATEGORIES:
+        for account in accounts:
+            if account["account_type"] not in types:
+                continue
+            # Remove non-cash
+            if (category == "Operating Activity"
+                    and "depreciation" in account["account_name"].lower()):
+                continue
+            debit, credit = totals.get(account["code"], (0, 0))
+            carried_debit, carried_credit = opening.get(
+                account["code"], (0, 0)
+            )
+            amount = (credit - carried_credit) - (debit - carried_debit)
+            rows.append({
+                "category": category,
+                "account_code": account["code"],
+                "account_name": account["account_name"],
+                "cash_flow_type": "inflow" if amount >= 0 else "outflow",
+                "amount": amount
+            })
+    return rows
+
+
+def fetch_statement_years(conn):
+    """Years with posted journals, newest first.
+    Returns: (years, None) or ([], error_message)."""
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT DISTINCT YEAR(period) AS year FROM account_balances
+                ORDER BY year DESC
+            """)
+            return [row[0] for row in cursor.fetchall()], None
+    except Exception as e:
+        return [], str(e)
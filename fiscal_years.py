@@ -0,0 +1,121 @@
+from datetime import date
+
+# Fiscal (calendar) years and whether they are closed. Closing a year
+# leaves its journals where they are: the year is flagged closed and an
+# opening entry dated 1 January of the next year carries its balances.
+# The live ledger (statements, journal lists) therefore reads open years
+# only, from the day after the latest closed year onwards.
+# Years closed before this table existed were archived to journal_archive
+# and deleted from the ledger; they have no row here.
+
+
+def create_fiscal_years_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS fiscal_years (
+            year SMALLINT PRIMARY KEY,
+            closed BOOLEAN NOT NULL DEFAULT FALSE,
+            closed_at DATETIME NULL,
+            opening_journal_id INT NULL
+        );
+    """)
+
+
+def open_period_filter(column):
+    """WHERE fragment keeping date column inside open years. It takes no
+    parameters, so it also fits queries built without a connection."""
+    return f"""{column} >= COALESCE((
+        SELECT MAKEDATE(MAX(year) + 1, 1) FROM fiscal_years WHERE closed
+    ), '1000-01-01')"""
+
+
+def latest_closed_year(cursor):
+    cursor.execute("SELECT MAX(year) FROM fiscal_years WHERE closed;")
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def latest_closing(cursor):
+    """(year, closed_at, opening_journal_id) of the latest closed year, or
+    None. Reopening and closing a year again changes closed_at."""
+    cursor.execute("""
+        SELECT year, closed_at, opening_journal_id FROM fiscal_years
+        WHERE closed ORDER BY year DESC LIMIT 1;
+    """)
+    row = cursor.fetchone()
+    return tuple(row) if row else None
+
+
+def earliest_open_year(cursor):
+    """The only year that may be closed next: the one after the latest
+    closed year or, when none is closed, the year of the oldest journal.
+    None when nothing is closed and no journal exists."""
+    latest = latest_closed_year(cursor)
+    if latest is not None:
+        return latest + 1
+    cursor.execute("SELECT YEAR(MIN(entry_date)) FROM journal_entries;")
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def open_from(cursor, end=None):
+    """First day of the ledger for a range ending before end: the day
+    after the latest closed year whose opening entry falls before end.
+    None when no such year is closed."""
+    if end is None:
+        year = latest_closed_year(cursor)
+    else:
+        cursor.execute("""
+            SELECT MAX(year) FROM fiscal_years
+            WHERE closed AND MAKEDATE(year + 1, 1) < %s;
+        """, (end,))
+        row = cursor.fetchone()
+        year = row[0] if row else None
+    return date(year + 1, 1, 1) if year is not None else None
+
+
+def is_closed(cursor, day):
+    """True if day falls in a closed year."""
+    cursor.execute(
+        "SELECT closed FROM fiscal_years WHERE year = %s;", (day.year,)
+    )
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def journal_is_closed(cursor, journal_id):
+    """True if the journal is dated in a closed year."""
+    cursor.execute("""
+        SELECT 1 FROM journal_entries j
+        JOIN fiscal_years f ON f.year = YEAR(j.entry_date)
+        WHERE j.journal_id = %s AND f.closed;
+    """, (journal_id,))
+    return cursor.fetchone() is not None
+
+
+def fetch_opening_journal(cursor, year):
+    """Opening journal id posted when year was closed, or None."""
+    cursor.execute("""
+        SELECT opening_journal_id FROM fiscal_years
+        WHERE year = %s AND closed;
+    """, (year,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def mark_closed(cursor, year, opening_journal_id):
+    cursor.execute("""
+        INSERT INTO fiscal_years (year, closed, closed_at, opening_journal_id)
+        VALUES (%s, TRUE, NOW(), %s)
+        ON DUPLICATE KEY UPDATE
+            closed = TRUE,
+            closed_at = VALUES(closed_at),
+            opening_journal_id = VALUES(opening_journal_id);
+    """, (year, opening_journal_id))
+
+
+def mark_open(cursor, year):
+    cursor.execute("""
+        UPDATE fiscal_years
+        SET closed = FALSE, closed_at = NULL, opening_journal_id = NULL
+        WHERE year = %s;
+    """, (year,))
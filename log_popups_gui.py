@@ -7,15 +7,16 @@ from authentication import VerifyPrivilegePopup, DescriptionFormatter
 from base_window import BaseWindow
 from accounting_export import ReportExporter
 from table_utils import TreeviewSorter
+from paged_loader import PagedLoader
 from working_on_accounting import (
-    fetch_finance_log_filter_data, fetch_finance_logs,
+    fetch_finance_log_filter_data, finance_logs_query,
 )
 from working_on_orders import (
-    fetch_all_orders_logs, fetch_distinct_years_users
+    orders_logs_query, fetch_distinct_years_users
 )
 from working_sales import (
     fetch_sales_control_log_filter_data, fetch_distinct_years,
-    fetch_sales_logs, fetch_reversals_by_month
+    sales_logs_query, fetch_reversals_by_month
 )
 from working_on_stock import fetch_product_control_logs, fetch_distinct_years
 
@@ -79,6 +80,12 @@ class FinanceLogsWindow(BaseWindow):
         self.sorter = TreeviewSorter(self.tree, self.columns, "No.")
         self.sorter.apply_style(style)
         self.sorter.attach_sorting()
+        self.loader = PagedLoader(
+            self.top, self.show_logs,
+            on_error=lambda msg: messagebox.showerror(
+                "Error", msg, parent=self.top
+            )
+        )
         multi_col = "Action"
         self.tree.bind(
             "<Enter>",
@@ -168,7 +175,7 @@ class FinanceLogsWindow(BaseWindow):
         for col in self.columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, anchor="center", width=30)
-        self.tree.configure(yscrollcommand=y_scroll.set)
+        self.loader.watch(self.tree, y_scroll)
         y_scroll.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
         self.tree.tag_configure("evenrow", background="#fffde7")
@@ -204,17 +211,16 @@ class FinanceLogsWindow(BaseWindow):
         title += f" {year}."
         self.title_label.configure(text=title)
         self.title = title
+        self.loader.start(finance_logs_query(year, month, user))
 
-        success, result = fetch_finance_logs(self.conn, year, month, user)
-        if not success:
-            messagebox.showerror("Error", result, parent=self.top)
-            return
-        # Clear current rows
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+    def show_logs(self, result, start, first):
+        """Append a page of logs; the first page replaces the table."""
+        if first:
+            # Clear current rows
+            self.tree.delete(*self.tree.get_children())
 
         formatter = DescriptionFormatter(50, 10)
-        for i, row in enumerate(result, start=1):
+        for i, row in enumerate(result, start=start + 1):
             tag = "evenrow" if i % 2 == 0 else "oddrow"
             action = formatter.wrap(row["action"])
             self.tree.insert("", "end", values=(
@@ -259,8 +265,7 @@ class FinanceLogsWindow(BaseWindow):
                 "You Don't Permission to Export PDF.", parent=self.top
             )
             return
-        exporter = self._make_exporter()
-        exporter.export_pdf()
+        self.loader.when_loaded(lambda: self._make_exporter().export_pdf())
 
     def on_print(self):
         if not self._check_privilege():
@@ -269,8 +274,7 @@ class FinanceLogsWindow(BaseWindow):
                 parent=self.top
             )
             return
-        exporter = self._make_exporter()
-        exporter.print()
+        self.loader.when_loaded(lambda: self._make_exporter().print())
 
     def on_export_excel(self):
         if not self._check_privilege():
@@ -279,8 +283,9 @@ class FinanceLogsWindow(BaseWindow):
                 parent=self.top
             )
             return
-        exporter = self._make_exporter()
-        exporter.export_excel()
+        self.loader.when_loaded(
+            lambda: self._make_exporter().export_excel()
+        )
 
 
 class OrderLogsWindow(BaseWindow):
@@ -345,6 +350,12 @@ class OrderLogsWindow(BaseWindow):
         self.sorter = TreeviewSorter(self.tree, self.columns, "No")
         self.sorter.apply_style(style)
         self.sorter.attach_sorting()
+        self.loader = PagedLoader(
+            self.top, self.show_logs,
+            on_error=lambda msg: messagebox.showerror(
+                "Error", msg, parent=self.top
+            )
+        )
         self.tree.bind(
             "<Enter>",
             lambda e: self.sorter.enable_multiline_height(style, multi_col)
@@ -433,7 +444,7 @@ class OrderLogsWindow(BaseWindow):
         for col in self.columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, anchor="center", width=30)
-        self.tree.configure(yscrollcommand=y_scroll.set)
+        self.loader.watch(self.tree, y_scroll)
         y_scroll.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
         self.tree.tag_configure("evenrow", background="#fffde7")
@@ -469,17 +480,16 @@ class OrderLogsWindow(BaseWindow):
         title += f" {year}."
         self.title_label.configure(text=title)
         self.title = title
+        self.loader.start(orders_logs_query(year, month, user))
 
-        result = fetch_all_orders_logs(self.conn, year, month, user)
-        if isinstance(result, str):
-            messagebox.showerror("Error", result, parent=self.top)
-            return
-        # Clear current rows
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+    def show_logs(self, result, start, first):
+        """Append a page of logs; the first page replaces the table."""
+        if first:
+            # Clear current rows
+            self.tree.delete(*self.tree.get_children())
 
         formater = DescriptionFormatter(70, 10)
-        for i, row in enumerate(result, start=1):
+        for i, row in enumerate(result, start=start + 1):
             tag = "evenrow" if i % 2 == 0 else "oddrow"
             action = formater.wrap(row["action"])
             self.tree.insert("", "end", values=(
@@ -524,16 +534,14 @@ class OrderLogsWindow(BaseWindow):
                 "You Don't Permission to Export PDF.", parent=self.top
             )
             return
-        exporter = self._make_exporter()
-        exporter.export_pdf()
+        self.loader.when_loaded(lambda: self._make_exporter().export_pdf())
 
     def on_print(self):
         if not self._check_privilege():
             messagebox.showwarning(
                 "Access Denied", "You Don't Permission to Print Logs.")
             return
-        exporter = self._make_exporter()
-        exporter.print()
+        self.loader.when_loaded(lambda: self._make_exporter().print())
 
 
 class MonthlyReversalLogs(BaseWindow):
@@ -640,9 +648,6 @@ class MonthlyReversalLogs(BaseWindow):
 
     def load_data(self):
         """Load Reversals for selected year and month."""
-        # Clear old data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
         year = int(self.year_cb.get())
         month = None
         title = f"Reversals Logs"
@@ -653,8 +658,16 @@ class MonthlyReversalLogs(BaseWindow):
         if not year:
             return
         title += f" In {year}."
-        # Insert into table
-        success, rows = fetch_reversals_by_month(self.conn, year, month)
+        self.run_in_background(
+            self.window, fetch_reversals_by_month, year, month,
+            on_done=lambda result: self.show_data(result, title)
+        )
+
+    def show_data(self, result, title):
+        success, rows = result
+        # Clear old data
+        for item in self.tree.get_children():
+            self.tree.delete(item)
         if not success:
             messagebox.showerror(
                 "Error", f"Error Fetching Data: {rows}", parent=self.window
@@ -784,6 +797,12 @@ class SalesLogsWindow(BaseWindow):
         self.sorter.apply_style(style)
         self.sorter.attach_sorting()
         self.sorter.bind_mousewheel()
+        self.loader = PagedLoader(
+            self.top, self.show_logs,
+            on_error=lambda msg: messagebox.showerror(
+                "Error", msg, parent=self.top
+            )
+        )
 
         self.build_ui()
         self.refresh_table()
@@ -865,7 +884,7 @@ class SalesLogsWindow(BaseWindow):
         for col in self.columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, anchor="center", width=30)
-        self.tree.configure(yscrollcommand=y_scroll.set)
+        self.loader.watch(self.tree, y_scroll)
         y_scroll.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
         self.tree.tag_configure("evenrow", background="#fffde7")
@@ -901,15 +920,14 @@ class SalesLogsWindow(BaseWindow):
         title += f" {year}."
         self.title_label.configure(text=title)
         self.title = title
-        success, data = fetch_sales_logs(self.conn, year, month, user)
-        if not success:
-            messagebox.showerror("Error", data, parent=self.top)
-            return
-
-        # Clear current rows
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for i, row in enumerate(data, start=1):
+        self.loader.start(sales_logs_query(year, month, user))
+
+    def show_logs(self, data, start, first):
+        """Append a page of logs; the first page replaces the table."""
+        if first:
+            # Clear current rows
+            self.tree.delete(*self.tree.get_children())
+        for i, row in enumerate(data, start=start + 1):
             tag = "evenrow" if i % 2 == 0 else "oddrow"
             self.tree.insert("", "end", values=(
                 i,
@@ -958,8 +976,7 @@ class SalesLogsWindow(BaseWindow):
                 "You Don't Permission to Export PDF.", parent=self.top
             )
             return
-        exporter = self._make_exporter()
-        exporter.export_pdf()
+        self.loader.when_loaded(lambda: self._make_exporter().export_pdf())
 
     def on_print(self):
         if not self._check_privilege():
@@ -968,8 +985,7 @@ class SalesLogsWindow(BaseWindow):
                 parent=self.top
             )
             return
-        exporter = self._make_exporter()
-        exporter.print()
+        self.loader.when_loaded(lambda: self._make_exporter().print())
 
 
 class ProductLogsWindow(BaseWindow):
@@ -1105,8 +1121,13 @@ class ProductLogsWindow(BaseWindow):
         title += f" In {year}."
         self.title_label.configure(text=title)
         self.title = title
+        self.run_in_background(
+            self.top, fetch_product_control_logs, year, month,
+            on_done=self.show_logs
+        )
 
-        success, logs = fetch_product_control_logs(self.conn, year, month)
+    def show_logs(self, result):
+        success, logs = result
         if not success:
             messagebox.showerror("Error", logs, parent=self.top)
             return
@@ -4,8 +4,9 @@ from tkinter import messagebox
 from base_window import BaseWindow
 from accounting_export import ReportExporter
 from authentication import VerifyPrivilegePopup, DescriptionFormatter
-from working_on_employee import fetch_log_filter_data, fetch_logs
-from table_utils import TreeviewSorter
+from working_on_employee import fetch_log_filter_data, logs_query
+from table_utils import VirtualTreeview
+from paged_loader import PagedLoader
 from log_popups_gui import (
     FinanceLogsWindow, OrderLogsWindow, MonthlyReversalLogs, SalesLogsWindow,
     ProductLogsWindow
@@ -77,10 +78,17 @@ class SystemLogsWindow(BaseWindow):
             self.table_frame, columns=self.columns, show="headings"
         )
         multi_col = "Operation"
-        self.sorter = TreeviewSorter(self.tree, self.columns, "No")
+        self.sorter = VirtualTreeview(self.tree, self.columns, "No")
         self.sorter.apply_style(style)
         self.sorter.attach_sorting()
         self.sorter.bind_mousewheel()
+        self.loader = PagedLoader(
+            self.top, self.show_logs,
+            on_error=lambda msg: messagebox.showerror(
+                "Error", msg, parent=self.top
+            )
+        )
+        self.loader.watch(self.sorter)
         self.tree.bind(
             "<Enter>",
             lambda e: self.sorter.enable_multiline_height(style, multi_col)
@@ -197,13 +205,11 @@ class SystemLogsWindow(BaseWindow):
             "<<ComboboxSelected>>", lambda e: self.refresh_table()
         )
         self.table_frame.pack(fill="both", expand=True)
-        y_scroll = ttk.Scrollbar(
-            self.table_frame, orient="vertical", command=self.tree.yview
-        )
+        y_scroll = ttk.Scrollbar(self.table_frame, orient="vertical")
         for col in self.columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, anchor="center", width=30)
-        self.tree.configure(yscrollcommand=y_scroll.set)
+        self.sorter.attach_scrollbar(y_scroll)
         y_scroll.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
         self.tree.tag_configure("evenrow", background="#fffde7")
@@ -248,27 +254,27 @@ class SystemLogsWindow(BaseWindow):
             title += f" In {dept}"
         self.title_label.configure(text=title)
         self.title = title
+        self.loader.start(logs_query(year, month, user, dept))
 
-        success, logs = fetch_logs(self.conn, year, month, user, dept)
-        if not success:
-            messagebox.showerror("Error", logs, parent=self.top)
-            return
-        # Clear current rows
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+    def show_logs(self, logs, start, first):
+        """Append a page of logs; the first page replaces the table."""
+        if first:
+            # Clear current rows
+            self.sorter.clear()
 
         formatter = DescriptionFormatter(80, 10)
-        for i, row in enumerate(logs, start=1):
+        for i, row in enumerate(logs, start=start + 1):
             tag = "evenrow" if i % 2 == 0 else "oddrow"
             action = formatter.wrap(row["action"])
-            self.tree.insert("", "end", values=(
+            self.sorter.insert((
                 i,
                 row["log_date"].strftime("%d/%m/%Y"),
                 row["log_time"],
                 row["username"],
                 row["section"],
                 action
-            ), tags=(tag,))
+            ), (tag,))
+        self.sorter.render()
         self.sorter.autosize_columns(5)
 
     def has_privilege(self, privilege: str) -> bool:
@@ -287,8 +293,7 @@ class SystemLogsWindow(BaseWindow):
 
     def _collect_current_rows(self):
         rows = []
-        for item in self.tree.get_children():
-            vals = self.tree.item(item, "values")
+        for vals in self.sorter.values():
             rows.append({
                 "No": vals[0],
                 "Date": vals[1],
@@ -308,14 +313,12 @@ class SystemLogsWindow(BaseWindow):
     def on_export_pdf(self):
         if not self.has_privilege("View Logs"):
             return
-        exporter = self._make_exporter()
-        exporter.export_pdf()
+        self.loader.when_loaded(lambda: self._make_exporter().export_pdf())
 
     def on_print(self):
         if not self.has_privilege("View Logs"):
             return
-        exporter = self._make_exporter()
-        exporter.print()
+        self.loader.when_loaded(lambda: self._make_exporter().print())
 
     def stock_logs(self):
         if not self.has_privilege("View Products Logs"):
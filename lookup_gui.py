@@ -3,7 +3,8 @@ import tkinter as tk
 from tkinter import StringVar
 from tkinter import ttk
 from base_window import BaseWindow
-from working_sales import search_products
+from product_catalog import catalog
+from suggestion_engine import SuggestionEngine
 from table_utils import TreeviewSorter
 
 
@@ -47,6 +48,10 @@ class ProductSearchWindow(BaseWindow):
         self.sorter.apply_style(style)
         self.sorter.attach_sorting()
         self.sorter.bind_mousewheel()
+        self.search_field = "product_name"
+        self.engine = SuggestionEngine(
+            self.window, self.fetch_matches, self.show_results
+        )
 
         self.create_widgets()
         self.sorter.autosize_columns(10)
@@ -88,15 +93,17 @@ class ProductSearchWindow(BaseWindow):
 
     def perform_search(self, event=None):
         keyword = self.search_var.get().strip()
-        field = self.combo.get()
-        if field == "Name":
-            search_field = "product_name"
-        else:
-            search_field = "product_code"
         if not keyword:
+            self.engine.cancel()
             self.tree.delete(*self.tree.get_children())
             return
-        result = search_products(self.conn, search_field, keyword)
+        self.engine.request(keyword)
+
+    def fetch_matches(self, conn, keyword):
+        """Runs in a worker thread; must not touch widgets."""
+        return catalog.search(conn, keyword, self.search_field, anywhere=True)
+
+    def show_results(self, keyword, result):
         # Clear and insert results
         self.tree.delete(*self.tree.get_children())
         for i, row in enumerate(result, start=1):
@@ -121,4 +128,10 @@ class ProductSearchWindow(BaseWindow):
         else:
             label = "Search Product Code:"
         self.search_label.config(text=label)
+        # Cached rows belong to the previous field
+        self.search_field = (
+            "product_name" if selected_option == "Name" else "product_code"
+        )
+        self.engine.clear()
+        self.perform_search()
 
@@ -5,6 +5,7 @@ from windows_utils import DateFormatter
 from connect_to_db import connect_db
 from base_window import BaseWindow
 from working_on_employee import CheckAdmin
+from migrations import run_migrations
 from login_gui import LoginWindow, UpdatePasswordWindow, AdminLoginWindow
 
 
@@ -110,6 +111,11 @@ class MugambiPOSApp(BaseWindow):
 
     def run_startup_checks(self):
         """Ensure system-critical defaults exists before app use."""
+        success, msg = run_migrations(self.conn)
+        if not success:
+            messagebox.showwarning(
+                "Database Upgrade", msg, parent=self.master
+            )
         checker = CheckAdmin(self.conn)
         success, msg = checker.ensure_admin_exists()
 
@@ -0,0 +1,279 @@
+# Versioned schema migrations. Each one runs once and is recorded in
+# schema_migrations; steps also check the live schema, so databases that
+# were altered by hand are left as they are. A step returns False when a
+# table it needs does not exist yet; its version is then left unrecorded
+# and retried at the next startup.
+
+
+def column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone() is not None
+
+
+def index_exists(cursor, table, index):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            AND INDEX_NAME = %s
+        LIMIT 1
+    """, (table, index))
+    return cursor.fetchone() is not None
+
+
+def table_exists(cursor, table):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table,))
+    return cursor.fetchone() is not None
+
+
+def add_column(table, column, definition):
+    """Step adding a column if it is missing."""
+    def step(cursor):
+        if not table_exists(cursor, table):
+            return False
+        if not column_exists(cursor, table, column):
+            cursor.execute(
+                f"ALTER TABLE {table} ADD COLUMN {column} {definition};"
+            )
+    return step
+
+
+def add_indexes(*indexes):
+    """Step adding (table, index_name, columns) indexes if missing."""
+    def step(cursor):
+        complete = True
+        for table, name, columns in indexes:
+            if not table_exists(cursor, table):
+                complete = False
+                continue
+            if not index_exists(cursor, table, name):
+                cursor.execute(
+                    f"CREATE INDEX {name} ON {table} ({columns});"
+                )
+        return complete
+    return step
+
+
+def cascade_order_items_product_fk(cursor):
+    """Recreate order_items.product_code FK with ON UPDATE/DELETE CASCADE."""
+    if not table_exists(cursor, "order_items"):
+        return False
+    cursor.execute("""
+        SELECT CONSTRAINT_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'order_items'
+            AND COLUMN_NAME = 'product_code'
+            AND REFERENCED_TABLE_NAME = 'products';
+    """)
+    names = [row[0] for row in cursor.fetchall()]
+    if "fk_orderitems_productcode" in names:
+        return
+    for fk_name in names:
+        cursor.execute(f"ALTER TABLE order_items DROP FOREIGN KEY {fk_name};")
+    cursor.execute("""
+        ALTER TABLE order_items
+        ADD CONSTRAINT fk_orderitems_productcode
+        FOREIGN KEY (product_code)
+        REFERENCES products(product_code)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE;
+    """)
+
+
+def create_product_sales_stats(cursor):
+    """Create the per-product "last sold" table and fill it from history."""
+    from working_sales import fill_product_sales_stats
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS product_sales_stats (
+            product_code VARCHAR(50) PRIMARY KEY,
+            first_sold DATE NOT NULL,
+            last_sold DATE NOT NULL,
+            stats_month DATE NOT NULL,
+            units_ytd INT NOT NULL DEFAULT 0,
+            units_mtd INT NOT NULL DEFAULT 0,
+            INDEX idx_pss_last_sold (last_sold),
+            FOREIGN KEY (product_code) REFERENCES products(product_code)
+                ON UPDATE CASCADE
+                ON DELETE CASCADE
+        );
+    """)
+    fill_product_sales_stats(cursor)
+
+
+def create_sales_daily_rollup(cursor):
+    """Create the per-day, per-cashier sales rollup and backfill it."""
+    from sales_rollups import fill_sales_daily_rollup
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sales_daily_rollup (
+            sale_date DATE NOT NULL,
+            user VARCHAR(50) NOT NULL,
+            receipts INT NOT NULL DEFAULT 0,
+            gross DECIMAL(15, 2) NOT NULL DEFAULT 0,
+            refunds DECIMAL(15, 2) NOT NULL DEFAULT 0,
+            items INT NOT NULL DEFAULT 0,
+            cost DECIMAL(15, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (sale_date, user)
+        );
+    """)
+    fill_sales_daily_rollup(cursor)
+
+
+def create_product_sales_monthly(cursor):
+    """Create the per-month product sales rollup and backfill it."""
+    from sales_rollups import fill_product_sales_monthly
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS product_sales_monthly (
+            year SMALLINT NOT NULL,
+            month TINYINT NOT NULL,
+            product_code VARCHAR(50) NOT NULL,
+            user VARCHAR(50) NOT NULL,
+            qty INT NOT NULL DEFAULT 0,
+            revenue DECIMAL(15, 2) NOT NULL DEFAULT 0,
+            cogs DECIMAL(15, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (year, month, product_code, user),
+            INDEX idx_psm_product (product_code)
+        );
+    """)
+    fill_product_sales_monthly(cursor)
+
+
+def create_account_balances(cursor):
+    """Create account_balances and backfill it. The statement views read
+    fiscal_years too, so they are pointed at it by migration 15."""
+    from account_balances import (
+        create_account_balances_table, fill_account_balances
+    )
+    create_account_balances_table(cursor)
+    fill_account_balances(cursor)
+
+
+def create_fiscal_years(cursor):
+    """Create fiscal_years; years are flagged closed instead of being
+    archived and deleted from the ledger."""
+    from fiscal_years import create_fiscal_years_table
+    create_fiscal_years_table(cursor)
+
+
+def recreate_statement_views(cursor):
+    """Point the statement views at open years only."""
+    if not (table_exists(cursor, "account_balances")
+            and table_exists(cursor, "fiscal_years")):
+        return False
+    from account_balances import create_statement_views
+    create_statement_views(cursor)
+
+
+# (version, description, step). Append new migrations; never renumber.
+MIGRATIONS = [
+    (1, "Add logins.pass_change", add_column(
+        "logins", "pass_change",
+        "ENUM('true', 'false') NOT NULL DEFAULT 'true' AFTER password"
+    )),
+    (2, "Add sales.sale_time", add_column(
+        "sales", "sale_time", "TIME NOT NULL AFTER sale_date"
+    )),
+    (3, "Add access.clearance", add_column("access", "clearance", "TEXT")),
+    (4, "Cascade order_items product FK", cascade_order_items_product_fk),
+    (5, "Index report date columns", add_indexes(
+        ("sales", "idx_sales_date_user", "sale_date, user"),
+        ("sale_items", "idx_sale_items_date_user", "date, user"),
+        ("product_control_logs", "idx_pcl_log_date", "log_date"),
+        ("sales_control", "idx_sales_control_date_user", "date, user"),
+        ("sales_reversal", "idx_sales_reversal_date", "date"),
+        ("orders", "idx_orders_date_placed", "date_placed"),
+        ("orders_logs", "idx_orders_logs_date_user", "log_date, user"),
+        ("logs", "idx_logs_date_user", "log_date, username"),
+    )),
+    (6, "Index hot lookup columns", add_indexes(
+        ("cashier_control", "idx_cashier_user_status", "username, status"),
+        ("sales_reversal", "idx_reversal_receipt_code",
+         "receipt_no, product_code"),
+        ("sale_items", "idx_sale_items_receipt_code",
+         "receipt_no, product_code"),
+        ("finance_logs", "idx_finance_logs_date_user", "log_date, username"),
+    )),
+    (7, "Track product changes for the catalog", add_column(
+        "products", "updated_at",
+        "TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP "
+        "ON UPDATE CURRENT_TIMESTAMP"
+    )),
+    (8, "Index products.updated_at", add_indexes(
+        ("products", "idx_products_updated_at", "updated_at"),
+    )),
+    (9, "Add product_sales_stats", create_product_sales_stats),
+    (10, "Add sales_daily_rollup", create_sales_daily_rollup),
+    (11, "Add product_sales_monthly", create_product_sales_monthly),
+    (12, "Add account_balances", create_account_balances),
+    (13, "Index journal dates for year end", add_indexes(
+        ("journal_entries", "idx_journal_entries_date", "entry_date"),
+        ("journal_archive", "idx_journal_archive_year", "period_end_year"),
+    )),
+    (14, "Add fiscal_years", create_fiscal_years),
+    (15, "Limit statement views to open years", recreate_statement_views),
+]
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(100) NOT NULL,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+
+def fetch_applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations;")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def run_migrations(conn, migrations=None):
+    """Apply pending migrations in version order. Safe to call at every
+    startup. Returns: (True, message) or (False, error_message)."""
+    if not conn:
+        return False, "Database connection failed."
+    migrations = sorted(migrations or MIGRATIONS, key=lambda m: m[0])
+    applied_now = []
+    deferred = []
+    try:
+        with conn.cursor() as cursor:
+            ensure_migrations_table(cursor)
+            applied = fetch_applied_versions(cursor)
+            for version, description, step in migrations:
+                if version in applied:
+                    continue
+                if step(cursor) is False:
+                    # A table it needs is missing; retry next time
+                    conn.commit()
+                    deferred.append(version)
+                    continue
+                cursor.execute("""
+                    INSERT INTO schema_migrations (version, description)
+                    VALUES (%s, %s);
+                """, (version, description))
+                conn.commit()
+                applied_now.append(version)
+        waiting = ""
+        if deferred:
+            waiting = f" Waiting For Missing Tables: {deferred}."
+        if not applied_now:
+            return True, f"Schema Up To Date.{waiting}"
+        return True, f"Applied {len(applied_now)} Migration(s).{waiting}"
+    except Exception as e:
+        conn.rollback()
+        done = f" after {applied_now}" if applied_now else ""
+        return False, f"Migration Failed{done}: {str(e)}."
+
+
+if __name__ == "__main__":
+    from connect_to_db import connect_db
+    conn = connect_db()
+    success, msg = run_migrations(conn)
+    print(success, msg)
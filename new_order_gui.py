@@ -6,9 +6,9 @@ from base_window import BaseWindow
 from lookup_gui import ProductSearchWindow
 from windows_utils import to_uppercase, auto_format_date, CurrencyFormatter
 from table_utils import TreeviewSorter
-from working_on_orders import (
-    insert_order_data, fetch_order_product, search_product_codes
-)
+from working_on_orders import insert_order_data, fetch_order_product
+from product_catalog import catalog
+from suggestion_engine import SuggestionEngine
 
 
 class NewOrderWindow(BaseWindow):
@@ -56,6 +56,11 @@ class NewOrderWindow(BaseWindow):
         self.suggestions_listbox = tk.Listbox(
             self.search_section, bg="lightgray"
         )
+        self.engine = SuggestionEngine(
+            self.master,
+            lambda conn, text: catalog.search(conn, text, limit=10),
+            self.show_suggestions
+        )
         self.search_button = tk.Button(
             self.search_section, text="Search", command=self.search_product,
             bd=4, relief="groove", font=("Arial", 10, "bold")
@@ -229,6 +234,7 @@ class NewOrderWindow(BaseWindow):
             if values:
                 values[0] = i # update No.
                 self.tree.item(iid, values=values)
+        self.sorter.invalidate()
         messagebox.showinfo(
             "Success",
             "Product Successfully Removed From Order.", parent=self.master
@@ -327,9 +333,12 @@ class NewOrderWindow(BaseWindow):
         self.product_code_entry.delete(0, tk.END)
         self.product_code_entry.insert(0, text)
         if not text:
+            self.engine.cancel()
             self.suggestions_listbox.grid_remove()
             return
-        results = search_product_codes(self.conn, text)
+        self.engine.request(text)
+
+    def show_suggestions(self, text, results):
         self.suggestions_listbox.delete(0, tk.END)
         if results:
             for item in results:
@@ -5,8 +5,10 @@ from windows_utils import to_uppercase, DateEntryFormatter
 from authentication import VerifyPrivilegePopup
 from working_on_orders import (
     fetch_order_product, add_order_item, update_order_item,
-    search_product_codes, update_order_details,
+    update_order_details,
 )
+from product_catalog import catalog
+from suggestion_engine import SuggestionEngine
 
 
 class AddItemWindow(BaseWindow):
@@ -45,6 +47,11 @@ class AddItemWindow(BaseWindow):
             self.main_frame, text="Add to Order", bd=2, relief="solid",
             width=10, command=self.add_to_order,
         )
+        self.engine = SuggestionEngine(
+            self.top,
+            lambda conn, text: catalog.search(conn, text, limit=10),
+            self.show_suggestions
+        )
 
         self.build_ui()
 
@@ -82,9 +89,12 @@ class AddItemWindow(BaseWindow):
         self.code_entry.delete(0, tk.END)
         self.code_entry.insert(0, text)
         if not text:
+            self.engine.cancel()
             self.suggestions_listbox.grid_remove()
             return
-        results = search_product_codes(self.conn, text)
+        self.engine.request(text)
+
+    def show_suggestions(self, text, results):
         self.suggestions_listbox.delete(0, tk.END)
         if results:
             for item in results:
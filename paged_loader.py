@@ -0,0 +1,152 @@
+from tkinter import messagebox
+from query_utils import PAGE_SIZE
+from task_runner import runner
+
+
+def _first_page(conn, query, size):
+    rows, after = query.page(conn, size=size)
+    total = len(rows)
+    if after is not None:
+        total = max(total, query.estimate_count(conn))
+    return rows, after, total
+
+
+def _next_page(conn, query, after, size):
+    return query.page(conn, after, size)
+
+
+def _rest(conn, query, after, size, task=None):
+    for rows, next_after in query.pages(conn, after, size):
+        task.check()
+        task.report(rows, next_after)
+
+
+class PagedLoader:
+    """Streams a KeysetQuery into a window page by page.
+    - start(query) fetches the first page in the background and hands it
+      to on_page(rows, start_index, first) so the table shows at once.
+    - more() fetches the next page; watch() calls it when the user
+      scrolls near the end of what is loaded.
+    - when_loaded(callback) reads the remaining pages (export, print,
+      filters over every row) and then calls callback().
+    `total` is the optimizer's estimate of the result size until the last
+    page is read, then the exact number of rows loaded."""
+    NEAR_END = 0.9
+
+    def __init__(self, widget, on_page, on_error=None, page_size=PAGE_SIZE):
+        self.widget = widget
+        self.on_page = on_page
+        self.on_error = on_error
+        self.page_size = page_size
+        self.query = None
+        self.after = None
+        self.done = True
+        self.loaded = 0
+        self.total = 0
+        self._task = None
+        self._waiting = []
+
+    def start(self, query):
+        """Drop what is loaded and show the first page of query."""
+        if self._task is not None:
+            self._task.cancel()
+        self.query = query
+        self.after = None
+        self.done = False
+        self.loaded = 0
+        self.total = 0
+        self._waiting = []
+        self._task = self._submit(
+            _first_page, query, self.page_size, on_done=self._on_first
+        )
+
+    def more(self):
+        """Fetch the next page unless one is loading or all are loaded."""
+        if self.done or self._task is not None:
+            return
+        self._task = self._submit(
+            _next_page, self.query, self.after, self.page_size,
+            on_done=lambda result: self._on_page(*result)
+        )
+
+    def when_loaded(self, callback):
+        """Call callback() once every page has been loaded."""
+        if self.done and self._task is None:
+            callback()
+            return
+        if callback not in self._waiting:
+            self._waiting.append(callback)
+        if self._task is None:
+            self._load_rest()
+
+    def watch(self, tree, scrollbar=None):
+        """Load more when scrolled near the end. tree is a VirtualTreeview,
+        or a ttk.Treeview together with its vertical scrollbar."""
+        if hasattr(tree, "on_near_end"):
+            tree.on_near_end = self.more
+            return
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= self.NEAR_END:
+                self.more()
+        tree.configure(yscrollcommand=on_scroll)
+
+    def _submit(self, func, *args, **kwargs):
+        return runner.submit(
+            self.widget, func, *args, on_error=self._on_failed,
+            key=(self, "page"), **kwargs
+        )
+
+    def _on_first(self, result):
+        rows, after, total = result
+        self.total = total
+        self._on_page(rows, after)
+
+    def _on_page(self, rows, after):
+        self._task = None
+        self._add(rows, after)
+        if self._waiting and not self.done:
+            self._load_rest()
+        self._notify()
+
+    def _add(self, rows, after):
+        start = self.loaded
+        self.loaded += len(rows)
+        self.after = after
+        if after is None:
+            self.done = True
+            self.total = self.loaded
+        else:
+            self.total = max(self.total, self.loaded)
+        self.on_page(rows, start, start == 0)
+
+    def _load_rest(self):
+        self._task = self._submit(
+            _rest, self.query, self.after, self.page_size,
+            with_task=True, on_progress=self._add, on_done=self._on_rest
+        )
+
+    def _on_rest(self, _result):
+        self._task = None
+        self.done = True
+        self.total = self.loaded
+        self._notify()
+
+    def _notify(self):
+        if not self.done:
+            return
+        waiting, self._waiting = self._waiting, []
+        for callback in waiting:
+            callback()
+
+    def _on_failed(self, message):
+        self._task = None
+        self._waiting = []
+        if self.on_error is not None:
+            self.on_error(message)
+        else:
+            messagebox.showerror(
+                "Error", f"Loading page failed: {message}",
+                parent=self.widget
+            )
@@ -0,0 +1,149 @@
+import bisect
+import threading
+import time
+
+
+class ProductCatalog:
+    """In-memory index of active products for the till and type-ahead.
+    - Hash index: product_code -> product row.
+    - Sorted prefix indexes over product codes and names.
+    Refreshes incrementally at most every CHECK_INTERVAL seconds: rows
+    stamped from OVERLAP seconds before the latest products.updated_at
+    seen are fetched again each time. updated_at is set when a row is
+    written, not when its transaction commits, so a change committed
+    after a newer one carries an older stamp; it also only has one
+    second resolution. Rows that come back unchanged leave the index as
+    it is. A drop in the row count (deleted products) forces a full
+    reload.
+    Searches run on worker threads, so a refresh builds a new index aside
+    and swaps it in with one assignment; readers take (by_code, keys)
+    once and never see a half-built index."""
+    CHECK_INTERVAL = 5.0
+    # Seconds a product write may take to commit and still be picked up
+    OVERLAP = 60
+    FIELDS = {"product_code", "product_name"}
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (product_code -> row, field -> sorted [(casefolded value, code)])
+        self._index = ({}, {field: [] for field in self.FIELDS})
+        self._version = None # (row_count, max_updated_at) at last load
+        self._checked_at = 0.0
+
+    def mark_stale(self):
+        """Force the change counter to be checked on next use."""
+        self._checked_at = 0.0
+
+    def refresh(self, conn, force=False):
+        """Bring the index up to date with the products table."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked_at < self.CHECK_INTERVAL:
+                return
+            self._checked_at = now
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT COUNT(*), MAX(updated_at) FROM products;"
+                )
+                version = tuple(cursor.fetchone())
+            if (force or self._version is None
+                    or version[0] < self._version[0]):
+                self._index = self._build({}, self._fetch(conn))
+            else:
+                # Rows changed since shortly before the last seen stamp,
+                # including late commits and changes in that same second
+                rows = self._changed(
+                    self._index[0], self._fetch(conn, since=self._version[1])
+                )
+                if rows:
+                    self._index = self._build(dict(self._index[0]), rows)
+            self._version = version
+
+    def _try_refresh(self, conn):
+        """Refresh, but keep serving the current index if MySQL fails."""
+        try:
+            self.refresh(conn)
+        except Exception as e:
+            print(f"Error refreshing product catalog: {e}")
+
+    @staticmethod
+    def _fetch(conn, since=None):
+        query = """
+            SELECT product_code, product_name, quantity, wholesale_price,
+                retail_price, is_active
+            FROM products
+        """
+        params = ()
+        if since is not None:
+            query += " WHERE updated_at >= %s - INTERVAL %s SECOND"
+            params = (since, ProductCatalog.OVERLAP)
+        with conn.cursor(dictionary=True) as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    @staticmethod
+    def _changed(by_code, rows):
+        """rows that would change by_code."""
+        changed = []
+        for row in rows:
+            current = by_code.get(row["product_code"])
+            if row["is_active"]:
+                values = {k: v for k, v in row.items() if k != "is_active"}
+                if current != values:
+                    changed.append(row)
+            elif current is not None:
+                changed.append(row)
+        return changed
+
+    def _build(self, by_code, rows):
+        """Apply rows to by_code (a private copy) and return the new
+        (by_code, keys) index."""
+        for row in rows:
+            code = row["product_code"]
+            if row.pop("is_active"):
+                by_code[code] = row
+            else:
+                by_code.pop(code, None)
+        keys = {
+            field: sorted(
+                (str(row[field]).casefold(), code)
+                for code, row in by_code.items()
+            )
+            for field in self.FIELDS
+        }
+        return by_code, keys
+
+    def get(self, conn, product_code):
+        """Return the active product row for product_code, or None."""
+        self._try_refresh(conn)
+        by_code, _ = self._index
+        row = by_code.get(product_code)
+        return dict(row) if row else None
+
+    def search(self, conn, keyword, field="product_code", limit=15,
+               anywhere=False):
+        """Products whose field starts with keyword (or contains it when
+        anywhere=True), ordered by field. Returns a list of dicts."""
+        if field not in self.FIELDS:
+            raise ValueError(f"Cannot search products by {field}.")
+        self._try_refresh(conn)
+        keyword = str(keyword).casefold()
+        by_code, index = self._index
+        keys = index[field]
+        codes = []
+        if anywhere:
+            for key, code in keys:
+                if keyword in key:
+                    codes.append(code)
+                    if len(codes) >= limit:
+                        break
+        else:
+            start = bisect.bisect_left(keys, (keyword,))
+            for key, code in keys[start:start + limit]:
+                if not key.startswith(keyword):
+                    break
+                codes.append(code)
+        return [dict(by_code[code]) for code in codes]
+
+
+catalog = ProductCatalog()
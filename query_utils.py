@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+
+
+def period_bounds(year, month=None, day=None):
+    """Return (start, end) dates covering a year, a month or a single day.
+    The range is half-open: start is included, end is not."""
+    year = int(year)
+    if not month:
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    month = int(month)
+    if not day:
+        start = date(year, month, 1)
+        if month == 12:
+            return start, date(year + 1, 1, 1)
+        return start, date(year, month + 1, 1)
+    start = date(year, month, int(day))
+    return start, start + timedelta(days=1)
+
+
+def period_filter(column, year, month=None, day=None):
+    """Build a WHERE fragment selecting rows of column inside a period.
+    Emits 'column >= %s AND column < %s' instead of YEAR()/MONTH() so
+    MySQL can range-scan an index on column.
+    Returns: (sql_fragment, [start, end])."""
+    start, end = period_bounds(year, month, day)
+    return f"{column} >= %s AND {column} < %s", [start, end]
+
+
+# Rows per page for paginated report queries
+PAGE_SIZE = 500
+
+
+class KeysetQuery:
+    """Keyset ("seek") pagination for report queries.
+    select - 'SELECT ... FROM ... [JOIN ...]' without WHERE / ORDER BY.
+    keys - sort columns as column names or (column, field) pairs, field
+      being the name in result rows; the last key must be unique (id).
+    where/params - filter fragment and its parameters.
+    Each page continues after the previous page's last key values with a
+    row comparison ('(k1, k2, id) < (%s, %s, %s)'), so every page is an
+    index range read however deep the user scrolls (no OFFSET)."""
+    def __init__(self, select, keys, where="1 = 1", params=(),
+                 descending=True):
+        self.select = select
+        self.keys = [
+            key if isinstance(key, tuple) else (key, key) for key in keys
+        ]
+        self.where = where
+        self.params = list(params)
+        self.descending = descending
+
+    def sql(self, after=None, size=None):
+        """(query, params) for the page after key tuple `after`."""
+        where = self.where
+        params = list(self.params)
+        columns = ", ".join(column for column, _ in self.keys)
+        if after is not None:
+            op = "<" if self.descending else ">"
+            marks = ", ".join(["%s"] * len(self.keys))
+            where += f" AND ({columns}) {op} ({marks})"
+            params.extend(after)
+        direction = "DESC" if self.descending else "ASC"
+        order = ", ".join(f"{column} {direction}" for column, _ in self.keys)
+        query = f"{self.select} WHERE {where} ORDER BY {order}"
+        if size:
+            query += " LIMIT %s"
+            params.append(size)
+        return query, tuple(params)
+
+    def key_of(self, row):
+        return tuple(row[field] for _, field in self.keys)
+
+    def page(self, conn, after=None, size=PAGE_SIZE):
+        """Fetch one page. Returns: (rows, next_after); next_after is None
+        once the last page has been read."""
+        query, params = self.sql(after, size)
+        with conn.cursor(dictionary=True) as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        if len(rows) < size:
+            return rows, None
+        return rows, self.key_of(rows[-1])
+
+    def pages(self, conn, after=None, size=PAGE_SIZE):
+        """Yield (rows, next_after) page by page until exhausted."""
+        while True:
+            rows, after = self.page(conn, after, size)
+            if rows:
+                yield rows, after
+            if after is None:
+                return
+
+    def iter_rows(self, conn, size=PAGE_SIZE):
+        """Yield every row, reading size rows at a time."""
+        for rows, _ in self.pages(conn, size=size):
+            yield from rows
+
+    def all(self, conn):
+        """Every row in one query (small results)."""
+        query, params = self.sql()
+        with conn.cursor(dictionary=True) as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def estimate_count(self, conn):
+        """Row count estimated by the optimizer (EXPLAIN, no scan)."""
+        query, params = self.sql()
+        with conn.cursor(dictionary=True) as cursor:
+            cursor.execute(f"EXPLAIN {query}", params)
+            plan = cursor.fetchall()
+        if not plan:
+            return 0
+        rows = plan[0].get("rows") or 0
+        filtered = plan[0].get("filtered") or 100
+        return int(rows * float(filtered) / 100)
+
+    def count(self, conn):
+        """Exact row count of the filtered query."""
+        query, params = self.sql()
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM ({query}) AS counted", params
+            )
+            return cursor.fetchone()[0]
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+
+class SalesSeries:
+    """Columnar sales data for charts.
+    Query rows (dicts with a date, an amount and optionally a user) are
+    converted once into arrays sorted by date:
+    - dates: datetime64 array, amounts: float array,
+    - user_codes: int array indexing users (-1 when a row has no user).
+    Totals, cumulative sums, per-user splits, rolling averages and
+    day/week/month resampling are then vectorized operations.
+    Chart helpers return (dates, values) with dates as datetime objects,
+    ready for Axes.plot / Line2D.set_data."""
+    FREQUENCIES = {"day": "D", "week": "W", "month": "MS"}
+
+    def __init__(self, rows, date_field="sale_date",
+                 amount_field="total_amount", user_field="user"):
+        rows = list(rows)
+        dates = pd.to_datetime(
+            [row.get(date_field) for row in rows], errors="coerce"
+        ).values
+        amounts = np.fromiter(
+            (float(row.get(amount_field) or 0) for row in rows),
+            dtype=float, count=len(rows)
+        )
+        users = pd.Categorical([row.get(user_field) for row in rows])
+        # Drop unparseable dates, then order everything by date
+        valid = ~np.isnat(dates)
+        order = np.argsort(dates[valid], kind="stable")
+        self.dates = dates[valid][order]
+        self.amounts = amounts[valid][order]
+        self.user_codes = np.asarray(users.codes)[valid][order]
+        self.users = list(users.categories)
+
+    def __len__(self):
+        return len(self.dates)
+
+    @staticmethod
+    def to_datetimes(dates):
+        """datetime64 array -> array of datetime.datetime for plotting."""
+        return pd.DatetimeIndex(dates).to_pydatetime()
+
+    def _series(self, mask=None):
+        if mask is None:
+            return pd.Series(self.amounts, index=self.dates)
+        return pd.Series(self.amounts[mask], index=self.dates[mask])
+
+    def points(self):
+        """(dates, amounts) row by row."""
+        return self.to_datetimes(self.dates), self.amounts
+
+    def cumulative(self, mask=None):
+        """(dates, running total) row by row."""
+        dates = self.dates if mask is None else self.dates[mask]
+        amounts = self.amounts if mask is None else self.amounts[mask]
+        return self.to_datetimes(dates), np.cumsum(amounts)
+
+    def user_mask(self, user):
+        """Boolean mask of the rows belonging to user."""
+        if user not in self.users:
+            return np.zeros(len(self), dtype=bool)
+        return self.user_codes == self.users.index(user)
+
+    def by_user(self):
+        """{user: (dates, amounts, running total)} for every user."""
+        split = {}
+        for code, user in enumerate(self.users):
+            mask = self.user_codes == code
+            dates, totals = self.cumulative(mask)
+            split[user] = (dates, self.amounts[mask], totals)
+        return split
+
+    def totals(self, freq="day", mask=None, fill=False):
+        """(period starts, totals) per day, week or month. Periods with
+        no rows are dropped unless fill=True (then they are 0)."""
+        series = self._series(mask)
+        if series.empty:
+            return self.to_datetimes(self.dates[:0]), self.amounts[:0]
+        resampler = series.resample(self.FREQUENCIES[freq])
+        summed = resampler.sum()
+        if not fill:
+            summed = summed[resampler.count() > 0]
+        return self.to_datetimes(summed.index.values), summed.to_numpy()
+
+    def rolling_mean(self, window=7, freq="day", mask=None):
+        """(period starts, mean of the last `window` periods), counting
+        periods without sales as 0."""
+        series = self._series(mask)
+        if series.empty:
+            return self.to_datetimes(self.dates[:0]), self.amounts[:0]
+        summed = series.resample(self.FREQUENCIES[freq]).sum()
+        mean = summed.rolling(window, min_periods=1).mean()
+        return self.to_datetimes(mean.index.values), mean.to_numpy()
@@ -5,8 +5,9 @@ from window_functionality import to_uppercase
 from windows_utils import CurrencyFormatter
 from table_utils import TreeviewSorter
 from working_sales import (
-    fetch_sales_product, SalesManager, get_net_sales, CashierSessionService
+    SalesManager, get_net_sales, CashierSessionService
 )
+from product_catalog import catalog
 from receipt_gui_and_print import ReceiptPrinter
 from lookup_gui import ProductSearchWindow
 from sales_popup import Last24HoursSalesWindow
@@ -183,10 +184,13 @@ class MakeSaleWindow(BaseWindow):
                 "Error", "Please Enter Product Code.", parent=self.sale_win
             )
             return
-        result = fetch_sales_product(self.conn, code)
-        if isinstance(result, tuple):
-            (self.product_code, self.product_name, self.available_quantity,
-             self.wholesale_price, self.retail_price) = result
+        product = catalog.get(self.conn, code)
+        if product:
+            self.product_code = product["product_code"]
+            self.product_name = product["product_name"]
+            self.available_quantity = product["quantity"]
+            self.wholesale_price = product["wholesale_price"]
+            self.retail_price = product["retail_price"]
             answer = messagebox.askyesno(
                 "Confirm", f"Add '{self.product_name}' to Sale?",
                 parent=self.sale_win
@@ -197,7 +201,10 @@ class MakeSaleWindow(BaseWindow):
                 self.post_sale_button.configure(state="normal")
                 self.quantity_entry.focus_set()
         else:
-            messagebox.showerror("Not Found", result, parent=self.sale_win)
+            messagebox.showerror(
+                "Not Found", f"No Product found with code: {code}",
+                parent=self.sale_win
+            )
 
     def add_to_list(self):
         qty_str = self.quantity_entry.get().strip()
@@ -414,6 +421,8 @@ class MakeSaleWindow(BaseWindow):
                     self.user, item_list, payment_method, total_required
                 )
                 if success:
+                    # Stock levels changed; re-check the catalog next scan
+                    catalog.mark_stale()
                     self.refresh_label()
                     receipt_no = result
                     change = total_entered - total_required
@@ -6,6 +6,7 @@ from tkinter import ttk, messagebox, simpledialog
 from datetime import date
 from base_window import BaseWindow
 from analysis_gui_graph import LineAnalysisWindow, MonthLineAnalysis
+from sales_analytics import SalesSeries
 from analysis_gui_pie import AnalysisWindow
 from accounting_export import ReportExporter
 from receipt_gui_and_print import ReceiptViewer
@@ -13,13 +14,14 @@ from authentication import VerifyPrivilegePopup
 from log_popups_gui import MonthlyReversalLogs
 from windows_utils import CurrencyFormatter
 from window_functionality import FocusChain
-from table_utils import TreeviewSorter
+from table_utils import TreeviewSorter, VirtualTreeview
+from paged_loader import PagedLoader
 from working_sales import (
     fetch_sales_last_24_hours, fetch_sale_by_year,
-    fetch_sales_summary_by_year, tag_reversal,
+    fetch_daily_sales_by_user, fetch_sales_summary_by_year, tag_reversal,
     get_retail_price, fetch_pending_reversals,
     reject_tagged_reversal, delete_rejected_reversal, authorize_reversal,
-    fetch_filter_values, fetch_sales_by_month_and_user, fetch_sales_items,
+    fetch_filter_values, fetch_sales_by_month_and_user, sales_items_query,
     post_reversal, CashierControl, fetch_cashier_control_users, get_net_sales,
     # fetch_all_sales_users
 )
@@ -105,7 +107,13 @@ class Last24HoursSalesWindow(BaseWindow):
             )
 
     def load_data(self):
-        data, error = fetch_sales_last_24_hours(self.conn, self.user)
+        self.run_in_background(
+            self.window, fetch_sales_last_24_hours, self.user,
+            on_done=self.show_data
+        )
+
+    def show_data(self, result):
+        data, error = result
         if error:
             messagebox.showerror("Error", error, parent=self.window)
             return
@@ -277,9 +285,13 @@ class MonthlySalesSummary(BaseWindow):
                 txt += f" For {user.capitalize()}"
         txt += f" {year}."
         self.title_label.configure(text=txt)
-        data, error = fetch_sales_by_month_and_user(
-            self.conn, year, month, user
+        self.run_in_background(
+            self.window, fetch_sales_by_month_and_user, year, month, user,
+            on_done=self.show_data
         )
+
+    def show_data(self, result):
+        data, error = result
         # Clear tree
         if error:
             messagebox.showerror("Error", error, parent=self.window)
@@ -329,21 +341,18 @@ class MonthlySalesSummary(BaseWindow):
                 parent=self.window
             )
             return
-        rows.sort(key=lambda r: r["sale_date"])
-        cumulative_total = 0
-        for r in rows:
-            cumulative_total += r["daily_total"]
-            r["cumulative"] = cumulative_total
+        sales = SalesSeries(rows, amount_field="daily_total")
         metrics = {
-            "Daily Sales": lambda r: r["daily_total"],
-            "Cumulative Sales": lambda r: r["cumulative"],
+            "Daily Sales": sales.points(),
+            "Cumulative Sales": sales.cumulative(),
+            "7-Day Average": sales.rolling_mean(7),
         }
 
         title_text = f"Sales Summary In {self.month_cb.get()}"
         if user:
             title_text += f" For {user}"
         title_text += f" {sale_year}."
-        MonthLineAnalysis(title_text, rows, metrics, "sale_date")
+        MonthLineAnalysis(title_text, metrics)
 
 
 class YearlySalesWindow(BaseWindow):
@@ -532,7 +541,6 @@ class YearlySalesWindow(BaseWindow):
 
     def load_data(self):
         """Load sales data based on current year only (initial)."""
-        self.product_table.delete(*self.product_table.get_children())
         year = int(self.year_cb.get())
         # Filters
         month = None
@@ -547,7 +555,14 @@ class YearlySalesWindow(BaseWindow):
                 month = dict(self.months).get(self.month_cb.get())
                 title_text += f" In {self.month_cb.get()}"
         title_text += f" {year}."
-        rows, err = fetch_sale_by_year(self.conn, year, month, user)
+        self.run_in_background(
+            self.master, fetch_sale_by_year, year, month, user,
+            on_done=lambda result: self.show_data(result, title_text)
+        )
+
+    def show_data(self, result, title_text):
+        rows, err = result
+        self.product_table.delete(*self.product_table.get_children())
         if err:
             messagebox.showerror(
                 "Error", f"Failed to fetch sales:\n{err}.",
@@ -596,7 +611,9 @@ class YearlySalesWindow(BaseWindow):
             if self.user_var.get() and self.user_cb.get():
                 user = self.user_cb.get()
 
-        rows, err = fetch_sale_by_year(self.conn, year, month, user)
+        rows, err = fetch_daily_sales_by_user(
+            self.conn, year, month, user
+        )
         if err:
             messagebox.showerror(
                 "Error", f"Failed to Fetch Sales:\n{err}.",
@@ -609,41 +626,26 @@ class YearlySalesWindow(BaseWindow):
                 parent=self.master
             )
             return
-        cumulative_total = 0
-        for r in rows:
-            cumulative_total += r["total_amount"]
-            r["cumulative"] = cumulative_total
+        sales = SalesSeries(rows)
+        dates, daily = sales.totals("day")
         metrics = {
-            "Sale Amount": lambda r: r["total_amount"],
-            "Total Sales": lambda r: r["cumulative"],
+            "Sale Amount": (dates, daily),
+            "Total Sales": (dates, daily.cumsum()),
+            "7-Day Average": sales.rolling_mean(7),
         }
+        if not month:
+            metrics["Monthly Sales"] = sales.totals("month")
         if not user:
-
-            def make_metric_total(uname):
-                return lambda r: r["total_amount"] if r["user"] == uname else None
-
-            def make_metric_cumulative(uname):
-                return lambda r: r["cumulative"] if r["user"] == uname else None
-
-            users = {}
-            for r in rows:
-                u = r["user"]
-                users.setdefault(u, []).append(r)
-            # Compute cumulative per user
-            for u, ur in users.items():
-                cumu = 0
-                for r in ur:
-                    cumu += r["total_amount"]
-                    r["cumulative"] = cumu
-                metrics[f"{u} Total"] = make_metric_total(u)
-                metrics[f"{u} Cumulative"] = make_metric_cumulative(u)
+            for u, (dates, amounts, totals) in sales.by_user().items():
+                metrics[f"{u} Total"] = (dates, amounts)
+                metrics[f"{u} Cumulative"] = (dates, totals)
 
         title = f"Sales Analysis {year}"
         if user:
             title += f" For {user}"
         if month:
             title += f" In {self.month_cb.get()}"
-        LineAnalysisWindow(title, rows, metrics, "sale_date")
+        LineAnalysisWindow(title, metrics)
 
     def _collect_rows(self):
         rows = []
@@ -757,7 +759,7 @@ class YearlyProductSales(BaseWindow):
         self.tree = ttk.Treeview(
             self.table_frame, columns=self.columns, show="headings"
         )
-        self.sorter = TreeviewSorter(self.tree, self.columns, "No")
+        self.sorter = VirtualTreeview(self.tree, self.columns, "No")
         self.sorter.apply_style(style)
         self.sorter.attach_sorting()
         self.sorter.bind_mousewheel()
@@ -829,10 +831,8 @@ class YearlyProductSales(BaseWindow):
             ).pack(side="left", anchor="s")
         self.user_cb.bind("<<ComboboxSelected>>", lambda e: self.load_data())
         # Table + Scrollbars
-        vsb = ttk.Scrollbar(
-            self.table_frame, orient="vertical", command=self.tree.yview
-        )
-        self.tree.configure(yscrollcommand=vsb.set)
+        vsb = ttk.Scrollbar(self.table_frame, orient="vertical")
+        self.sorter.attach_scrollbar(vsb)
         vsb.pack(side="right", fill="y")
         # Configure headings
         for col in self.columns:
@@ -872,7 +872,6 @@ class YearlyProductSales(BaseWindow):
 
     def load_data(self):
         """Load sales data based on current year only (initial)."""
-        self.tree.delete(*self.tree.get_children())
         year = int(self.year_cb.get())
         # Filters
         month = None
@@ -887,7 +886,14 @@ class YearlyProductSales(BaseWindow):
                 month = dict(self.months).get(self.month_cb.get())
                 title += f" in {self.month_cb.get()}"
         title += f" {year}."
-        rows, err = fetch_sales_summary_by_year(self.conn, year, month, user)
+        self.run_in_background(
+            self.master, fetch_sales_summary_by_year, year, month, user,
+            on_done=lambda result: self.show_data(result, title)
+        )
+
+    def show_data(self, result, title):
+        rows, err = result
+        self.sorter.clear()
         if err:
             messagebox.showerror(
                 "Error", f"Failed to fetch sales:\n{err}.",
@@ -922,9 +928,7 @@ class YearlyProductSales(BaseWindow):
                 "Profit": f"{total_profit:,.2f}",
             }
             self.rows.append(precessed_row)
-            self.tree.insert(
-                "", "end", values=list(precessed_row.values()), tags=(tag,)
-            )
+            self.sorter.insert(list(precessed_row.values()), (tag,))
             # Update totals
             total_qty += int(row["total_quantity"])
             total_cost_sum += total_cost
@@ -934,7 +938,7 @@ class YearlyProductSales(BaseWindow):
             # Compute weighted averages for costs and prices
             avg_unit_cost = total_cost_sum / total_qty if total_qty else 0
             avg_unit_price = total_amount_sum / total_qty if total_qty else 0
-            self.tree.insert("", "end", values=(
+            self.sorter.insert((
                 "",
                 "",
                 "TOTALS",
@@ -944,7 +948,8 @@ class YearlyProductSales(BaseWindow):
                 f"{avg_unit_price:,.2f}",
                 f"{total_amount_sum:,.2f}",
                 f"{total_cost_sum:,.2f}",
-            ), tags=("total",))
+            ), ("total",))
+        self.sorter.render()
         self.title = title
         self.title_label.configure(text=self.title)
         self.sorter.autosize_columns(10)
@@ -972,8 +977,7 @@ class YearlyProductSales(BaseWindow):
 
     def _collect_rows(self):
         rows = []
-        for item in self.tree.get_children():
-            vals = self.tree.item(item, "values")
+        for vals in self.sorter.values():
             rows.append(
                 {
                     "No": vals[0],
@@ -1109,11 +1113,12 @@ class SalesControlReportWindow(BaseWindow):
         self.tree = ttk.Treeview(
             self.tree_frame, columns=self.columns, show="headings"
         )
-        self.sorter = TreeviewSorter(
-            self.tree, self.columns, "No"
-        )
+        self.sorter = VirtualTreeview(self.tree, self.columns, "No")
         self.sorter.apply_style(style)
         self.sorter.attach_sorting()
+        self.loader = PagedLoader(
+            self.report_win, self.show_data, on_error=self.show_error
+        )
 
         self.setup_widgets()
         self.load_data()
@@ -1198,10 +1203,9 @@ class SalesControlReportWindow(BaseWindow):
             command=self.tag_reversal,
         ).pack(side="right", padx=3, anchor="s")
         self.tree_frame.pack(fill="both", expand=True)
-        vsb = ttk.Scrollbar(
-            self.tree_frame, orient="vertical", command=self.tree.yview
-        )
-        self.tree.configure(yscrollcommand=vsb.set)
+        vsb = ttk.Scrollbar(self.tree_frame, orient="vertical")
+        self.sorter.attach_scrollbar(vsb)
+        self.loader.watch(self.sorter)
         self.tree.pack(side="left", fill="both", expand=True)
         vsb.pack(side="right", fill="y")
         for col in self.columns:
@@ -1271,30 +1275,38 @@ class SalesControlReportWindow(BaseWindow):
                     day = int(self.day_cb.get())
                 if self.user_var.get() and self.user_cb.get():
                     user = self.user_cb.get()
-            rows, err = fetch_sales_items(self.conn, year, month, day, user)
-            if err:
-                messagebox.showerror(
-                    "Error", f"Failed to fetch data:\n{err}.",
-                    parent=self.report_win
-                )
-                return
-            # Save rows for searching
-            self.all_rows = rows
-            self.update_tree(rows)
+            self.loader.start(sales_items_query(year, month, day, user))
         except Exception as e:
             messagebox.showerror(
                 "Error",
                 f"Failed to Load data:\n{str(e)}.", parent=self.report_win
             )
 
-    def update_tree(self, rows):
-        # Clear previous rows
-        self.tree.delete(*self.tree.get_children())
+    def show_data(self, rows, start, first):
+        """Append a page of sale items; the first page replaces them."""
+        if first:
+            self.all_rows = []
+        # Save rows for searching
+        self.all_rows.extend(rows)
+        if self.search_entry.get().strip():
+            self.apply_receipt_filter()
+        else:
+            self.update_tree(rows, start, first)
+
+    def show_error(self, err):
+        messagebox.showerror(
+            "Error", f"Failed to fetch data:\n{err}.", parent=self.report_win
+        )
+
+    def update_tree(self, rows, start=0, clear=True):
+        if clear:
+            # Clear previous rows
+            self.sorter.clear()
         # Insert new data
-        for i, row in enumerate(rows, start=1):
+        for i, row in enumerate(rows, start=start + 1):
             name = re.sub(r"\s+", " ", str(row["product_name"])).strip()
             tag = "evenrow" if i % 2 == 0 else "oddrow"
-            self.tree.insert("", "end", values=(
+            self.sorter.insert((
                 i,
                 row["date"].strftime("%d/%m/%Y"),
                 row["user"],
@@ -1304,11 +1316,15 @@ class SalesControlReportWindow(BaseWindow):
                 row["quantity"],
                 f"{row['unit_price']:,.2f}",
                 f"{row['total_amount']:,.2f}",
-            ), tags=(tag,))
+            ), (tag,))
+        self.sorter.render()
         self.sorter.autosize_columns(5)
 
     def filter_by_receipt(self, event):
-        """Filter current table by receipt number as user types."""
+        """Filter by receipt number as user types, over every page."""
+        self.loader.when_loaded(self.apply_receipt_filter)
+
+    def apply_receipt_filter(self):
         query = self.search_entry.get().strip().lower()
         if not query:
             self.update_tree(self.all_rows)
@@ -1509,17 +1525,22 @@ class SalesReversalWindow(BaseWindow):
 
     def load_data(self):
         """Fetch and display reversals."""
-        # Clear table
         selected = self.filter_cb.get()
-        for row in self.tree.get_children():
-            self.tree.delete(row)
         # Map filter text to function parameter
         if selected == "Rejected":
             self.del_frame.pack(side="right", padx=10)
         else:
             self.del_frame.pack_forget()
+        self.run_in_background(
+            self.window, fetch_pending_reversals, selected,
+            on_done=self.show_data
+        )
 
-        rows, error = fetch_pending_reversals(self.conn, selected)
+    def show_data(self, result):
+        rows, error = result
+        # Clear table
+        for row in self.tree.get_children():
+            self.tree.delete(row)
         if error:
             messagebox.showerror("Error", error, parent=self.window)
             return
@@ -0,0 +1,294 @@
+import sys
+from connect_to_db import commit, rollback, transactional
+from query_utils import period_filter
+
+# Pre-aggregated sales tables, kept current at posting time so reports
+# read one row per day instead of scanning every receipt.
+# sales_daily_rollup: one row per (sale_date, user).
+# - receipts/gross/items/cost are added by record_sale;
+# - refunds/items/cost are adjusted when a reversal is posted;
+# - net sales for a day are gross - refunds (= SUM(sales.total_amount)).
+# product_sales_monthly: one row per (year, month, product_code, user)
+# with qty, revenue and cogs valued at the cost when the sale was made.
+
+
+def record_daily_sale(cursor, sale_date, user, amount, items, cost):
+    """Add one receipt to the cashier's day in sales_daily_rollup."""
+    cursor.execute("""
+    INSERT INTO sales_daily_rollup (sale_date, user, receipts, gross,
+        refunds, items, cost)
+    VALUES (%s, %s, 1, %s, 0, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        receipts = receipts + 1,
+        gross = gross + VALUES(gross),
+        items = items + VALUES(items),
+        cost = cost + VALUES(cost)
+    """, (sale_date, user, amount, items, cost))
+
+
+def record_daily_refund(cursor, receipt_no, code, quantity, amount):
+    """Book a posted reversal against the day and cashier of the sale."""
+    cursor.execute("""
+    UPDATE sales_daily_rollup r
+    JOIN sales s ON s.sale_date = r.sale_date AND s.user = r.user
+    LEFT JOIN products p ON p.product_code = %s
+    SET r.refunds = r.refunds + %s,
+        r.items = GREATEST(r.items - %s, 0),
+        r.cost = GREATEST(r.cost - COALESCE(p.cost, 0) * %s, 0)
+    WHERE s.receipt_no = %s
+    """, (code, amount, quantity, quantity, receipt_no))
+
+
+def record_monthly_product_sales(cursor, sale_date, user, lines):
+    """Add sold lines [(product_code, qty, revenue, cogs)] to the month."""
+    cursor.executemany("""
+    INSERT INTO product_sales_monthly (year, month, product_code, user,
+        qty, revenue, cogs)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        qty = qty + VALUES(qty),
+        revenue = revenue + VALUES(revenue),
+        cogs = cogs + VALUES(cogs)
+    """, [
+        (sale_date.year, sale_date.month, code, user, qty, revenue, cogs)
+        for code, qty, revenue, cogs in lines
+    ])
+
+
+def record_monthly_product_refund(cursor, receipt_no, code, quantity,
+                                  amount):
+    """Take a posted reversal off the month and cashier of the sale.
+    amount is what the reversal took off the product's sale_items value.
+    COGS drops by the row's average unit cost, keeping historical
+    margins."""
+    cursor.execute("""
+    SELECT sale_date, user FROM sales WHERE receipt_no = %s
+    """, (receipt_no,))
+    sale = cursor.fetchone()
+    if not sale:
+        return
+    sale_date, user = sale[0], sale[1]
+    # Single-table UPDATE: assignments run left to right, so cogs is
+    # reduced using qty before qty itself changes
+    cursor.execute("""
+    UPDATE product_sales_monthly
+    SET cogs = GREATEST(cogs - IF(qty > 0,
+            cogs * LEAST(%s / qty, 1), 0), 0),
+        revenue = GREATEST(revenue - %s, 0),
+        qty = GREATEST(qty - %s, 0)
+    WHERE year = %s AND month = %s AND product_code = %s AND user = %s
+    """, (
+        quantity, amount, quantity, sale_date.year, sale_date.month, code,
+        user
+    ))
+
+
+def _rollup_where(year, column):
+    if not year:
+        return "", []
+    period, params = period_filter(column, year)
+    return f"WHERE {period}", params
+
+
+def _daily_totals_query(year=None):
+    """SELECT computing the rollup columns from sales, sale_items and
+    posted reversals. History has no cost snapshot, so cost uses the
+    current products.cost."""
+    where, params = _rollup_where(year, "s.sale_date")
+    query = f"""
+    SELECT s.sale_date, s.user, COUNT(*) AS receipts,
+        SUM(s.total_amount) + COALESCE(SUM(rf.refunds), 0) AS gross,
+        COALESCE(SUM(rf.refunds), 0) AS refunds,
+        COALESCE(SUM(it.items), 0) AS items,
+        COALESCE(SUM(it.cost), 0) AS cost
+    FROM sales s
+    LEFT JOIN (
+        SELECT si.receipt_no, SUM(si.quantity) AS items,
+            SUM(si.quantity * COALESCE(p.cost, 0)) AS cost
+        FROM sale_items si
+        LEFT JOIN products p ON p.product_code = si.product_code
+        GROUP BY si.receipt_no
+    ) it ON it.receipt_no = s.receipt_no
+    LEFT JOIN (
+        SELECT receipt_no, SUM(quantity * unit_price) AS refunds
+        FROM sales_reversal
+        WHERE posted IS NOT NULL
+        GROUP BY receipt_no
+    ) rf ON rf.receipt_no = s.receipt_no
+    {where}
+    GROUP BY s.sale_date, s.user
+    """
+    return query, params
+
+
+def fill_sales_daily_rollup(cursor, year=None):
+    """Recompute sales_daily_rollup (one year, or all of it) from sales.
+    Returns the number of (day, user) rows written."""
+    where, params = _rollup_where(year, "sale_date")
+    cursor.execute(f"DELETE FROM sales_daily_rollup {where};", tuple(params))
+    query, params = _daily_totals_query(year)
+    cursor.execute(f"""
+    INSERT INTO sales_daily_rollup (sale_date, user, receipts, gross,
+        refunds, items, cost)
+    {query}
+    """, tuple(params))
+    return cursor.rowcount
+
+
+@transactional
+def rebuild_sales_daily_rollup(conn, year=None):
+    """Backfill sales_daily_rollup from the raw sales tables."""
+    try:
+        with conn.cursor() as cursor:
+            count = fill_sales_daily_rollup(cursor, year)
+        commit(conn)
+        return True, f"Daily Sales Rollup Rebuilt For {count} Day(s)."
+    except Exception as e:
+        rollback(conn)
+        return False, f"Error Rebuilding Daily Sales Rollup: {str(e)}."
+
+
+def compare_rows(expected, actual, checks, label):
+    """(ok, message) comparing two {key: row} dicts with checks(want,
+    have) -> True when the rows agree."""
+    differing = []
+    for key in sorted(set(expected) | set(actual)):
+        want, have = expected.get(key), actual.get(key)
+        if want is None or have is None or not checks(want, have):
+            differing.append(" ".join(
+                f"{part:%d/%m/%Y}" if hasattr(part, "strftime")
+                else str(part) for part in key
+            ))
+    if differing:
+        shown = ", ".join(differing[:10])
+        more = ""
+        if len(differing) > 10:
+            more = f" and {len(differing) - 10} more"
+        return False, f"{label} Differs On: {shown}{more}."
+    return True, f"{label} Matches For {len(expected)} Row(s)."
+
+
+def verify_sales_daily_rollup(conn, year=None):
+    """Compare the rollup with totals recomputed from sales.
+    Receipts, net sales and items are checked; cost is not, since the
+    recomputed figure uses today's product costs.
+    Returns: (True, message) or (False, message listing differing days)."""
+    try:
+        query, params = _daily_totals_query(year)
+        with conn.cursor(dictionary=True) as cursor:
+            cursor.execute(query, tuple(params))
+            expected = {
+                (row["sale_date"], row["user"]): row
+                for row in cursor.fetchall()
+            }
+            where, params = _rollup_where(year, "sale_date")
+            cursor.execute(f"""
+            SELECT sale_date, user, receipts, gross, refunds, items
+            FROM sales_daily_rollup {where}
+            """, tuple(params))
+            actual = {
+                (row["sale_date"], row["user"]): row
+                for row in cursor.fetchall()
+            }
+        return compare_rows(expected, actual, lambda want, have: (
+            want["receipts"] == have["receipts"]
+            and want["items"] == have["items"]
+            and round(want["gross"] - want["refunds"], 2)
+            == round(have["gross"] - have["refunds"], 2)
+        ), "Daily Sales Rollup")
+    except Exception as e:
+        return False, f"Error Verifying Daily Sales Rollup: {str(e)}."
+
+
+def _monthly_totals_query(year=None):
+    """SELECT computing product_sales_monthly from sale_items. Revenue is
+    quantity * unit_price, the same figure a posted reversal takes off
+    the month. Backfilled cogs uses the current products.cost."""
+    where, params = _rollup_where(year, "s.sale_date")
+    query = f"""
+    SELECT YEAR(s.sale_date) AS year, MONTH(s.sale_date) AS month,
+        si.product_code, s.user, SUM(si.quantity) AS qty,
+        SUM(si.quantity * si.unit_price) AS revenue,
+        SUM(si.quantity * COALESCE(p.cost, 0)) AS cogs
+    FROM sale_items si
+    JOIN sales s ON s.receipt_no = si.receipt_no
+    LEFT JOIN products p ON p.product_code = si.product_code
+    {where}
+    GROUP BY YEAR(s.sale_date), MONTH(s.sale_date), si.product_code, s.user
+    """
+    return query, params
+
+
+def fill_product_sales_monthly(cursor, year=None):
+    """Recompute product_sales_monthly (one year, or all of it).
+    Returns the number of rows written."""
+    if year:
+        cursor.execute(
+            "DELETE FROM product_sales_monthly WHERE year = %s;", (year,)
+        )
+    else:
+        cursor.execute("DELETE FROM product_sales_monthly;")
+    query, params = _monthly_totals_query(year)
+    cursor.execute(f"""
+    INSERT INTO product_sales_monthly (year, month, product_code, user,
+        qty, revenue, cogs)
+    {query}
+    """, tuple(params))
+    return cursor.rowcount
+
+
+@transactional
+def rebuild_product_sales_monthly(conn, year=None):
+    """Backfill product_sales_monthly from sale_items."""
+    try:
+        with conn.cursor() as cursor:
+            count = fill_product_sales_monthly(cursor, year)
+        commit(conn)
+        return True, f"Product Sales Rollup Rebuilt With {count} Row(s)."
+    except Exception as e:
+        rollback(conn)
+        return False, f"Error Rebuilding Product Sales Rollup: {str(e)}."
+
+
+def verify_product_sales_monthly(conn, year=None):
+    """Compare qty and revenue of the rollup with sale_items (cogs is
+    historical, so it is not checked)."""
+    try:
+        query, params = _monthly_totals_query(year)
+        with conn.cursor(dictionary=True) as cursor:
+            cursor.execute(query, tuple(params))
+            key = ("year", "month", "product_code", "user")
+            expected = {
+                tuple(row[k] for k in key): row for row in cursor.fetchall()
+            }
+            where, params = "", ()
+            if year:
+                where, params = "WHERE year = %s", (year,)
+            cursor.execute(f"""
+            SELECT year, month, product_code, user, qty, revenue
+            FROM product_sales_monthly {where}
+            """, params)
+            actual = {
+                tuple(row[k] for k in key): row for row in cursor.fetchall()
+            }
+        return compare_rows(expected, actual, lambda want, have: (
+            want["qty"] == have["qty"]
+            and round(want["revenue"], 2) == round(have["revenue"], 2)
+        ), "Product Sales Rollup")
+    except Exception as e:
+        return False, f"Error Verifying Product Sales Rollup: {str(e)}."
+
+
+if __name__ == "__main__":
+    # python sales_rollups.py rebuild|verify [year]
+    from connect_to_db import connect_db
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    year = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    conn = connect_db()
+    if command == "rebuild":
+        steps = (rebuild_sales_daily_rollup, rebuild_product_sales_monthly)
+    else:
+        steps = (verify_sales_daily_rollup, verify_product_sales_monthly)
+    for step in steps:
+        success, msg = step(conn, year)
+        print(success, msg)
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
 from base_window import BaseWindow
+from suggestion_engine import SuggestionEngine
 from working_on_orders import search_product_codes
 from working_sales import search_product
 from authentication import VerifyPrivilegePopup
@@ -257,6 +258,10 @@ class ProductUpdateWindow(BaseWindow):
             self.top_frame, bg="light grey", width=20, bd=4, relief="ridge",
             font=("Arial", 11)
         )
+        self.engine = SuggestionEngine(
+            self.window, search_product_codes, self.show_suggestions,
+            self.show_error
+        )
         self.search_btn = tk.Button(
             self.top_frame, text="Search", command=self.search, bg="blue",
             fg="white", bd=4, relief="groove", font=("Arial", 10, "bold")
@@ -389,16 +394,17 @@ class ProductUpdateWindow(BaseWindow):
         """Show suggestion box under entry."""
         to_uppercase(self.entry)
         keyword = self.search_var.get().strip()
-        self.suggestion_box.delete(0, tk.END)
-        self.search_btn.pack_forget()
         if not keyword:
+            self.engine.cancel()
+            self.suggestion_box.delete(0, tk.END)
             self.suggestion_box.pack_forget()
             self.search_btn.pack(pady=(5, 0))
             return
-        results = search_product_codes(self.conn, keyword)
-        if isinstance(results, str):
-            messagebox.showerror("Error", results, parent=self.window)
-            return
+        self.engine.request(keyword)
+
+    def show_suggestions(self, keyword, results):
+        self.suggestion_box.delete(0, tk.END)
+        self.search_btn.pack_forget()
         if results:
             # Adjust height dynamically (max 8)
             height = min(len(results), 4)
@@ -414,6 +420,9 @@ class ProductUpdateWindow(BaseWindow):
             self.suggestion_box.pack_forget()
             self.search_btn.pack(pady=(5, 0))
 
+    def show_error(self, msg):
+        messagebox.showerror("Error", msg, parent=self.window)
+
     def on_select(self, event):
         """Fill entry with selected value when chosen."""
         if not self.suggestion_box.curselection():
@@ -764,6 +773,10 @@ class UpdateStockLevelPopup(BaseWindow):
             self.entry_frame, bg="light grey", width=20, font=("Arial", 10),
             bd=4, relief="ridge"
         )
+        self.engine = SuggestionEngine(
+            self.window, search_product_codes, self.show_suggestions,
+            self.show_error
+        )
         self.search_btn = tk.Button(
             self.entry_frame, text="Search", command=self.search, bg="blue",
             fg="white", bd=4, relief="groove", font=("Arial", 10, "bold")
@@ -826,16 +839,17 @@ class UpdateStockLevelPopup(BaseWindow):
         """Show suggestion box under entry."""
         to_uppercase(self.entry)
         keyword = self.search_var.get().strip()
-        self.suggestion_box.delete(0, tk.END)
-        self.search_btn.pack_forget()
         if not keyword:
+            self.engine.cancel()
+            self.suggestion_box.delete(0, tk.END)
             self.suggestion_box.pack_forget()
             self.search_btn.pack(pady=(5, 0))
             return
-        results = search_product_codes(self.conn, keyword)
-        if isinstance(results, str):
-            messagebox.showerror("Error", results, parent=self.window)
-            return
+        self.engine.request(keyword)
+
+    def show_suggestions(self, keyword, results):
+        self.suggestion_box.delete(0, tk.END)
+        self.search_btn.pack_forget()
         if results:
             # Adjust height dynamically (max 8)
             height = min(len(results), 4)
@@ -851,6 +865,9 @@ class UpdateStockLevelPopup(BaseWindow):
             self.suggestion_box.pack_forget()
             self.search_btn.pack(pady=(5, 0))
 
+    def show_error(self, msg):
+        messagebox.showerror("Error", msg, parent=self.window)
+
     def on_select(self, event):
         """Fill entry with selected value when chosen."""
         if not self.suggestion_box.curselection():
@@ -958,6 +975,13 @@ class DeleteProductPopup(BaseWindow):
             self.entry_frame, bg="lightgray", width=20, bd=2, relief="ridge",
             font=("Arial", 11)
         )
+        self.engine = SuggestionEngine(
+            self.window,
+            lambda conn, code: search_product(
+                conn, "product_code", code
+            ),
+            self.show_matches, self.show_error
+        )
         # Delete button (initially hidden)
         self.delete_btn = tk.Button(
             self.entry_frame, text="Delete Product", bd=4, relief="groove",
@@ -1000,28 +1024,29 @@ class DeleteProductPopup(BaseWindow):
         self.search_product()
 
     def search_product(self):
-        self.listbox.delete(0, tk.END)
         product_code = self.product_code_var.get().strip()
         if not product_code:
+            self.engine.cancel()
             self.listbox.pack_forget()
             return
-        try:
-            results = search_product(self.conn, "product_code", product_code)
-            if results:
-                for product in results:
-                    code = product['product_code']
-                    name = product['product_name']
-                    display = f"{code} - {name}"
-                    self.products = results
-                    self.listbox.insert(tk.END, display)
-                self.listbox.config(height=min(len(results), 4))
-                self.listbox.pack(padx=5, pady=(0, 5))
-            else:
-                self.listbox.pack_forget()
-        except Exception as err:
-            messagebox.showerror(
-                "Database Error", str(err), parent=self.window
-            )
+        self.engine.request(product_code)
+
+    def show_matches(self, product_code, results):
+        self.listbox.delete(0, tk.END)
+        if results:
+            for product in results:
+                code = product['product_code']
+                name = product['product_name']
+                display = f"{code} - {name}"
+                self.products = results
+                self.listbox.insert(tk.END, display)
+            self.listbox.config(height=min(len(results), 4))
+            self.listbox.pack(padx=5, pady=(0, 5))
+        else:
+            self.listbox.pack_forget()
+
+    def show_error(self, msg):
+        messagebox.showerror("Database Error", msg, parent=self.window)
 
     def on_select(self, event):
         if self.listbox.curselection():
@@ -1101,6 +1126,10 @@ class RestoreProductPopup(BaseWindow):
             self.entry_frame, bg="lightgray", width=20, bd=2, relief="raised",
             font=("Arial", 11)
         )
+        self.engine = SuggestionEngine(
+            self.window, search_deleted_product_codes,
+            self.show_matches, self.show_error
+        )
         # Delete button (initially hidden)
         self.delete_btn = tk.Button(
             self.entry_frame, text="Restore Product", bd=4, relief="raised",
@@ -1144,28 +1173,29 @@ class RestoreProductPopup(BaseWindow):
         self.search_product()
 
     def search_product(self):
-        self.listbox.delete(0, tk.END)
         product_code = self.product_code_var.get().strip()
         if not product_code:
+            self.engine.cancel()
             self.listbox.pack_forget()
             return
-        try:
-            results = search_deleted_product_codes(self.conn, product_code)
-            if results:
-                for product in results:
-                    code = product['product_code']
-                    name = product['product_name']
-                    display = f"{code} - {name}"
-                    self.products = results
-                    self.listbox.insert(tk.END, display)
-                self.listbox.config(height=min(len(results), 4))
-                self.listbox.pack(padx=5, pady=(0, 5))
-            else:
-                self.listbox.pack_forget()
-        except Exception as err:
-            messagebox.showerror(
-                "Database Error", str(err), parent=self.window
-            )
+        self.engine.request(product_code)
+
+    def show_matches(self, product_code, results):
+        self.listbox.delete(0, tk.END)
+        if results:
+            for product in results:
+                code = product['product_code']
+                name = product['product_name']
+                display = f"{code} - {name}"
+                self.products = results
+                self.listbox.insert(tk.END, display)
+            self.listbox.config(height=min(len(results), 4))
+            self.listbox.pack(padx=5, pady=(0, 5))
+        else:
+            self.listbox.pack_forget()
+
+    def show_error(self, msg):
+        messagebox.showerror("Database Error", msg, parent=self.window)
 
     def on_select(self, event):
         if self.listbox.curselection():
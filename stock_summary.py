@@ -1,3 +1,7 @@
+import threading
+import time
+from datetime import date
+from query_utils import period_bounds, period_filter
 
 
 PRODUCT_COLUMNS = """
@@ -12,9 +16,93 @@ PRODUCT_COLUMNS = """
         """
 
 class FetchSummary:
+    # Dashboard counters are cached for SNAPSHOT_TTL seconds per process
+    SNAPSHOT_TTL = 60
+    _snapshot_lock = threading.Lock()
+    _snapshot = None # (taken_at, day, counters)
+
     def __init__(self, conn):
         self.conn = conn
 
+    @classmethod
+    def cached_snapshot(cls):
+        """Return the last snapshot taken today (may be stale), or None."""
+        cached = cls._snapshot
+        if cached and cached[1] == date.today():
+            return dict(cached[2])
+        return None
+
+    @classmethod
+    def invalidate_snapshot(cls):
+        cls._snapshot = None
+
+    def snapshot(self, max_age=None):
+        """All dashboard counters from two aggregate queries:
+        out_of_stock, low_stock, stock_warning, inactive, total_products,
+        inventory_value, unsold, unsold_month, unsold_year,
+        pending_orders, disabled_users, active_users.
+        Served from cache when younger than max_age (default
+        SNAPSHOT_TTL) seconds. Returns: (dict, None) or (None, error)."""
+        max_age = self.SNAPSHOT_TTL if max_age is None else max_age
+        today = date.today()
+        cached = self._snapshot
+        if (cached and cached[1] == today
+                and time.monotonic() - cached[0] < max_age):
+            return dict(cached[2]), None
+        with self._snapshot_lock:
+            try:
+                counters = self._fetch_snapshot(today)
+            except Exception as e:
+                return None, f"Error Fetching Summary: {str(e)}."
+            FetchSummary._snapshot = (time.monotonic(), today, counters)
+            return dict(counters), None
+
+    def _fetch_snapshot(self, today):
+        year_start = period_bounds(today.year)[0]
+        month_start = period_bounds(today.year, today.month)[0]
+        with self.conn.cursor(dictionary=True) as cursor:
+            # One pass over products joined to the maintained last-sold
+            # stats, instead of an anti-join over sale_items per counter
+            cursor.execute("""
+                SELECT
+                    COALESCE(SUM(p.is_active = 1 AND p.quantity = 0), 0)
+                        AS out_of_stock,
+                    COALESCE(SUM(p.is_active = 1
+                        AND p.quantity <= p.min_stock_level), 0) AS low_stock,
+                    COALESCE(SUM(p.is_active = 1
+                        AND p.quantity > p.min_stock_level
+                        AND p.quantity <= p.min_stock_level * 1.5), 0)
+                        AS stock_warning,
+                    COALESCE(SUM(p.is_active = 0), 0) AS inactive,
+                    COALESCE(SUM(p.quantity > 0), 0) AS total_products,
+                    COALESCE(SUM(CASE WHEN p.is_active = 1
+                        THEN p.quantity * p.cost END), 0) AS inventory_value,
+                    COALESCE(SUM(p.is_active = 1 AND s.product_code IS NULL),
+                        0) AS unsold,
+                    COALESCE(SUM(p.is_active = 1 AND (s.last_sold IS NULL
+                        OR s.last_sold < %s)), 0) AS unsold_year,
+                    COALESCE(SUM(p.is_active = 1 AND (s.last_sold IS NULL
+                        OR s.last_sold < %s)), 0) AS unsold_month
+                FROM products p
+                LEFT JOIN product_sales_stats s
+                    ON s.product_code = p.product_code;
+            """, (year_start, month_start))
+            counters = cursor.fetchone()
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM orders WHERE status = 'Pending')
+                        AS pending_orders,
+                    (SELECT COUNT(*) FROM logins WHERE status = 'disabled')
+                        AS disabled_users,
+                    (SELECT COUNT(*) FROM logins WHERE status = 'Active')
+                        AS active_users;
+            """)
+            counters.update(cursor.fetchone())
+        return {
+            key: (int(value) if key != "inventory_value" else value)
+            for key, value in counters.items()
+        }
+
     def fetch_low_stock_count(self):
         """Returns the number of products where quantity is less
         or equal to min stock level."""
@@ -155,30 +243,40 @@ class FetchSummary:
         except Exception as e:
             return None, f"Error Fetching All Stock Products: {str(e)}."
 
+    @staticmethod
+    def unsold_filter(year=None, month=None):
+        """WHERE fragment for active products p not sold in the period.
+        Never sold and periods running up to today are answered from
+        product_sales_stats (ps); older periods still need sale_items.
+        Returns: (sql_fragment, params)."""
+        if year is None and month is None:
+            return "ps.product_code IS NULL", []
+        if year is not None:
+            start, end = period_bounds(year, month)
+            if start <= date.today() < end:
+                return "(ps.last_sold IS NULL OR ps.last_sold < %s)", [start]
+            period, params = period_filter("s.date", year, month)
+        else:
+            period, params = "MONTH(s.date) = %s", [month]
+        return f"""NOT EXISTS (
+                    SELECT 1
+                    FROM sale_items s
+                    WHERE s.product_code = p.product_code AND {period}
+                )""", params
+
     def fetch_unsold_product_count(self, year=None, month=None):
         """Counts product that have Not Been sold.
         Year & month Optional filters."""
         try:
-            query = """
-                SELECT COUNT(*) AS count
-                FROM products p
-                WHERE is_active = 1 AND NOT EXISTS (
-                    SELECT 1
-                    FROM sale_items s
-                    WHERE s.product_code = p.product_code
-            """
-            params = []
-            # Optional filters inside sale_items
-            if year is not None:
-                query += " AND YEAR(s.date) = %s"
-                params.append(year)
-            if month is not None:
-                query += " AND MONTH(s.date) = %s"
-                params.append(month)
-            query += ")"
-
+            unsold, params = self.unsold_filter(year, month)
             with self.conn.cursor(dictionary=True) as cursor:
-                cursor.execute(query, params)
+                cursor.execute(f"""
+                    SELECT COUNT(*) AS count
+                    FROM products p
+                    LEFT JOIN product_sales_stats ps
+                        ON ps.product_code = p.product_code
+                    WHERE p.is_active = 1 AND {unsold}
+                """, params)
                 result = cursor.fetchone()
                 return result["count"], None
         except Exception as e:
@@ -188,27 +286,20 @@ class FetchSummary:
         """
         Products that have Not Been sold. Year & month Optional filters.
         """
+        columns = ", ".join(
+            f"p.{col.strip()}" for col in PRODUCT_COLUMNS.split(",")
+        )
         try:
-            query = f"""
-                SELECT {PRODUCT_COLUMNS}
-                FROM products p
-                WHERE is_active = 1 AND NOT EXISTS (
-                    SELECT 1
-                    FROM sale_items s
-                    WHERE s.product_code = p.product_code
-            """
-            params = []
-            # Optional filters inside sale_items
-            if year is not None:
-                query += " AND YEAR(s.date) = %s"
-                params.append(year)
-            if month is not None:
-                query += " AND MONTH(s.date) = %s"
-                params.append(month)
-            query += ") ORDER BY p.product_name"
-
+            unsold, params = self.unsold_filter(year, month)
             with self.conn.cursor(dictionary=True) as cursor:
-                cursor.execute(query, params)
+                cursor.execute(f"""
+                    SELECT {columns}
+                    FROM products p
+                    LEFT JOIN product_sales_stats ps
+                        ON ps.product_code = p.product_code
+                    WHERE p.is_active = 1 AND {unsold}
+                    ORDER BY p.product_name
+                """, params)
                 result = cursor.fetchall()
                 return result, None
         except Exception as e:
@@ -89,7 +89,12 @@ class ProductsDetailsWindow(BaseWindow):
         )
 
     def populate_table(self):
-        products = view_all_products(self.conn)
+        self.run_in_background(
+            self.window, view_all_products, on_done=self.show_products
+        )
+
+    def show_products(self, products):
+        self.tree.delete(*self.tree.get_children())
         total_qty = 0
         total_cost = 0.0
         total_wholesale = 0.0
@@ -307,9 +312,13 @@ class DeletedItemsWindow(BaseWindow):
 
     def load_data(self):
         """Load data into table."""
+        self.run_in_background(
+            self.top, fetch_deleted_products, on_done=self.show_items
+        )
+
+    def show_items(self, items):
         for row in self.tree.get_children():
             self.tree.delete(row)
-        items = fetch_deleted_products(self.conn)
         formatter = DescriptionFormatter(50, 10)
         for i, row in enumerate(items, start=1):
             name = re.sub(r"\s+", " ", str(row["product_name"])).strip()
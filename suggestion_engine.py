@@ -0,0 +1,83 @@
+import tkinter as tk
+from collections import OrderedDict
+from task_runner import runner
+
+
+class SuggestionEngine:
+    """Debounced, cancellable type-ahead lookups off the Tk thread.
+    - request(keyword) waits `delay` ms for typing to pause, then runs
+      fetch(conn, keyword) in a worker on a pooled connection.
+    - A newer request supersedes older ones; stale results are dropped.
+    - Results are handed to on_results(keyword, rows) on the Tk thread
+      (the worker never touches widgets) and kept in a small LRU so
+      backspacing over a prefix is answered without a query.
+    fetch may return an error string (repo convention); it is passed to
+    on_error(msg) instead of on_results and is not cached."""
+    def __init__(self, widget, fetch, on_results, on_error=None, delay=200,
+                 cache_size=64):
+        self.widget = widget
+        self.fetch = fetch
+        self.on_results = on_results
+        self.on_error = on_error
+        self.delay = delay
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._generation = 0
+        self._after_id = None
+
+    def request(self, keyword):
+        """Schedule a lookup for keyword, cancelling any pending one."""
+        self.cancel()
+        keyword = keyword.strip()
+        if not keyword:
+            return
+        if keyword in self._cache:
+            self._cache.move_to_end(keyword)
+            self.on_results(keyword, self._cache[keyword])
+            return
+        self._after_id = self.widget.after(
+            self.delay, self._submit, keyword, self._generation
+        )
+
+    def cancel(self):
+        """Drop the pending lookup and ignore any still running."""
+        self._generation += 1
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def clear(self):
+        """Forget cached results (e.g. after products were changed)."""
+        self._cache.clear()
+
+    def _submit(self, keyword, generation):
+        self._after_id = None
+        if generation != self._generation:
+            return
+        runner.submit(
+            self.widget, self.fetch, keyword, key=self, busy=False,
+            on_done=lambda rows: self._deliver(keyword, generation, rows),
+            on_error=self._error
+        )
+
+    def _deliver(self, keyword, generation, rows):
+        if generation != self._generation:
+            return
+        if isinstance(rows, str):
+            self._error(rows)
+            return
+        self._remember(keyword, rows)
+        self.on_results(keyword, rows)
+
+    def _error(self, msg):
+        if self.on_error:
+            self.on_error(msg)
+
+    def _remember(self, keyword, rows):
+        self._cache[keyword] = rows
+        self._cache.move_to_end(keyword)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
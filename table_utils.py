@@ -1,8 +1,46 @@
+import functools
+import heapq
 import tkinter
 import tkinter.font as tkFont
+import tkinter.ttk
+
+
+# Rows carrying these tags are totals: kept out of sorting and numbering
+FIXED_TAGS = {"total", "totalrow", "grandtotalrow"}
+
+
+def to_number(value):
+    """Parse a displayed cell ('1,250.00', 3, '') as float, else None."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return None
+
+
+_fonts = {}
+
+
+def cached_font(spec=None):
+    """Shared tkFont.Font for spec (None = default font), built once."""
+    font = _fonts.get(spec)
+    if font is None:
+        font = tkFont.Font(font=spec) if spec else tkFont.Font()
+        _fonts[spec] = font
+    return font
+
+
+@functools.lru_cache(maxsize=8192)
+def text_width(text, spec=None):
+    """Pixel width of text in font spec; memoized across tables."""
+    return cached_font(spec).measure(text)
 
 
 class TreeviewSorter:
+    # Cells measured per column per autosize: the longest by length
+    WIDTH_CANDIDATES = 25
+
     def __init__(self, tree, cols, no_col, style_name="App.Treeview"):
         """
         tree - (ttk.Treeview instance). cols - (list of column names).
@@ -17,6 +55,19 @@ class TreeviewSorter:
         self.sort_direction = {}
         self.style_name = style_name
         self.heading_style = f"{style_name}.Heading"
+        # Row model: rows are read from the tree once and reused by every
+        # sort until the tree's items change. Code editing rows in place
+        # (tree.item(iid, values=...)) must call invalidate()
+        self._items = None # Item ids in current tree order
+        self._iids = [] # Item ids in model order
+        self._values = []
+        self._tags = []
+        self._fixed = set() # Model indexes of total rows (never sorted)
+        self._keys = {} # col -> sort key per model row
+        self._orders = {} # (col, reverse) -> sorted model indexes
+        # Column widths: content width per column over the rows measured
+        self._widths = {}
+        self._width_rows = [] # Model item ids already measured
 
     def apply_style(self, style):
         """Apply default treeview styling. Fonts and theme are fixed."""
@@ -42,35 +93,23 @@ class TreeviewSorter:
         if col == self.number_column:
             return
         reverse = self.sort_direction.get(col, False)
-        sortable = []
-        fixed = []
-        for item in self.tree.get_children():
-            tags = set(self.tree.item(item, "tags"))
-            # Keep TOTAL (or any fixed-tagged rows) out of sorting
-            if tags & {"total", "totalrow", "grandtotalrow"}:
-                fixed.append(item)
-                continue
-            value = self.tree.set(item, col)
-            sortable.append((value, item))
-
-        # Numeric sort -- fallback to string
-        try:
-            sortable.sort(
-                key=lambda x: float(str(x[0]).replace(",", "")),
-                reverse=reverse
-            )
-        except ValueError:
-            sortable.sort(
-                key=lambda x: str(x[0]).lower(), reverse=reverse
-            )
-
-        # Reorder rows
-        for index, (_, item) in enumerate(sortable):
-            self.tree.move(item, "", index)
+        self._sync_model()
+        order = self.sorted_order(col, reverse)
+        # TOTAL (fixed-tagged) rows stay at the end
+        items = [self._iids[i] for i in order]
+        items += [self._iids[i] for i in sorted(self._fixed)]
+        self._set_sort_heading(col, reverse)
+        if self._number_rows(items):
+            # Numbers and stripes changed with the order: rebuild the rows
+            self._rebuild(items)
+        else:
+            # Reorder in one call
+            self.tree.set_children("", *items)
+            self._items = tuple(items)
 
+    def _set_sort_heading(self, col, reverse):
         # Toggle direction
         self.sort_direction[col] = not reverse
-
         # Update column headers with arrow
         for heading in self.columns:
             text = heading
@@ -80,49 +119,166 @@ class TreeviewSorter:
                 heading, text=text,
                 command=lambda c=heading: self.sort_by_column(c)
             )
-        self.renumber_rows()
+
+    def invalidate(self):
+        """Drop the row snapshot and measured widths after rows were
+        edited in place; the next sort or autosize reads the tree again."""
+        self._items = None
+        self._widths.clear()
+        self._width_rows = []
+
+    def _sync_model(self):
+        """Snapshot tree rows into the model if the items changed."""
+        items = self.tree.get_children()
+        if items == self._items:
+            return
+        self._items = items
+        self._iids = list(items)
+        self._values = []
+        self._tags = []
+        for item in items:
+            data = self.tree.item(item)
+            self._values.append(list(data["values"]))
+            self._tags.append(tuple(data["tags"] or ()))
+        self._reset_model()
+
+    def _reset_model(self):
+        self._fixed = {
+            index for index, tags in enumerate(self._tags)
+            if FIXED_TAGS & set(tags)
+        }
+        self._keys.clear()
+        self._orders.clear()
+
+    def sort_keys(self, col):
+        """Typed sort key per model row for col. The column is numeric
+        when every sortable value parses as a number, text otherwise."""
+        keys = self._keys.get(col)
+        if keys is None:
+            index = list(self.columns).index(col)
+            raw = [
+                values[index] if index < len(values) else ""
+                for values in self._values
+            ]
+            numbers = [to_number(value) for value in raw]
+            numeric = all(
+                numbers[i] is not None
+                for i in range(len(raw)) if i not in self._fixed
+            )
+            if numeric:
+                keys = [number or 0.0 for number in numbers]
+            else:
+                keys = [str(value).lower() for value in raw]
+            self._keys[col] = keys
+        return keys
+
+    def sorted_order(self, col, reverse=False):
+        """Model indexes of the sortable rows ordered by col (cached)."""
+        order = self._orders.get((col, reverse))
+        if order is None:
+            keys = self.sort_keys(col)
+            order = sorted(
+                (i for i in range(len(self._values)) if i not in self._fixed),
+                key=keys.__getitem__, reverse=reverse
+            )
+            self._orders[(col, reverse)] = order
+        return order
 
     def renumber_rows(self):
         """Renumber rows and apply zebra striping."""
-        index = 1
-        for item in self.tree.get_children():
-            tags = set(self.tree.item(item, "tags"))
-            if tags & {"total", "totalrow", "grandtotalrow"}:
+        self._sync_model()
+        if self._number_rows(self._items):
+            self._rebuild(self._items)
+
+    def _number_rows(self, items):
+        """Write row numbers and zebra tags into the model for items in
+        display order. False when the table has no numbering column."""
+        if self.number_column not in self.columns:
+            return False
+        no_index = list(self.columns).index(self.number_column)
+        position = {iid: i for i, iid in enumerate(self._iids)}
+        number = 1
+        for item in items:
+            row = position[item]
+            if row in self._fixed:
                 continue
-            if self.number_column in self.columns:
-                self.tree.set(item, self.number_column, index)
-                # Remove old zebra tags
-                tags.discard("evenrow")
-                tags.discard("oddrow")
-                # Apply new zebra tag
-                tags.add("evenrow" if index % 2 == 0 else "oddrow")
-                self.tree.item(item, tags=tuple(tags))
-                # tag = self.even_tag if index % 2 == 0 else self.odd_tag
-                # self.tree.item(item, tags=(tag,))
-                index += 1
+            values = self._values[row]
+            if no_index < len(values):
+                values[no_index] = number
+            tags = set(self._tags[row]) - {"evenrow", "oddrow"}
+            tags.add("evenrow" if number % 2 == 0 else "oddrow")
+            self._tags[row] = tuple(tags)
+            number += 1
+        return True
+
+    def _rebuild(self, items):
+        """Show items in this order with their model values and tags.
+        Tk has no bulk value update, so the rows are deleted and inserted
+        again under the same ids: one call per row, instead of a move
+        plus a set and an item call per row. Selection and focus are
+        kept."""
+        position = {iid: i for i, iid in enumerate(self._iids)}
+        selection = self.tree.selection()
+        focus = self.tree.focus()
+        self.tree.delete(*items)
+        for item in items:
+            row = position[item]
+            self.tree.insert(
+                "", "end", iid=item, values=self._values[row],
+                tags=self._tags[row]
+            )
+        if selection:
+            self.tree.selection_set(selection)
+        if focus:
+            self.tree.focus(focus)
+        self._items = tuple(items)
+
+    def column_values(self, col, start=0):
+        """Yield the cell values of col for every row from start on."""
+        self._sync_model()
+        index = list(self.columns).index(col)
+        for values in self._values[start:]:
+            yield values[index] if index < len(values) else ""
+
+    def _unmeasured_start(self):
+        """First model row not yet measured by autosize_columns. Rows only
+        appended since the last call keep their widths; anything else
+        measures the table again."""
+        self._sync_model()
+        rows = self._iids
+        seen = self._width_rows
+        if len(seen) <= len(rows) and rows[:len(seen)] == seen:
+            start = len(seen)
+        else:
+            start = 0
+            self._widths.clear()
+        self._width_rows = list(rows)
+        return start
 
     def autosize_columns(self, padding=None):
         """
         Auto resize columns based on header and first line of cell content.
+        Only the longest new cells are measured; widths are memoized.
         """
-        font = tkFont.Font()
         spacing = padding if padding else 3
+        start = self._unmeasured_start()
         for col in self.columns:
             # Fixed numbering column to support upto 3 digits
             if col == self.number_column:
-                width = font.measure("000") + spacing
+                width = text_width("000") + spacing
                 self.tree.column(col, width=width, anchor="center")
                 continue
             # Start with header width
-            max_width = font.measure(col)
-            for item in self.tree.get_children():
-                cell_value = self.tree.set(item, col)
-                if cell_value:
-                    first_line = str(cell_value).split("\n", 1)[0]
-                    width = font.measure(first_line)
-                    if width > max_width:
-                        max_width = width
-
+            max_width = self._widths.get(col) or text_width(col)
+            lines = (
+                str(value).split("\n", 1)[0]
+                for value in self.column_values(col, start) if value
+            )
+            for line in heapq.nlargest(self.WIDTH_CANDIDATES, lines, key=len):
+                width = text_width(line)
+                if width > max_width:
+                    max_width = width
+            self._widths[col] = max_width
             self.tree.column(col, width=max_width + spacing)
 
     def bind_mousewheel(self):
@@ -149,12 +305,10 @@ class TreeviewSorter:
 
     def enable_multiline_height(self, style, multiline_col, padding=2):
         """Increase row height if specified column has multiline content."""
-        font = tkFont.Font(font=("Arial", 11))
-        line_height = font.metrics("linespace")
+        line_height = cached_font(("Arial", 11)).metrics("linespace")
 
         max_lines = 1
-        for item in self.tree.get_children():
-            value = self.tree.set(item, multiline_col)
+        for value in self.column_values(multiline_col):
             if not value:
                 continue
             text = str(value)
@@ -169,4 +323,193 @@ class TreeviewSorter:
     def disable_multiline_height(self, style):
         """Restore default Treeview row height."""
         default_height = style.lookup("Treeview", "rowheight")
-        style.configure(self.style_name, rowheight=default_height)
\ No newline at end of file
+        style.configure(self.style_name, rowheight=default_height)
+
+
+class VirtualTreeview(TreeviewSorter):
+    """TreeviewSorter over a Python list of rows that only materializes
+    the rows in view, plus `overscan` rows either side, as Treeview items.
+    Rows are added with insert() and shown with render(); scrolling moves
+    the materialized window, so Tk item count and render time depend on
+    the table height rather than the result size.
+    Item ids are row indexes, so tree.selection()/tree.item() keep working
+    for visible rows; use values() to read every row (e.g. for export).
+    Sorting only reorders `view` (row indexes in display order) using the
+    cached keys of TreeviewSorter; rows themselves never move.
+    on_near_end, when set, is called as the view nears the last row so
+    callers can append the next page of a result (PagedLoader.watch)."""
+
+    def __init__(self, tree, cols, no_col, style_name="App.Treeview",
+                 overscan=30):
+        super().__init__(tree, cols, no_col, style_name)
+        self.rows = [] # [values, tags] in insertion order
+        self.view = [] # Row indexes in display order
+        self._synced = True
+        self.overscan = overscan
+        self.offset = 0 # First row in view
+        self.scrollbar = None
+        self._start = 0
+        self._end = 0
+        self._pending = None
+        self.on_near_end = None # Called when scrolled near the last row
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self.tree.bind("<Configure>", lambda e: self.schedule_render(), "+")
+
+    def attach_scrollbar(self, scrollbar):
+        """Drive scrollbar from the row list instead of the Tk items."""
+        self.scrollbar = scrollbar
+        scrollbar.configure(command=self.yview)
+        self._update_scrollbar()
+
+    # Row model
+    def clear(self):
+        self.rows = []
+        self.view = []
+        self.offset = 0
+        self._synced = False
+        self._widths.clear()
+        self._width_rows = []
+        self.render()
+
+    def insert(self, values, tags=()):
+        """Append a row; call render() once all rows are added."""
+        self.view.append(len(self.rows))
+        self.rows.append([list(values), tuple(tags)])
+        self._synced = False
+
+    def values(self):
+        """Values of every row in display order."""
+        return [list(self.rows[row][0]) for row in self.view]
+
+    # Rendering
+    def visible_count(self):
+        """Rows that fit in the tree's current height."""
+        height = self.tree.winfo_height()
+        style = tkinter.ttk.Style(self.tree)
+        row_height = style.lookup(self.style_name, "rowheight")
+        try:
+            row_height = int(row_height)
+        except (TypeError, ValueError):
+            row_height = cached_font(("Arial", 11)).metrics("linespace")
+        return max(1, height // max(1, row_height))
+
+    def schedule_render(self):
+        if self._pending is None:
+            self._pending = self.tree.after_idle(self.render)
+
+    def render(self):
+        """Materialize rows[offset - overscan : offset + visible +
+        overscan] and scroll the tree so rows[offset] is at the top."""
+        if self._pending is not None:
+            self.tree.after_cancel(self._pending)
+            self._pending = None
+        total = len(self.rows)
+        visible = self.visible_count()
+        self.offset = max(0, min(self.offset, total - visible))
+        start = max(0, self.offset - self.overscan)
+        end = min(total, self.offset + visible + self.overscan)
+        selected = set(self.tree.selection())
+        self.tree.delete(*self.tree.get_children())
+        shown = self.view[start:end]
+        for row in shown:
+            values, tags = self.rows[row]
+            self.tree.insert(
+                "", "end", iid=str(row), values=values, tags=tags
+            )
+        self._start, self._end = start, end
+        keep = [str(row) for row in shown if str(row) in selected]
+        if keep:
+            self.tree.selection_set(keep)
+        if end > start:
+            self.tree.yview_moveto((self.offset - start) / (end - start))
+        self._update_scrollbar()
+
+    def yview(self, *args):
+        """Scrollbar command: 'moveto f' or 'scroll n units|pages'."""
+        total = len(self.rows)
+        visible = self.visible_count()
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.offset += step * (visible if args[2] == "pages" else 1)
+        self.render()
+
+    def _on_tree_scroll(self, first, last):
+        # Tree scrolled itself (wheel, keys, see()); track the top row and
+        # move the window before the user runs out of materialized rows
+        count = self._end - self._start
+        if count:
+            self.offset = self._start + round(float(first) * count)
+        visible = self.visible_count()
+        margin = self.overscan // 2
+        if ((self._start > 0 and self.offset - self._start < margin)
+                or (self._end < len(self.rows)
+                    and self._end - (self.offset + visible) < margin)):
+            self.schedule_render()
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        if self.scrollbar is None:
+            return
+        total = len(self.rows)
+        if not total:
+            self.scrollbar.set(0, 1)
+            return
+        visible = self.visible_count()
+        self.scrollbar.set(
+            self.offset / total, min(1.0, (self.offset + visible) / total)
+        )
+        if (self.on_near_end is not None
+                and self.offset + visible >= total - self.overscan):
+            self.on_near_end()
+
+    def enable_multiline_height(self, style, multiline_col, padding=2):
+        super().enable_multiline_height(style, multiline_col, padding)
+        self.schedule_render()
+
+    def disable_multiline_height(self, style):
+        super().disable_multiline_height(style)
+        self.schedule_render()
+
+    # Sorting on the row list
+    def invalidate(self):
+        super().invalidate()
+        self._synced = False
+
+    def _sync_model(self):
+        # The model is the row list itself; no Tk reads needed
+        if self._synced:
+            return
+        self._iids = list(range(len(self.rows)))
+        self._values = [values for values, _ in self.rows]
+        self._tags = [tags for _, tags in self.rows]
+        self._reset_model()
+        self._synced = True
+
+    def sort_by_column(self, col):
+        if col == self.number_column:
+            return
+        reverse = self.sort_direction.get(col, False)
+        self._sync_model()
+        self.view = self.sorted_order(col, reverse) + sorted(self._fixed)
+        self._set_sort_heading(col, reverse)
+        self.renumber_rows()
+        self.render()
+
+    def renumber_rows(self):
+        """Renumber and restripe rows in the list; render() shows them."""
+        if self.number_column not in self.columns:
+            return
+        no_index = list(self.columns).index(self.number_column)
+        number = 1
+        for row in self.view:
+            values, tags = self.rows[row]
+            tags = set(tags)
+            if tags & FIXED_TAGS:
+                continue
+            values[no_index] = number
+            tags -= {"evenrow", "oddrow"}
+            tags.add("evenrow" if number % 2 == 0 else "oddrow")
+            self.rows[row][1] = tuple(tags)
+            number += 1
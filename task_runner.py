@@ -0,0 +1,210 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import messagebox
+from concurrent.futures import ThreadPoolExecutor
+from connect_to_db import get_manager, POOL_SIZE
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker by Task.check() once the task is cancelled."""
+
+
+class Task:
+    """Handle for work submitted to a TaskRunner.
+    Workers may call report(...) to post progress and check() to stop
+    early; the GUI side calls cancel()."""
+    def __init__(self, key=None):
+        self.key = key
+        self.future = None
+        self._cancelled = threading.Event()
+        self._runner = None
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stop the task; its callbacks will not be called."""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check(self):
+        """Worker side: raise TaskCancelled if cancel() was called."""
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def report(self, *progress):
+        """Worker side: deliver progress to on_progress on the Tk thread."""
+        if self._runner is not None and not self.cancelled:
+            self._runner._post(self, "progress", progress)
+
+
+class TaskRunner:
+    """Runs database and report work off the Tk mainloop.
+    - submit(widget, func, *args) calls func(conn, *args) in a worker
+      thread on its own pooled connection (never the window's conn).
+    - Results, errors and progress are queued and handed to the
+      callbacks on the Tk thread by an after() poll; workers never touch
+      widgets.
+    - While tasks for a window are running its cursor shows busy.
+    - Passing key= cancels the previous task with the same key, so only
+      the latest refresh of a table is applied."""
+    POLL_MS = 30
+    BUSY_CURSOR = "watch"
+
+    def __init__(self, max_workers=None):
+        # Leave one pooled connection for the Tk thread
+        max_workers = max_workers or max(1, POOL_SIZE - 2)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="task"
+        )
+        self._events = queue.Queue()
+        self._pending = {} # task -> (widget, callbacks)
+        self._keys = {}
+        self._busy = {} # toplevel -> (running count, previous cursor)
+        self._poll_id = None
+        self._root = None
+
+    def submit(self, widget, func, *args, on_done=None, on_error=None,
+               on_progress=None, key=None, busy=True, with_task=False,
+               **kwargs):
+        """Run func(conn, *args, **kwargs) in the background.
+        on_done(result) / on_error(message) / on_progress(*values) run on
+        the Tk thread. with_task=True also passes task= to func so it can
+        report progress or check for cancellation. Returns the Task."""
+        if key is not None and key in self._keys:
+            self._keys.pop(key).cancel()
+        task = Task(key)
+        task._runner = self
+        if key is not None:
+            self._keys[key] = task
+        if with_task:
+            kwargs["task"] = task
+        self._pending[task] = (
+            widget, (on_done, on_error, on_progress), busy
+        )
+        if busy:
+            self._set_busy(widget, 1)
+        task.future = self._executor.submit(
+            self._work, task, func, args, kwargs
+        )
+        self._schedule_poll(widget)
+        return task
+
+    def cancel_all(self, widget):
+        """Cancel every task submitted for widget (e.g. on close)."""
+        for task, (owner, _, _) in list(self._pending.items()):
+            if owner is widget:
+                task.cancel()
+
+    def _work(self, task, func, args, kwargs):
+        # Worker thread: no Tk calls here, only the queue
+        if task.cancelled:
+            self._post(task, "cancelled", None)
+            return
+        try:
+            result = get_manager().run(func, *args, **kwargs)
+        except TaskCancelled:
+            self._post(task, "cancelled", None)
+        except Exception as e:
+            self._post(task, "error", str(e))
+        else:
+            self._post(task, "done", result)
+
+    def _post(self, task, kind, value):
+        self._events.put((task, kind, value))
+
+    def _schedule_poll(self, widget):
+        if self._poll_id is None:
+            self._root = widget.winfo_toplevel()
+            self._poll_id = self._root.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        while True:
+            try:
+                task, kind, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self._dispatch(task, 2, *value)
+            else:
+                self._finish(task, kind, value)
+        if self._pending:
+            root = self._root
+            try:
+                self._poll_id = root.after(self.POLL_MS, self._poll)
+            except tk.TclError:
+                # Polling window closed; continue on any live one
+                for widget, _, _ in self._pending.values():
+                    if self._alive(widget):
+                        self._schedule_poll(widget)
+                        break
+
+    def _finish(self, task, kind, value):
+        entry = self._pending.pop(task, None)
+        if entry is None:
+            return
+        widget, _, busy = entry
+        if task.key is not None and self._keys.get(task.key) is task:
+            del self._keys[task.key]
+        if busy:
+            self._set_busy(widget, -1)
+        if task.cancelled or kind == "cancelled":
+            return
+        if kind == "done":
+            self._dispatch(task, 0, value, entry=entry)
+        else:
+            self._dispatch(task, 1, value, entry=entry)
+
+    def _dispatch(self, task, index, *values, entry=None):
+        entry = entry or self._pending.get(task)
+        if entry is None or task.cancelled:
+            return
+        widget, callbacks, _ = entry
+        if not self._alive(widget):
+            return
+        callback = callbacks[index]
+        if callback is not None:
+            callback(*values)
+        elif index == 1:
+            # No handler given: tell the user rather than stdout
+            messagebox.showerror(
+                "Error", f"Background task failed: {values[0]}",
+                parent=widget
+            )
+
+    @staticmethod
+    def _alive(widget):
+        try:
+            return bool(widget.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def _set_busy(self, widget, delta):
+        try:
+            top = widget.winfo_toplevel()
+        except tk.TclError:
+            return
+        count, cursor = self._busy.get(top, (0, None))
+        if count == 0 and delta > 0:
+            try:
+                cursor = top.cget("cursor")
+                top.configure(cursor=self.BUSY_CURSOR)
+            except tk.TclError:
+                return
+        count += delta
+        if count <= 0:
+            self._busy.pop(top, None)
+            try:
+                top.configure(cursor=cursor or "")
+            except tk.TclError:
+                pass
+        else:
+            self._busy[top] = (count, cursor)
+
+
+# Process-wide runner shared by every window
+runner = TaskRunner()
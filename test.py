@@ -16,38 +16,6 @@ def search_products(conn, field, keyword):
         print(f"Error searching products: {e}")
         return []
 
-def modify_email(conn):
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute("""
-            ALTER TABLE logins
-            ADD COLUMN pass_change ENUM('true', 'false') NOT NULL DEFAULT 'true'
-            AFTER password;
-            """)
-            conn.commit()
-            print("Pass Change Column Added successfully.")
-    except Exception as e:
-        print(f"Error: {str(e)}")
-
-def add_sale_time_column_if_missing(conn):
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute("SHOW COLUMNS FROM sales LIKE 'sale_time'")
-            result = cursor.fetchone()
-            if not result:
-                cursor.execute("""
-                        ALTER TABLE sales
-                        ADD COLUMN sale_time TIME NOT NULL
-                        AFTER sale_date
-                        """)
-                conn.commit()
-                print("Column 'sale time' added successfully.")
-            else:
-                print("Column 'sale_time' already exists.")
-    except Exception as e:
-        print(f"Error adding sale time: {e}")
-
-
 def hash_password(plain_password: str) -> str:
     return bcrypt.hashpw(
         plain_password.encode("utf-8"), bcrypt.gensalt()
@@ -0,0 +1,37 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from working_on_accounting import JournalBatch
+from working_sales import sale_journal_lines, reversal_journal_lines
+
+
+def batch_of(lines):
+    batch = JournalBatch("R0001", "tester")
+    for line in lines:
+        batch.add_line(
+            line["account_name"], line["description"],
+            line["debit"], line["credit"]
+        )
+    return batch
+
+
+class SalesJournalLinesTest(unittest.TestCase):
+    def test_sale_lines_balance(self):
+        lines = sale_journal_lines(1234.50, 987.25, "Sale")
+        self.assertIsNone(batch_of(lines).validate())
+
+    def test_reversal_lines_balance(self):
+        lines = reversal_journal_lines(250.00, 180.40)
+        self.assertIsNone(batch_of(lines).validate())
+
+    def test_unbalanced_lines_are_rejected(self):
+        lines = sale_journal_lines(100.00, 60.00, "Sale")[1:]
+        self.assertIsNotNone(batch_of(lines).validate())
+
+
+if __name__ == "__main__":
+    unittest.main()
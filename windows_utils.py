@@ -1,7 +1,10 @@
 import tkinter as tk
+from tkinter import ttk
+import calendar
 import re
 from datetime import date, datetime
 import bcrypt
+from query_utils import period_bounds
 
 def to_uppercase(entry_widget):
     """Convert the value of an entry widget to uppercase."""
@@ -147,6 +150,58 @@ class ScrollableFrame(tk.Frame):
         self.canvas.yview_scroll(1, "units")
 
 
+class PeriodSelector(tk.Frame):
+    """Year and optional month comboboxes for period reports.
+    The first year entry means no period (everything to date); command()
+    is called whenever the selection changes."""
+    def __init__(self, parent, years, command=None, bg="lightblue"):
+        super().__init__(parent, bg=bg)
+        self.command = command
+        tk.Label(
+            self, text="Year:", bg=bg, font=("Arial", 12, "bold")
+        ).pack(side="left", padx=(3, 0))
+        self.year_cb = ttk.Combobox(
+            self, width=8, state="readonly", font=("Arial", 12),
+            values=["All"] + [str(year) for year in years]
+        )
+        self.year_cb.current(0)
+        self.year_cb.pack(side="left", padx=(0, 3))
+        tk.Label(
+            self, text="Month:", bg=bg, font=("Arial", 12, "bold")
+        ).pack(side="left", padx=(3, 0))
+        self.month_cb = ttk.Combobox(
+            self, width=10, state="readonly", font=("Arial", 12),
+            values=[""] + list(calendar.month_name)[1:]
+        )
+        self.month_cb.pack(side="left", padx=(0, 3))
+        self.year_cb.bind("<<ComboboxSelected>>", self._changed)
+        self.month_cb.bind("<<ComboboxSelected>>", self._changed)
+
+    def _changed(self, event=None):
+        if self.year_cb.current() <= 0:
+            self.month_cb.set("")
+        if self.command:
+            self.command()
+
+    def bounds(self):
+        """(start, end) of the selected period, end excluded; (None, None)
+        when no year is selected."""
+        if self.year_cb.current() <= 0:
+            return None, None
+        month = self.month_cb.current()
+        return period_bounds(
+            int(self.year_cb.get()), month if month > 0 else None
+        )
+
+    def describe(self):
+        """'Year 2025', 'March 2025' or '' when no year is selected."""
+        if self.year_cb.current() <= 0:
+            return ""
+        if self.month_cb.current() > 0:
+            return f"{self.month_cb.get()} {self.year_cb.get()}"
+        return f"Year {self.year_cb.get()}"
+
+
 class SentenceCapitalizer:
     """
     Auto-capitalizes the first letter of every sentence in a Text widget
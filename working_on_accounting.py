@@ -1,6 +1,142 @@
 from datetime import date
 from datetime import datetime
-from working_on_employee import insert_logs
+import threading
+from working_on_employee import insert_logs, insert_logs_many
+from connect_to_db import commit, rollback, transactional, on_rollback
+from query_utils import period_filter, KeysetQuery
+from account_balances import record_journal_balances
+from fiscal_years import is_closed, journal_is_closed, open_period_filter
+from financial_statements import (
+    trial_balance_rows, income_statement_rows, balance_sheet_rows,
+    cash_flow_rows
+)
+
+class AccountCache:
+    """In-process copy of chart_of_accounts. Loaded once on first use and
+    invalidated whenever an account is inserted, so posting code can map
+    account names to codes without querying MySQL."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._codes = None # casefolded name or code -> code
+        self._type_counts = None # account_type -> number of accounts
+
+    def invalidate(self):
+        with self._lock:
+            self._codes = None
+            self._type_counts = None
+
+    def _load(self, conn):
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT account_name, account_type, code
+                FROM chart_of_accounts
+            """)
+            rows = cursor.fetchall()
+        codes = {}
+        type_counts = {}
+        for name, acc_type, code in rows:
+            codes.setdefault(str(name).casefold(), code)
+            codes.setdefault(str(code).casefold(), code)
+            type_counts[acc_type] = type_counts.get(acc_type, 0) + 1
+        self._codes = codes
+        self._type_counts = type_counts
+
+    def get_code(self, conn, value):
+        """Return the account code matching an account name or code."""
+        with self._lock:
+            if self._codes is None:
+                self._load(conn)
+            return self._codes.get(str(value).casefold())
+
+    def get_codes(self, conn, names):
+        """Return {name: code} for the names that exist."""
+        with self._lock:
+            if self._codes is None:
+                self._load(conn)
+            return {
+                name: self._codes[str(name).casefold()]
+                for name in names if str(name).casefold() in self._codes
+            }
+
+    def count_by_type(self, conn, account_type):
+        """Number of accounts of account_type."""
+        with self._lock:
+            if self._type_counts is None:
+                self._load(conn)
+            return self._type_counts.get(account_type, 0)
+
+
+account_cache = AccountCache()
+
+
+class JournalBatch:
+    """One journal entry built in memory and written with a fixed number
+    of statements, whatever its size: the entry, every line in one
+    multi-row insert, the account_balances upsert and the finance logs
+    in one executemany. post() runs on the caller's cursor, inside the
+    caller's transaction, and never commits."""
+    def __init__(self, reference_no, username, entry_date=None):
+        self.reference_no = reference_no
+        self.username = username
+        self.entry_date = entry_date or date.today()
+        self.lines = [] # (account_code, description, debit, credit)
+        self.logs = [] # (receipt_no, action)
+
+    def add_line(self, account_code, description="", debit=0.00,
+                 credit=0.00, action=None, receipt_no=None):
+        """Add a line, with an optional finance log action (logged under
+        receipt_no, by default the account code)."""
+        self.lines.append((
+            account_code, description, debit or 0.00, credit or 0.00
+        ))
+        if action is not None:
+            self.log(receipt_no or account_code, action)
+
+    def log(self, receipt_no, action):
+        self.logs.append((receipt_no, action))
+
+    def totals(self):
+        """(total_debit, total_credit) rounded to cents."""
+        debit = round(sum(float(line[2]) for line in self.lines), 2)
+        credit = round(sum(float(line[3]) for line in self.lines), 2)
+        return debit, credit
+
+    def validate(self):
+        """Error message if the entry cannot be posted, else None."""
+        if not self.lines:
+            return "Journal Entry Has No Lines."
+        if any(not line[0] for line in self.lines):
+            return "Every Journal Line Needs an Account Code."
+        debit, credit = self.totals()
+        if debit != credit:
+            return (
+                f"Journal Entry Not Balanced: Debit {debit:,.2f}, "
+                f"Credit {credit:,.2f}."
+            )
+        return None
+
+    def post(self, cursor, journal_id=None):
+        """Write the entry (or add the lines to journal_id).
+        Returns: (True, journal_id) or (False, error_message)."""
+        error = self.validate()
+        if error:
+            return False, error
+        if journal_id is None:
+            cursor.execute("""
+                INSERT INTO journal_entries (entry_date, reference_no)
+                VALUES (%s, %s)
+                """, (self.entry_date, self.reference_no))
+            journal_id = cursor.lastrowid
+        cursor.executemany("""
+            INSERT INTO journal_entry_lines (journal_id, account_code,
+                description, debit, credit)
+            VALUES (%s, %s, %s, %s, %s)
+            """, [(journal_id, *line) for line in self.lines])
+        record_journal_balances(cursor, journal_id)
+        if self.logs:
+            insert_finance_logs(cursor, self.username, self.logs)
+        return True, journal_id
+
 
 def check_account_name_exists(conn, prefix):
     try:
@@ -14,6 +150,7 @@ def check_account_name_exists(conn, prefix):
     except Exception as e:
         return f"Error checking account name: {str(e)}"
 
+@transactional
 def insert_account(conn, account_name, account_type, code, descr, username):
     try:
         with conn.cursor() as cursor:
@@ -26,16 +163,18 @@ def insert_account(conn, account_name, account_type, code, descr, username):
                 account_type=VALUES(account_type),
                 description=VALUES(description)
             """, (account_name, account_type, code, descr))
+        account_cache.invalidate()
+        on_rollback(conn, account_cache.invalidate)
         name = account_name.title()
         action = f"Created Account '{name}'. Description: {descr}."
         success, msg = insert_finance_log(conn, username, code, action)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Error: {msg}."
-        conn.commit()
+        commit(conn)
         return True, f"Account '{account_name}' Inserted."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Creating Account: {str(e)}."
 
 def count_accounts_by_type(conn, account_type):
@@ -52,45 +191,32 @@ def count_accounts_by_type(conn, account_type):
     except Exception as e:
         return f"Error counting accounts: {str(e)}"
 
+@transactional
 def insert_journal_entry(conn, reference_no, line_items, username):
     """Insert a journal entry and its associated lines.
     Returns a success message or error message."""
     try:
+        batch = JournalBatch(reference_no, username)
+        for line in line_items:
+            code = line['account_code']
+            desc = line.get('description', '')
+            debit = line.get('debit', 0.00)
+            entry = "Debited" if (debit or 0) > 0 else "Credited"
+            batch.add_line(
+                code, desc, debit, line.get('credit', 0.00),
+                action=f"{entry} Account {code} ({desc})."
+            )
         with conn.cursor() as cursor:
-            today = date.today()
-            # Insert into journal entries
-            cursor.execute("""
-                    INSERT INTO journal_entries (entry_date, reference_no)
-                    VALUES (%s, %s)
-                    """, (today, reference_no))
-            journal_id = cursor.lastrowid
-            # Insert lines
-            for line in line_items:
-                code = line['account_code']
-                desc = line.get('description', '')
-                cursor.execute("""
-                INSERT INTO journal_entry_lines (journal_id, account_code,
-                    description, debit, credit)
-                VALUES (%s, %s, %s, %s, %s)
-                """, (
-                    journal_id,
-                    code,
-                    desc,
-                    line.get('debit', 0.00),
-                    line.get('credit', 0.00)
-                ))
-                entry = "Debited" if line.get("debit") > 0 else "Credited"
-                action = f"{entry} Account {code} ({desc})."
-                success, msg = insert_finance_log(
-                    conn, username, code, action
-                )
-                if not success:
-                    conn.rollback()
-                    return False, f"Error: {msg}."
-        conn.commit()
+            if is_closed(cursor, batch.entry_date):
+                return False, f"Year {batch.entry_date.year} Is Closed."
+            success, result = batch.post(cursor)
+            if not success:
+                return False, result
+            journal_id = result
+        commit(conn)
         return True, f"Journal entry #{journal_id} Recorded."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error inserting journal: {str(e)}"
 
 def get_account_name_and_code(conn):
@@ -119,24 +245,23 @@ def get_account_by_name_or_code(conn, value):
         print(f"Error fetching account: {str(e)}")
         return None
 
-def fetch_trial_balance(conn):
+def fetch_trial_balance(conn, as_of=None):
+    """Trial balance as at the end of as_of (default: everything)."""
     try:
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute("SELECT * FROM trial_balance")
-            results = cursor.fetchall()
-            return results
+        return trial_balance_rows(conn, as_of)
     except Exception as e:
         return f"Error fetching trial balance: {str(e)}"
 
-def get_income_statement(conn):
+def get_income_statement(conn, start=None, end=None):
+    """Income statement for entries dated start <= date < end (either
+    may be None for an open range)."""
     try:
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute("SELECT * FROM income_statement")
-            return True, cursor.fetchall()
+        return True, income_statement_rows(conn, start, end)
     except Exception as e:
         return False, f"Error fetching income statement: {str(e)}"
 
 
+@transactional
 def insert_opening_balance(conn, opening_lines, username):
     """Inserts an opening balance journal entry once,
     Returns (Success, Message)."""
@@ -151,36 +276,26 @@ def insert_opening_balance(conn, opening_lines, username):
             if existing_count > 0:
                 return False, "Opening balance already recorded."
             # Insert new opening balance journal
-            today = date.today()
-            ref = f"OB-{today.year}"
-            cursor.execute("""
-                    INSERT INTO journal_entries (entry_date, reference_no)
-                    VALUES (%s, %s)
-                    """, (today, ref))
-            journal_id = cursor.lastrowid
+            batch = JournalBatch(f"OB-{date.today().year}", username)
+            if is_closed(cursor, batch.entry_date):
+                return False, f"Year {batch.entry_date.year} Is Closed."
             for line in opening_lines:
                 code = line["account_code"]
                 desc = line.get("description", "Opening Balance")
-                cursor.execute("""
-                INSERT INTO journal_entry_lines 
-                    (journal_id, account_code, description, debit, credit)
-                VALUES (%s, %s, %s, %s, %s)
-                """, (
-                    journal_id, code, desc, line.get("debit", 0.00),
-                    line.get("credit", 0.00)
-                ))
-                entry = "Debited" if line.get("debit") > 0 else "Credited"
-                action = f"{entry} Account {code} (Inserted {desc})."
-                success, msg = insert_finance_log(
-                    conn, username, code, action
+                debit = line.get("debit", 0.00)
+                entry = "Debited" if (debit or 0) > 0 else "Credited"
+                batch.add_line(
+                    code, desc, debit, line.get("credit", 0.00),
+                    action=f"{entry} Account {code} (Inserted {desc})."
                 )
-                if not success:
-                    conn.rollback()
-                    return False, f"Error: {msg}."
-        conn.commit()
+            success, result = batch.post(cursor)
+            if not success:
+                return False, result
+            journal_id = result
+        commit(conn)
         return True, f"Opening Balance Journal #{journal_id} Recorded."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Recording Opening Balance: {str(e)}."
 
 def fetch_chart_of_accounts(conn):
@@ -202,7 +317,7 @@ def fetch_journal_lines_by_account_code(conn, account_code):
     """Fetch journal account and account name for specific account code."""
     try:
         with conn.cursor(dictionary=True) as cursor:
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT
                     jel.journal_id,
                     je.entry_date,
@@ -215,6 +330,7 @@ def fetch_journal_lines_by_account_code(conn, account_code):
                 JOIN chart_of_accounts coa ON jel.account_code = coa.code
                 JOIN journal_entries je ON jel.journal_id = je.journal_id
                 WHERE jel.account_code=%s
+                    AND {open_period_filter("je.entry_date")}
                 ORDER BY jel.journal_id DESC
                 """, (account_code,))
             results = cursor.fetchall()
@@ -222,6 +338,7 @@ def fetch_journal_lines_by_account_code(conn, account_code):
     except Exception as e:
         return f"Error fetching journal lines: {str(e)}."
 
+@transactional
 def reverse_journal_entry(conn, original_journal_id, username):
     """Reverses a journal entry by inserting a new entry with opposite
     debit/ credit values."""
@@ -235,62 +352,57 @@ def reverse_journal_entry(conn, original_journal_id, username):
             WHERE jel.journal_id=%s
                 """, (original_journal_id,))
             original_lines = cursor.fetchall()
-            if not original_lines:
-                or_id = original_journal_id
-                return False, f"No Journal Found of ID {or_id}."
-            # Create reversal entry
-            today = date.today()
-            reversal_reference = f"Reversal of #{original_journal_id}"
-            cursor.execute("""
-                INSERT INTO journal_entries (entry_date, reference_no)
-                VALUES (%s, %s)
-                """, (today, reversal_reference))
-            new_journal_id = cursor.lastrowid
-            for line in original_lines:
-                code = line["account_code"]
-                cursor.execute("""
-                INSERT INTO journal_entry_lines
-                    (journal_id, account_code, description, debit, credit)
-                VALUES (%s, %s, %s, %s, %s)
-                """, (
-                    new_journal_id,
-                    code,
-                    f"Reversal: {line['description']}",
-                    line["credit"], # Reversed
-                    line["debit"] # Reversed
-                ))
-                action = f"Reversed Entry of Account {code}."
-                success, msg = insert_finance_log(
-                    conn, username, code, action
-                )
-                if not success:
-                    conn.rollback()
-                    return False, f"Error Recording Logs: {msg}."
-        conn.commit()
+        if not original_lines:
+            or_id = original_journal_id
+            return False, f"No Journal Found of ID {or_id}."
+        # Create reversal entry
+        batch = JournalBatch(f"Reversal of #{original_journal_id}", username)
+        for line in original_lines:
+            code = line["account_code"]
+            batch.add_line(
+                code, f"Reversal: {line['description']}",
+                line["credit"], # Reversed
+                line["debit"], # Reversed
+                action=f"Reversed Entry of Account {code}."
+            )
+        with conn.cursor() as cursor:
+            if is_closed(cursor, batch.entry_date):
+                return False, f"Year {batch.entry_date.year} Is Closed."
+            success, result = batch.post(cursor)
+            if not success:
+                return False, result
+        commit(conn)
         return True, f"Reversed Journal ID #{original_journal_id}."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error reversing journal entry: {str(e)}."
 
+def journal_lines_query():
+    """KeysetQuery over open years' journal lines with account names,
+    oldest first."""
+    return KeysetQuery("""
+        SELECT
+            je.entry_date,
+            jel.journal_id,
+            jel.line_id,
+            jel.account_code,
+            coa.account_name,
+            jel.description,
+            jel.debit,
+            jel.credit
+        FROM journal_entry_lines jel
+        JOIN chart_of_accounts coa ON jel.account_code = coa.code
+        JOIN journal_entries je ON jel.journal_id = je.journal_id
+    """, [
+        ("je.entry_date", "entry_date"), ("jel.journal_id", "journal_id"),
+        ("jel.line_id", "line_id")
+    ], where=open_period_filter("je.entry_date"), descending=False)
+
+
 def fetch_all_journal_lines_with_names(conn):
     """Fetch all journal entries with account name joining chart of accounts."""
     try:
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute("""
-                SELECT
-                    je.entry_date,
-                    jel.journal_id,
-                    jel.account_code,
-                    coa.account_name,
-                    jel.description,
-                    jel.debit,
-                    jel.credit
-                FROM journal_entry_lines jel
-                JOIN chart_of_accounts coa ON jel.account_code = coa.code
-                JOIN journal_entries je ON jel.journal_id = je.journal_id
-                ORDER BY je.entry_date ASC, jel.journal_id ASC;
-                """)
-            return cursor.fetchall()
+        return journal_lines_query().all(conn)
     except Exception as e:
         return f"Error fetching journal accounts: {str(e)}."
 
@@ -298,92 +410,96 @@ class CashFlowStatement:
     def __init__(self, conn):
         self.conn = conn
 
-    def get_cash_flow_statement(self):
+    def get_cash_flow_statement(self, start=None, end=None):
+        """Cash flows for entries dated start <= date < end."""
         try:
-            with self.conn.cursor(dictionary=True) as cursor:
-                cursor.execute("SELECT * FROM cash_flow_statement")
-                rows = cursor.fetchall()
-                inflows = []
-                outflows = []
-                for row in rows:
-                    account = row['account_name'].lower()
-                    if 'depreciation' in account:
-                        continue
-                    amount = row['amount']
-                    category = row['category']
-                    account_code = row['account_code']
-                    account_name = row['account_name']
-                    entry = {
-                        "category": category,
-                        "account_code": account_code,
-                        "account_name": account_name,
-                        "amount": round(amount, 2)
-                    }
-                    if amount > 0:
-                        inflows.append(entry)
-                    elif amount < 0:
-                        outflows.append(entry)
-                return {
-                    "cash_inflows": inflows,
-                    "cash_outflows": outflows
+            rows = cash_flow_rows(self.conn, start, end)
+            inflows = []
+            outflows = []
+            for row in rows:
+                account = row['account_name'].lower()
+                if 'depreciation' in account:
+                    continue
+                amount = row['amount']
+                category = row['category']
+                account_code = row['account_code']
+                account_name = row['account_name']
+                entry = {
+                    "category": category,
+                    "account_code": account_code,
+                    "account_name": account_name,
+                    "amount": round(amount, 2)
                 }
+                if amount > 0:
+                    inflows.append(entry)
+                elif amount < 0:
+                    outflows.append(entry)
+            return {
+                "cash_inflows": inflows,
+                "cash_outflows": outflows
+            }
         except Exception as e:
             return f"Error fetching cash flow statement: {str(e)}."
 
-def get_balance_sheet(conn):
+def get_balance_sheet(conn, as_of=None):
+    """Balance sheet as at the end of as_of (default: everything)."""
     try:
-        with conn.cursor(dictionary=True) as cursor:
-            cursor.execute("SELECT * FROM balance_sheet")
-            rows = cursor.fetchall()
-            assets = []
-            liabilities = []
-            equity = []
-            total_assets = 0.00
-            total_liabilities = 0.00
-            total_equity = 0.00
-            for row in rows:
-                amount = float(row["amount"] or 0.00)
-                amount = round(amount, 2)
-                entry = {
-                    "category": row["category"],
-                    "account_code": row["account_code"],
-                    "account_name": row["account_name"],
-                    "amount": amount
-                }
-                category = row["category"].lower()
-                if category == "asset":
-                    assets.append(entry)
-                    total_assets += amount
-                elif category == "liability":
-                    liabilities.append(entry)
-                    total_liabilities += amount
-                elif category == "equity":
-                    equity.append(entry)
-                    total_equity += amount
-            # Sort each category by account_code
-            assets.sort(key=lambda x: x["account_code"])
-            equity.sort(key=lambda x: x["account_code"])
-            liabilities.sort(key=lambda x: x["account_code"])
-            return {
-                "assets": {
-                    "items": assets,
-                    "total": round(total_assets, 2)
-                },
-                "liabilities": {
-                    "items": liabilities,
-                    "total": round(total_liabilities, 2)
-                },
-                "equity": {
-                    "items": equity,
-                    "total": round(total_equity, 2)
-                }
+        rows = balance_sheet_rows(conn, as_of)
+        assets = []
+        liabilities = []
+        equity = []
+        total_assets = 0.00
+        total_liabilities = 0.00
+        total_equity = 0.00
+        for row in rows:
+            amount = float(row["amount"] or 0.00)
+            amount = round(amount, 2)
+            entry = {
+                "category": row["category"],
+                "account_code": row["account_code"],
+                "account_name": row["account_name"],
+                "amount": amount
             }
+            category = row["category"].lower()
+            if category == "asset":
+                assets.append(entry)
+                total_assets += amount
+            elif category == "liability":
+                liabilities.append(entry)
+                total_liabilities += amount
+            elif category == "equity":
+                equity.append(entry)
+                total_equity += amount
+        # Sort each category by account_code
+        assets.sort(key=lambda x: x["account_code"])
+        equity.sort(key=lambda x: x["account_code"])
+        liabilities.sort(key=lambda x: x["account_code"])
+        return {
+            "assets": {
+                "items": assets,
+                "total": round(total_assets, 2)
+            },
+            "liabilities": {
+                "items": liabilities,
+                "total": round(total_liabilities, 2)
+            },
+            "equity": {
+                "items": equity,
+                "total": round(total_equity, 2)
+            }
+        }
     except Exception as e:
         return f"Error fetching balance sheet: {str(e)}"
 
+@transactional
 def delete_journal_entry(conn, journal_id, code, username):
     try:
         with conn.cursor() as cursor:
+            if journal_is_closed(cursor, journal_id):
+                return False, (
+                    f"Journal Entry {journal_id} Belongs to a Closed Year."
+                )
+            record_journal_balances(cursor, journal_id, -1)
             # Delete related journal entry lines first
             cursor.execute("""
                 DELETE FROM journal_entry_lines
@@ -399,12 +515,12 @@ def delete_journal_entry(conn, journal_id, code, username):
             conn, username, code, action
         )
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Error Recording Logs: {msg}."
-        conn.commit()
+        commit(conn)
         return True, f"Journal Entry {journal_id} Deleted."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Deleting Journal Entry: {str(e)}."
 
 
@@ -425,18 +541,16 @@ class SalesJournalRecorder:
         Ensure all accounts in account_details exist in chart of accounts.
         Returns dict {account_name: account_code}.
         """
-        account_codes = {}
         try:
+            # 1. Look up existing accounts in the cached chart
+            account_codes = account_cache.get_codes(self.conn, account_details)
             for name, info in account_details.items():
-                # 1. Check if account exists by name
-                result = get_account_by_name_or_code(self.conn, name)
-                if result:
-                    # Account exists
-                    account_codes[name] = result["code"]
-                else:
+                if name not in account_codes:
                     # 2. Count existing accounts by type
                     account_type = info["type"]
-                    count = count_accounts_by_type(self.conn, account_type)
+                    count = account_cache.count_by_type(
+                        self.conn, account_type
+                    )
                     # 3. Generate account code
                     prefix = self.PREFIX_MAP.get(account_type, 9)
                     code = int(f"{prefix * 10}{count + 1:03d}")
@@ -453,6 +567,7 @@ class SalesJournalRecorder:
         except Exception as e:
             return  False, f"Error: {str(e)}"
 
+    @transactional
     def create_journal_entry(self, reference_no):
         """Create a new journal entry and return its ID or None if failed."""
         try:
@@ -462,44 +577,42 @@ class SalesJournalRecorder:
                 VALUES (%s, %s)
                 """, (date.today(), reference_no))
                 last_id = cursor.lastrowid
-                self.conn.commit()
+                commit(self.conn)
             return True, last_id
         except Exception as e:
             return False, str(e)
 
+    @transactional
     def insert_journal_lines(self, aid, lines, acc_codes, receipt, desc):
         """Insert debit and credit lines into journal_entry_lines."""
         try:
+            batch = JournalBatch(receipt, self.user)
+            for line in lines:
+                acc_name = line["account_name"]
+                acc_code = acc_codes.get(acc_name)
+                if not acc_code:
+                    raise ValueError(f"Acc Code of  {acc_name} not found")
+                batch.add_line(
+                    acc_code, line.get("description", ""),
+                    line.get("debit", 0.00), line.get("credit", 0.00),
+                    action=f"{desc}.{receipt}."
+                )
             with self.conn.cursor() as cursor:
-                for line in lines:
-                    acc_name = line["account_name"]
-                    acc_code = acc_codes.get(acc_name)
-                    if not acc_code:
-                        raise ValueError(f"Acc Code of  {acc_name} not found")
-                    cursor.execute("""
-                    INSERT INTO journal_entry_lines(journal_id, account_code,
-                        description, debit, credit)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """, (
-                        aid,
-                        acc_code,
-                        line.get("description", ""),
-                        line.get("debit", 0.00),
-                        line.get("credit", 0.00)
-                    ))
-                    action = f"{desc}.{receipt}."
-                    success, msg = insert_finance_log(
-                        self.conn, self.user, acc_code, action
-                    )
-                    if not success:
-                        self.conn.rollback()
-                        return False, f"Error Recording Logs: {msg}."
-                self.conn.commit()
-                return True, "Journal Recorded Successfully."
+                if is_closed(cursor, batch.entry_date):
+                    success = False
+                    result = f"Year {batch.entry_date.year} Is Closed."
+                else:
+                    success, result = batch.post(cursor, journal_id=aid)
+            if not success:
+                rollback(self.conn)
+                return False, result
+            commit(self.conn)
+            return True, "Journal Recorded Successfully."
         except Exception as e:
-            self.conn.rollback()
+            rollback(self.conn)
             return False, f"Error: {str(e)}."
 
+    @transactional
     def record_sales(self, account_details, transaction_lines, ref_no, desc):
         """Records a sales transaction.
         Returns True if successful, False otherwise."""
@@ -523,9 +636,10 @@ class SalesJournalRecorder:
 
             return True, "Sales transaction recorded successfully."
         except Exception as e:
-            self.conn.rollback()
+            rollback(self.conn)
             return False, f"Error: {str(e)}"
 
+@transactional
 def insert_finance_log(conn, username, receipt_no, action):
     """Insert a record into finance logs table.
     Returns: (True, message) on Success, (False, error_message) on failure"""
@@ -542,41 +656,58 @@ def insert_finance_log(conn, username, receipt_no, action):
         action = f"{action.title()}"
         success, msg = insert_logs(conn, username, "Finance", action)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Failed to Log Action: {msg}."
-        conn.commit()
+        commit(conn)
         return True, "Finance log inserted."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error inserting Finance Log: {str(e)}."
 
+
+def insert_finance_logs(cursor, username, entries):
+    """Insert finance logs for (receipt_no, action) entries, and their
+    general log entries, with one executemany each on the caller's
+    cursor; committing is left to the caller."""
+    now = datetime.now()
+    log_date = now.date()
+    log_time = now.time().strftime("%H:%M:%S")
+    cursor.executemany("""
+        INSERT INTO finance_logs
+            (log_date, log_time, username, receipt_no, action)
+        VALUES (%s, %s, %s, %s, %s)
+    """, [
+        (log_date, log_time, username, receipt_no, action)
+        for receipt_no, action in entries
+    ])
+    insert_logs_many(
+        cursor, username, "Finance",
+        [f"{action.title()}" for _, action in entries]
+    )
+
+def finance_logs_query(year, month=None, username=None):
+    """KeysetQuery over finance_logs filtered like fetch_finance_logs,
+    newest first."""
+    period, params = period_filter("log_date", year, month)
+    # Optional filters
+    if username:
+        period += " AND username = %s"
+        params.append(username)
+    return KeysetQuery("""
+        SELECT id, log_date, log_time, username, receipt_no, action
+        FROM finance_logs
+    """, ["log_date", "log_time", "id"], period, params)
+
+
 def fetch_finance_logs(conn, year, month=None, username=None):
     """Fetch logs from Finance logs table filtered by year, and optionally
     by month, username and section.
     Returns: (bool, list or str): (True, [rows]) on success,
     (False, error_msg) on failure."""
     try:
-        with conn.cursor(dictionary=True) as cursor:
-            query = """
-                SELECT log_date, log_time, username, receipt_no, action
-                FROM finance_logs
-                WHERE YEAR(log_date) = %s
-            """
-            params = [year]
-
-            # Optional filters
-            if month:
-                query += " AND MONTH(log_date) = %s"
-                params.append(month)
-            if username:
-                query += " AND username = %s"
-                params.append(username)
-
-            # Order by most recent first
-            query += " ORDER BY log_date DESC, log_time DESC;"
-            cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
-            return True, rows
+        # Order by most recent first
+        rows = finance_logs_query(year, month, username).all(conn)
+        return True, rows
     except Exception as e:
         return False, f"Error: {str(e)}."
 
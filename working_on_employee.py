@@ -1,6 +1,8 @@
 import datetime
 from datetime import date
 from windows_utils import PasswordSecurity
+from connect_to_db import commit, rollback, transactional
+from query_utils import period_filter, KeysetQuery
 
 
 class EmployeeManager:
@@ -8,6 +10,7 @@ class EmployeeManager:
         self.conn = conn
         self.user = user
 
+    @transactional
     def insert_employee(self, emp_data):
         """Insert a new employee record. emp_data should be a dictionary."""
         try:
@@ -31,12 +34,12 @@ class EmployeeManager:
                 ))
             user_code = self.create_employee_code(dept)
             if not user_code:
-                self.conn.rollback()
+                rollback(self.conn)
                 return False, "Error generating user code."
             # Insert login
             result, msg = self.insert_login_data(user_code, username)
             if not result:
-                self.conn.rollback()
+                rollback(self.conn)
                 return False, msg
             # Increase employee count in department
             success, msg = self.increase_employee_count(dept)
@@ -48,10 +51,10 @@ class EmployeeManager:
             )
             if not success:
                 return False, f"Failed to Log Action: {msg}."
-            self.conn.commit()
+            commit(self.conn)
             return True, f"Employee {name} of {dept} Added successfully."
         except Exception as e:
-            self.conn.rollback()
+            rollback(self.conn)
             return False, f"Error Adding Employee: {str(e)}."
 
     def get_department_code(self, department_name):
@@ -126,6 +129,7 @@ class EmployeeManager:
             return False, f"Error Increasing Employees: {str(e)}."
 
 
+@transactional
 def insert_into_departments(conn, name, user):
     try:
         with conn.cursor() as cursor:
@@ -140,10 +144,10 @@ def insert_into_departments(conn, name, user):
         success, msg = insert_logs(conn, user, "Human Resource", action)
         if not success:
             return False, f"Failed to Log Action: {msg}."
-        conn.commit()
+        commit(conn)
         return True, f"Department {name} Created With Code: {code}."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error: {e}"
 
 def fetch_departments(conn):
@@ -201,6 +205,7 @@ def fetch_logins_by_username(conn, username):
     except Exception as e:
         return f"Username Error: {str(e)}."
 
+@transactional
 def update_login_password(conn, username, new_pass):
     try:
         with conn.cursor() as cursor:
@@ -211,19 +216,20 @@ def update_login_password(conn, username, new_pass):
             SET password = %s, pass_change = 'false', date_created=%s
             WHERE username=%s
             """, (password, now, username))
-            conn.commit()
+            commit(conn)
             if cursor.rowcount == 0:
                 return False, f"Username '{username}' not Found."
         action = "Updated Login Password."
         success, msg = insert_logs(conn, username, "Human Resource", action)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Failed to Log Action: {msg}."
         return True, "Password updated successfully."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error updating Password: {str(e)}."
 
+@transactional
 def update_login_status(conn, identifier, status, user):
     """Args: conn: the database connection
             identifier: the username or user code
@@ -258,12 +264,12 @@ def update_login_status(conn, identifier, status, user):
         action = f"Updated {identifier} Login Status to {status}."
         success, msg = insert_logs(conn, user, "Human Resource", action)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Failed to Log Action: {msg}."
-        conn.commit()
+        commit(conn)
         return True, f"Status for '{identifier}' updated to '{status}'."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Updating Status: {str(e)}."
 
 def get_login_status_and_name(conn, identifier):
@@ -282,6 +288,7 @@ def get_login_status_and_name(conn, identifier):
     except Exception as e:
         raise e
 
+@transactional
 def insert_privilege(conn, privilege, description, user):
     """Insert new privilege into access table.
     Return success message or error string."""
@@ -294,12 +301,12 @@ def insert_privilege(conn, privilege, description, user):
         action = f"Created New Privilege {privilege} to: {description}."
         success, msg = insert_logs(conn, user, "Human Resource", action)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Failed to Log Action: {msg}."
-        conn.commit()
+        commit(conn)
         return True, f"Privilege '{privilege}' inserted successfully."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         if "Duplicate entry" in str(e):
             return False, f"Privilege '{privilege}' already exists."
         return False, f"Insert Error: {str(e)}."
@@ -337,6 +344,7 @@ def get_all_privileges(conn):
     except Exception as e:
         return False, f"Error Fetching Privileges: {str(e)}."
 
+@transactional
 def insert_user_privilege(conn, user_code, access_id, pname, name, user):
     try:
         with conn.cursor() as cursor:
@@ -344,17 +352,17 @@ def insert_user_privilege(conn, user_code, access_id, pname, name, user):
                 INSERT IGNORE INTO login_access (user_code, access_id)
                 VALUES (%s, %s)
             """, (user_code, access_id))
-            conn.commit()
+            commit(conn)
             if cursor.rowcount == 0:
                 return False, f"Privilege already assigned to '{user_code}'."
         action = f"Assigned Privilege to '{pname}' To {name}."
         success, msg = insert_logs(conn, user, "System Privilege", action)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Failed to Log Action: {msg}."
         return True, f"Privilege Assigned to '{user_code}'."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Insert Error: {str(e)}."
 
 def get_user_privileges(conn, identifier):
@@ -382,6 +390,7 @@ def get_user_privileges(conn, identifier):
     except Exception as e:
         return f"Error fetching privileges: {str(e)}."
 
+@transactional
 def remove_user_privilege(conn, user_code, access_id, pname, name, user):
     """Remove a specific privilege from a user.
     Returns a str: Success or error message."""
@@ -396,14 +405,15 @@ def remove_user_privilege(conn, user_code, access_id, pname, name, user):
         action = f"Removed Privilege to '{pname}' From {name}."
         success, msg = insert_logs(conn, user, "System Privilege", action)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Failed to Log Action: {msg}."
-        conn.commit()
+        commit(conn)
         return True, f"Privilege Removed from user '{name}'."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error removing privilege: {str(e)}."
 
+@transactional
 def reset_user_password(conn, user_code, name, user, new_password="000000"):
     """Reset user's password to default password and update date_created."""
     today = date.today()
@@ -420,12 +430,12 @@ def reset_user_password(conn, user_code, name, user, new_password="000000"):
         action = f"Reset Password For {name.capitalize()}."
         success, msg = insert_logs(conn, user, "Human Resource", action)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Failed to Log Action: {msg}."
-        conn.commit()
+        commit(conn)
         return True, f"Password reset successfully to '{new_password}'."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error resetting password: {str(e)}."
 
 def check_username_exists(conn, username):
@@ -575,6 +585,7 @@ def fetch_employee_login_info(conn, identifier):
     except Exception as e:
         return False, f"Error fetching Employee Info: {str(e)}."
 
+@transactional
 def update_employee_info(conn, info, user):
     """Updates employee/login field except user_code using user_code as
     identifier. Expects 'info' dict with keys: code, name, username,
@@ -626,14 +637,15 @@ def update_employee_info(conn, info, user):
         action = f"Updated User {username} Details with; {login_values}."
         success, msg = insert_logs(conn, user, "Human Resource", action)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Failed to Log Action: {msg}."
-        conn.commit()
+        commit(conn)
         return True, "Employee info updated successfully."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error updating employee info: {str(e)}."
 
+@transactional
 def insert_logs(conn, username, section, action):
     """Insert new log entry into log table."""
     try:
@@ -647,43 +659,53 @@ def insert_logs(conn, username, section, action):
                     action)
                 VALUES (%s, %s, %s, %s, %s)
                 """, (log_date, log_time, username, section, action))
-            conn.commit()
+            commit(conn)
         return True, "Log recorded successfully."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Failed to Insert Log: {str(e)}."
 
 
+def insert_logs_many(cursor, username, section, actions):
+    """Insert one log entry per action with a single executemany on the
+    caller's cursor; committing is left to the caller."""
+    now = datetime.datetime.now()
+    log_date = now.date()
+    log_time = now.time().replace(microsecond=0)
+    cursor.executemany("""
+        INSERT INTO logs (log_date, log_time, username, section, action)
+        VALUES (%s, %s, %s, %s, %s)
+        """, [
+            (log_date, log_time, username, section, action)
+            for action in actions
+        ])
+
+
+def logs_query(year, month=None, username=None, section=None):
+    """KeysetQuery over logs filtered like fetch_logs, newest first."""
+    period, params = period_filter("log_date", year, month)
+    # Optional filters
+    if username:
+        period += " AND username = %s"
+        params.append(username)
+    if section:
+        period += " AND section = %s"
+        params.append(section)
+    return KeysetQuery("""
+        SELECT log_id, log_date, log_time, username, section, action
+        FROM logs
+    """, ["log_date", "log_time", "log_id"], period, params)
+
+
 def fetch_logs(conn, year, month=None, username=None, section=None):
     """Fetch logs from logs table filtered by year, and optionally by month,
     username and section.
     Returns: (bool, list or str): (True, [rows]) on success,
     (False, error_msg) on failure."""
     try:
-        with conn.cursor(dictionary=True) as cursor:
-            query = """
-                SELECT log_date, log_time, username, section, action
-                FROM logs
-                WHERE YEAR(log_date) = %s
-            """
-            params = [year]
-
-            # Optional filters
-            if month:
-                query += " AND MONTH(log_date) = %s"
-                params.append(month)
-            if username:
-                query += " AND username = %s"
-                params.append(username)
-            if section:
-                query += " AND section = %s"
-                params.append(section)
-
-            # Order by most recent first
-            query += " ORDER BY log_date DESC, log_time DESC;"
-            cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
-            return True, rows
+        # Order by most recent first
+        rows = logs_query(year, month, username, section).all(conn)
+        return True, rows
     except Exception as e:
         return False, f"Error: {str(e)}."
 
@@ -741,6 +763,7 @@ def get_net_sales(conn, username):
     except Exception as e:
         return False, f"Error Getting Net Sales: {str(e)}."
 
+@transactional
 def insert_cashier_sale(conn, username, description, debit):
     """Insert a transaction into cashier control table."""
     try:
@@ -763,10 +786,10 @@ def insert_cashier_sale(conn, username, description, debit):
                 (username, date, time, description, debit, credit, status)
                 VALUES (%s, %s, %s, %s, %s, %s, 'open')
             """, (username, today, current_time, description, 0.00, debit))
-        conn.commit()
+        commit(conn)
         return True, "Cashier control recorded."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Insert Error: {str(e)}."
 
 
@@ -826,7 +849,7 @@ def fetch_unassigned_privileges(conn, username):
             rows = cursor.fetchall()
         return True, rows
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Fetching Unassigned Privileges: {str(e)}."
 
 class CheckAdmin:
@@ -1,5 +1,6 @@
 from datetime import date
 from working_on_employee import insert_logs
+from query_utils import period_filter, KeysetQuery
 
 def insert_order_data(conn, order_data, items, user, payment_data=None):
     try:
@@ -180,12 +181,13 @@ def fetch_orders_by_year(conn, year):
     """Fetch orders placed in the given year but always include all
     pending orders from any year."""
     try:
+        period, params = period_filter("date_placed", year)
         with conn.cursor(dictionary=True) as cursor:
-            cursor.execute("""
+            cursor.execute(f"""
             SELECT order_id, customer_name, contact, date_placed, deadline,
                 amount, status
             FROM orders
-            WHERE YEAR(date_placed) = %s OR status = 'Pending'
+            WHERE ({period}) OR status = 'Pending'
             ORDER BY
                 CASE status
                     WHEN 'Pending' THEN 0
@@ -193,7 +195,7 @@ def fetch_orders_by_year(conn, year):
                     ELSE 2
                 END,
                 order_id DESC
-            """, (year,))
+            """, tuple(params))
             return True, cursor.fetchall()
     except Exception as e:
         return False, f"Error fetching orders: {str(e)}."
@@ -407,7 +409,8 @@ def order_items_history(conn, year, month=None):
     """
     try:
         with conn.cursor(dictionary=True) as cursor:
-            query = """
+            period, params = period_filter("o.date_placed", year, month)
+            query = f"""
                 SELECT
                     oi.product_code,
                     oi.product_name,
@@ -416,12 +419,8 @@ def order_items_history(conn, year, month=None):
                     SUM(oi.total_price) AS total_revenue
                 FROM order_items oi
                 JOIN orders o ON oi.order_id = o.order_id
-                WHERE YEAR(o.date_placed) = %s
+                WHERE {period}
             """
-            params = [year]
-            if month:
-                query += " AND MONTH(o.date_placed) = %s"
-                params.append(month)
             query += """
                 GROUP BY product_code, product_name
                 ORDER BY total_revenue DESC, total_quantity DESC;
@@ -535,25 +534,23 @@ def fetch_all_orders_logs(conn, year, month=None, user=None):
     -User(optional, username)
     """
     try:
-        with conn.cursor(dictionary=True) as cursor:
-            query = """
-            SELECT log_date, log_id, order_id, total_amount, user, action
-            FROM orders_logs
-            WHERE YEAR(log_date) = %s
-            """
-            params = [year]
-            if month:
-                query += " AND MONTH(log_date) = %s"
-                params.append(month)
-            if user:
-                query += " AND user = %s"
-                params.append(user)
-            query += " ORDER BY log_date DESC, log_id DESC;"
-            cursor.execute(query, tuple(params))
-            return cursor.fetchall()
+        return orders_logs_query(year, month, user).all(conn)
     except Exception as e:
         return f"Error fetching orders logs: {str(e)}."
 
+
+def orders_logs_query(year, month=None, user=None):
+    """KeysetQuery over orders_logs filtered like fetch_all_orders_logs,
+    newest first."""
+    period, params = period_filter("log_date", year, month)
+    if user:
+        period += " AND user = %s"
+        params.append(user)
+    return KeysetQuery("""
+        SELECT log_date, log_id, order_id, total_amount, user, action
+        FROM orders_logs
+    """, ["log_date", "log_id"], period, params)
+
 def fetch_distinct_years_users(conn):
     """Fetch distinct years from orders logs table."""
     try:
@@ -1,7 +1,10 @@
 from datetime import date
 from working_on_accounting import SalesJournalRecorder
 from working_on_employee import insert_logs
+from connect_to_db import commit, rollback, transactional
+from query_utils import period_filter
 
+@transactional
 def insert_new_product(conn, product, user):
     """Insert a new product into stock and product tables.
     ARGS: conn: Active DB connection.
@@ -45,7 +48,7 @@ def insert_new_product(conn, product, user):
         }
         success, message = log_stock_change(conn, data)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return f"Error Updating Product Log: {message}"
         else:
             cost = qty * cost
@@ -63,14 +66,15 @@ def insert_new_product(conn, product, user):
             description = f"Added New Product ({name})."
             success, err = recorder.record_sales(accounts, lines, ref, description)
             if not success:
-                conn.rollback()
+                rollback(conn)
                 return False, f"Error Recording Books of Accounts: {err}."
-            conn.commit()
+            commit(conn)
             return True, f"New Product '{name}' inserted successfully."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Inserting New Product: {str(e)}."
 
+@transactional
 def delete_product(conn, code, user):
     try:
         with conn.cursor() as cursor:
@@ -88,15 +92,16 @@ def delete_product(conn, code, user):
         }
         success, message = log_stock_change(conn, data)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Error Updating Product Log: {message}."
         else:
-            conn.commit()
+            commit(conn)
             return True, f"Product code '{code}' deleted successfully."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error deleting product: {str(e)}"
 
+@transactional
 def restore_deleted_product(conn, code, user):
     try:
         with conn.cursor() as cursor:
@@ -114,14 +119,15 @@ def restore_deleted_product(conn, code, user):
         }
         success, message = log_stock_change(conn, data)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Error Updating Product Log: {message}."
-        conn.commit()
+        commit(conn)
         return True, f"Product code '{code}' deleted successfully."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error deleting product: {str(e)}"
 
+@transactional
 def update_quantity(conn, product_code, new_quantity, user):
     try:
         with conn.cursor() as cursor:
@@ -139,15 +145,16 @@ def update_quantity(conn, product_code, new_quantity, user):
         }
         success, message = log_stock_change(conn, data)
         if success:
-            conn.commit()
+            commit(conn)
             return "Quantity updated successfully."
         else:
-            conn.rollback()
+            rollback(conn)
             return f"Error Updating Product Log: {message}"
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return f"Error updating quantity: {str(e)}"
 
+@transactional
 def add_to_existing_product(conn, product: dict, user: str):
     """Replenish an existing product (increase quantity, update prices if given).
     ARGS: conn -> MySQL connection object, product -> dict with product details,
@@ -200,7 +207,7 @@ def add_to_existing_product(conn, product: dict, user: str):
         }
         success, message = log_stock_change(conn, data)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Error Updating Product Log: {message}."
         else:
             cost = add_qty * updated_cost
@@ -219,12 +226,13 @@ def add_to_existing_product(conn, product: dict, user: str):
                 accounts, lines, ref, "Replenishment"
             )
             if success:
-                conn.commit()
+                commit(conn)
                 return True, f"Product '{code}' Replenished Successfully."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Replenishing Product: {str(e)}."
 
+@transactional
 def update_price(conn, code, retail, wholesale, user):
     try:
         with conn.cursor() as cursor:
@@ -247,15 +255,16 @@ def update_price(conn, code, retail, wholesale, user):
         }
         success, message = log_stock_change(conn, data)
         if success:
-            conn.commit()
+            commit(conn)
             return True, f"Price updated successfully for: {code}."
         else:
-            conn.rollback()
+            rollback(conn)
             return False, f"Error Updating Product Log: {message}."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Updating Price: {str(e)}."
 
+@transactional
 def update_description(conn, code, new_description, user):
     try:
         with conn.cursor() as cursor:
@@ -271,13 +280,13 @@ def update_description(conn, code, new_description, user):
         }
         success, message = log_stock_change(conn, data)
         if success:
-            conn.commit()
+            commit(conn)
             return f"Description For {code} Updated successfully"
         else:
-            conn.rollback()
+            rollback(conn)
             return f"Error Updating Product Log: {message}"
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         raise e
 
 def search_product_codes(conn, keyword):
@@ -326,6 +335,7 @@ def search_product_details(conn, keyword):
     except Exception as e:
         return None, f"Error searching product: {str(e)}."
 
+@transactional
 def update_product_details(conn, product, user):
     """Update product details across stock, products and replenishment tables.
     Args; conn --> MySQL connection object, product --> Dict containing
@@ -367,15 +377,16 @@ def update_product_details(conn, product, user):
         }
         success, message = log_stock_change(conn, data)
         if success:
-            conn.commit()
+            commit(conn)
             return True, f"Product #{name} updated successfully."
         else:
-            conn.rollback()
+            rollback(conn)
             return False, f"Error Updating Product Log: {message}"
     except Exception as e:
         return False, f"Error Updating Product: {str(e)}"
 
 
+@transactional
 def log_stock_change(conn, data):
     """Insert a new log into the product control logs table. ARGS:
         conn -> MySQL connection, data -> dictionary with keys for code, name,
@@ -400,12 +411,12 @@ def log_stock_change(conn, data):
             """, (date.today(), code, name, desc, qty, total, user))
         success, msg = insert_logs(conn, user, "Stock", desc)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Error Recording Logs: {msg}."
-        conn.commit()
+        commit(conn)
         return True, f"Successfully logged {name}."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Inserting logs: {str(e)}"
 
 
@@ -423,33 +434,48 @@ def fetch_all_products(conn):
     except Exception as e:
         raise e
 
+def get_costs_by_codes(conn, codes):
+    """Fetch unit cost for several product codes with one IN query.
+    Returns: ({product_code: cost}, error_message)."""
+    codes = list(dict.fromkeys(code for code in codes if code))
+    if not codes:
+        return {}, None
+    try:
+        placeholders = ", ".join(["%s"] * len(codes))
+        with conn.cursor(dictionary=True) as cursor:
+            cursor.execute(f"""
+                SELECT product_code, cost FROM products
+                WHERE product_code IN ({placeholders})
+            """, tuple(codes))
+            return {
+                row["product_code"]: float(row["cost"])
+                for row in cursor.fetchall() if row["cost"] is not None
+            }, None
+    except Exception as e:
+        return {}, f"Error fetching product costs: {e}."
+
 def get_total_cost_by_codes(conn, items):
     """Calculates total cost of goods sold of the provided codes and qty.
     Items: list of dicts like [{'product_code': 'P01', 'quantity': 3}, ...].
     Returns: (total_cost, error_message)."""
+    # Skip invalid or zero quantity entries
+    items = [
+        item for item in items or []
+        if item.get("product_code") and item.get("quantity", 0) > 0
+    ]
     # No product codes provided
     if not items:
         return 0.00, None
-    try:
-        total_cost = 0.00
-        with conn.cursor(dictionary=True) as cursor:
-            for item in items:
-                code = item.get("product_code")
-                qty_sold = item.get("quantity", 0)
-                if not code or qty_sold <= 0:
-                    continue # Skip invalid or zero quantity entries
-                cursor.execute("""
-                    SELECT cost FROM products
-                    WHERE product_code = %s
-                """, (code,))
-                result = cursor.fetchone()
-                if result and result["cost"] is not None:
-                    item_cost = float(result["cost"])
-                    item_total = item_cost * qty_sold
-                    total_cost += item_total
-        return total_cost, None
-    except Exception as e:
-        return 0.00, f"Error fetching total cost: {e}."
+    costs, error = get_costs_by_codes(
+        conn, [item["product_code"] for item in items]
+    )
+    if error:
+        return 0.00, f"Error fetching total cost: {error}"
+    total_cost = sum(
+        costs.get(item["product_code"], 0.00) * item["quantity"]
+        for item in items
+    )
+    return total_cost, None
 
 
 def view_all_products(conn):
@@ -486,22 +512,14 @@ def fetch_product_control_logs(conn, year, month=None):
     """
     try:
         with conn.cursor(dictionary=True) as cursor:
-            if month:
-                cursor.execute("""
-                    SELECT log_date, product_code, product_name, description,
-                        quantity, total, user
-                    FROM product_control_logs
-                    WHERE YEAR(log_date) = %s AND MONTH(log_date) = %s
-                    ORDER BY log_date DESC;
-                """, (year, month))
-            else:
-                cursor.execute("""
-                    SELECT log_date, product_code, product_name, description,
-                        quantity, total, user
-                    FROM product_control_logs
-                    WHERE YEAR(log_date) = %s
-                    ORDER BY log_date DESC;
-                """, (year,))
+            period, params = period_filter("log_date", year, month)
+            cursor.execute(f"""
+                SELECT log_date, product_code, product_name, description,
+                    quantity, total, user
+                FROM product_control_logs
+                WHERE {period}
+                ORDER BY log_date DESC;
+            """, tuple(params))
             rows = cursor.fetchall()
             return True, rows if rows else []
     except Exception as e:
@@ -551,6 +569,7 @@ def get_product_codes(conn, keyword):
     except Exception as e:
         return False, f"Error searching product codes: {str(e)}."
 
+@transactional
 def update_min_stock_level(conn, product_code, quantity, user):
     try:
         with conn.cursor() as cursor:
@@ -569,11 +588,11 @@ def update_min_stock_level(conn, product_code, quantity, user):
         }
         success, message = log_stock_change(conn, data)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Error Updating Product Log: {message}."
-        conn.commit()
+        commit(conn)
         return True, "Minimum Quantity updated successfully."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error updating minimum quantity: {str(e)}."
 
@@ -1,13 +1,53 @@
 from datetime import date
 import datetime
-from working_on_stock import get_total_cost_by_codes
+from working_on_stock import get_costs_by_codes
 from working_on_accounting import SalesJournalRecorder
 from working_on_employee import insert_logs, insert_cashier_sale
+from connect_to_db import commit, rollback, transactional
+from query_utils import period_bounds, period_filter, KeysetQuery
+from sales_rollups import (
+    record_daily_sale, record_daily_refund, record_monthly_product_sales,
+    record_monthly_product_refund
+)
+
+def sale_journal_lines(amount_paid, cost, desc):
+    """Journal lines for a sale: the takings are held in Sales Control
+    until the cashier hands them over (CashierControl moves them to Sales
+    Revenue), and the goods move from Inventory to Cost of Goods Sold."""
+    return [
+        {"account_name": "Cash", "debit": float(amount_paid),
+         "credit": 0.00, "description": desc},
+        {"account_name": "Sales Control", "debit": 0.00,
+         "credit": float(amount_paid), "description": desc},
+        {"account_name": "Cost of Goods Sold", "debit": float(cost),
+         "credit": 0.00, "description": desc},
+        {"account_name": "Inventory", "debit": 0.00,
+         "credit": float(cost), "description": "Sales."}
+    ]
+
+
+def reversal_journal_lines(amount, cost):
+    """Journal lines undoing a sale of amount whose goods cost cost."""
+    return [
+        {"account_name": "Sales Revenue", "debit": float(amount),
+         "credit": 0.00, "description": "Sales Reversal."},
+        {"account_name": "Cash", "debit": 0.00, "credit": float(amount),
+         "description": "Sales Reversal"},
+        {"account_name": "Inventory", "debit": float(cost), "credit": 0.00,
+         "description": "Sales Reversal."},
+        {"account_name": "Cost of Goods Sold", "debit": 0.00,
+         "credit": float(cost), "description": "Sales Reversal."}
+    ]
+
 
 class SalesManager:
+    # username -> user_code, shared by every till in this session
+    _user_codes = {}
+
     def __init__(self, conn):
         self.conn = conn
         self.accounts = {
+            "Cash": {"type": "Asset", "description": "Cash In Hand"},
             "Sales Control": {
                 "type": "Revenue",
                 "description": "Sales collected by cashier"
@@ -22,33 +62,42 @@ class SalesManager:
         """Finalize the sale by recording journal entries in the
         accounting system."""
         recorder = SalesJournalRecorder(self.conn, user)
-        transaction_lines = [
-            {"account_name": "Cost of Goods Sold", "debit": float(cost),
-             "credit": 0, "description": desc},
-            {"account_name": "Inventory", "debit": 0,
-             "credit": float(cost), "description": "Sales."},
-            {"account_name": "Sales Control", "debit": 0.00,
-             "credit": float(amount_paid), "description": desc}
-        ]
+        transaction_lines = sale_journal_lines(amount_paid, cost, desc)
         return recorder.record_sales(
             self.accounts, transaction_lines, receipt_no, desc
         )
 
+    def get_user_code(self, cursor, user):
+        """Return the login user_code for user. Looked up once per session
+        and served from memory afterwards."""
+        user_code = self._user_codes.get(user)
+        if user_code is None:
+            cursor.execute("""
+            SELECT user_code FROM logins WHERE username = %s;
+            """, (user,))
+            result = cursor.fetchone()
+            if not result:
+                return None
+            user_code = result[0]
+            self._user_codes[user] = user_code
+        return user_code
+
+    @transactional
     def record_sale(self, user, sale_items, payment_method, amount_paid):
         """Record a complete sale transaction including: sales, sales items,
-        stock updates, payment entry, cost of goods sold, journal entries."""
+        stock updates, payment entry, cost of goods sold, journal entries.
+        Line items are written in bulk so the number of statements does not
+        grow with the basket size."""
         if not self.conn:
             return False, "Database connection failed."
+        if not sale_items:
+            return False, "No items to record."
         try:
             with self.conn.cursor() as cursor:
                 # Get user code from logins table
-                cursor.execute("""
-                SELECT user_code FROM logins WHERE username = %s;
-                """, (user,))
-                result = cursor.fetchone()
-                if not result:
+                user_code = self.get_user_code(cursor, user)
+                if not user_code:
                     return False, f"User '{user}' not found in logins table."
-                user_code = result[0]
                 # Generate receipt no: <user_code><YMD><HHMMSS>
                 now = datetime.datetime.now()
                 receipt_no = f"{user_code}{now.strftime('%y%m%d%H%M%S')}"
@@ -64,49 +113,57 @@ class SalesManager:
                     total_amount, user)
                 VALUES (%s, %s, %s, %s, %s)
                 """, (receipt_no, sale_date, sale_time, total_amount, user))
-                cogs_items = [] # List of product codes and quantity
-                # Insert each sale item into sale_items table
+                # Insert all sale items in one multi-row insert
+                cursor.executemany("""
+                INSERT INTO sale_items (date, time, receipt_no,
+                    product_code, product_name, quantity, unit_price,
+                    user)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """, [(
+                    sale_date,
+                    sale_time,
+                    receipt_no,
+                    item["product_code"],
+                    item["product_name"],
+                    item["quantity"],
+                    item["unit_price"],
+                    user,
+                ) for item in sale_items])
+                # Insert into product_control logs
+                description = f"Sale Receipt no.-{receipt_no}"
+                cursor.executemany("""
+                INSERT INTO product_control_logs (log_date, product_code,
+                    product_name, description, quantity, total, user)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """, [(
+                    sale_date,
+                    item["product_code"],
+                    item["product_name"],
+                    description,
+                    item["quantity"],
+                    item["quantity"] * item["unit_price"],
+                    user
+                ) for item in sale_items])
+                # Reduce quantity in products with a single UPDATE ... CASE
+                sold = {} # Quantity per product code (codes may repeat)
+                revenue = {}
                 for item in sale_items:
-                    cursor.execute("""
-                    INSERT INTO sale_items (date, time, receipt_no,
-                        product_code, product_name, quantity, unit_price,
-                        user)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (
-                        sale_date,
-                        sale_time,
-                        receipt_no,
-                        item["product_code"],
-                        item["product_name"],
-                        item["quantity"],
-                        item["unit_price"],
-                        user,
-                    ))
-                    # Reduce quantity in products
-                    cursor.execute("""
-                    UPDATE products
-                    SET quantity = quantity - %s
-                    WHERE product_code=%s
-                    """, (item["quantity"], item["product_code"]))
-                    # Insert into product_control logs
-                    description = f"Sale Receipt no.-{receipt_no}"
-                    cursor.execute("""
-                    INSERT INTO product_control_logs (log_date, product_code,
-                        product_name, description, quantity, total, user)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """, (
-                        sale_date,
-                        item["product_code"],
-                        item["product_name"],
-                        description,
-                        item["quantity"],
-                        item["quantity"] * item["unit_price"],
-                        user
-                    ))
-                    cogs_items.append({
-                        "product_code": item["product_code"],
-                        "quantity": item["quantity"]
-                    })
+                    code = item["product_code"]
+                    sold[code] = sold.get(code, 0) + item["quantity"]
+                    revenue[code] = revenue.get(code, 0) + (
+                        item["quantity"] * item["unit_price"]
+                    )
+                cases = " ".join("WHEN %s THEN %s" for _ in sold)
+                codes = ", ".join(["%s"] * len(sold))
+                params = [value for pair in sold.items() for value in pair]
+                params.extend(sold)
+                cursor.execute(f"""
+                UPDATE products
+                SET quantity = quantity - CASE product_code {cases} END
+                WHERE product_code IN ({codes})
+                """, tuple(params))
+                # Keep per-product "last sold" stats current
+                record_product_sales(cursor, sale_date, sold)
                 # Record payment in payments
                 cursor.execute("""
                 INSERT INTO payments (user, receipt_no, payment_date,
@@ -116,36 +173,106 @@ class SalesManager:
                     user, receipt_no, sale_date, amount_paid, payment_method
                 ))
 
-            cost, error = get_total_cost_by_codes(self.conn, cogs_items)
+            costs, error = get_costs_by_codes(self.conn, list(sold))
             if error:
-                self.conn.rollback()
+                rollback(self.conn)
                 return False, f"Error Calculating Cost: {error}"
+            cogs = {
+                code: costs.get(code, 0.00) * qty
+                for code, qty in sold.items() if qty > 0
+            }
+            cost = sum(cogs.values())
+            with self.conn.cursor() as cursor:
+                # Rollups for reports, valued at today's cost
+                record_daily_sale(
+                    cursor, sale_date, user, total_amount,
+                    sum(sold.values()), cost
+                )
+                record_monthly_product_sales(cursor, sale_date, user, [
+                    (code, qty, revenue[code], cogs.get(code, 0.00))
+                    for code, qty in sold.items()
+                ])
             # Record Journal entries
             desc = f"Sales {receipt_no}."
             success, err = self.finalize_sales(
                 receipt_no, amount_paid, cost, user, desc
             )
             if not success:
-                self.conn.rollback()
+                rollback(self.conn)
                 return False, f"Error Recording Books of Accounts: {err}."
             action = f"Sale. {receipt_no}"
             success, msg = insert_cashier_sale(
                 self.conn, user, action, amount_paid
             )
             if not success:
-                self.conn.rollback()
+                rollback(self.conn)
                 return False, f"Error Recording Transaction: {msg}."
             desc = f"Sold Receipt #{receipt_no}. Amounting to {amount_paid}."
             success, msg = insert_logs(self.conn, user, "Sales", desc)
             if not success:
-                self.conn.rollback()
+                rollback(self.conn)
                 return False, f"Error Recording Logs: {msg}."
-            self.conn.commit()
+            commit(self.conn)
             return True, receipt_no
         except Exception as e:
-            self.conn.rollback()
+            rollback(self.conn)
             return False, f"Error recording sale: {e!s}"
 
+def record_product_sales(cursor, sale_date, sold):
+    """Upsert product_sales_stats for {product_code: quantity} sold on
+    sale_date. Counters belong to the month in stats_month and restart
+    when a sale falls in a newer month (units_mtd) or year (units_ytd)."""
+    month = sale_date.replace(day=1)
+    cursor.executemany("""
+    INSERT INTO product_sales_stats (product_code, first_sold, last_sold,
+        stats_month, units_ytd, units_mtd)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        units_ytd = IF(YEAR(stats_month) = YEAR(VALUES(stats_month)),
+            units_ytd + VALUES(units_ytd), VALUES(units_ytd)),
+        units_mtd = IF(stats_month = VALUES(stats_month),
+            units_mtd + VALUES(units_mtd), VALUES(units_mtd)),
+        last_sold = GREATEST(last_sold, VALUES(last_sold)),
+        stats_month = GREATEST(stats_month, VALUES(stats_month))
+    """, [
+        (code, sale_date, sale_date, month, qty, qty)
+        for code, qty in sold.items()
+    ])
+
+
+def fill_product_sales_stats(cursor, today=None):
+    """Recompute product_sales_stats from the whole sale_items history."""
+    today = today or date.today()
+    year_start, year_end = period_bounds(today.year)
+    month_start, month_end = period_bounds(today.year, today.month)
+    cursor.execute("DELETE FROM product_sales_stats;")
+    cursor.execute("""
+    INSERT INTO product_sales_stats (product_code, first_sold, last_sold,
+        stats_month, units_ytd, units_mtd)
+    SELECT product_code, MIN(date), MAX(date), %s,
+        COALESCE(SUM(CASE WHEN date >= %s AND date < %s
+            THEN quantity END), 0),
+        COALESCE(SUM(CASE WHEN date >= %s AND date < %s
+            THEN quantity END), 0)
+    FROM sale_items
+    GROUP BY product_code;
+    """, (month_start, year_start, year_end, month_start, month_end))
+    return cursor.rowcount
+
+
+@transactional
+def rebuild_product_sales_stats(conn):
+    """Rebuild the "last sold" stats table from existing sales."""
+    try:
+        with conn.cursor() as cursor:
+            count = fill_product_sales_stats(cursor)
+        commit(conn)
+        return True, f"Sales Stats Rebuilt For {count} Products."
+    except Exception as e:
+        rollback(conn)
+        return False, f"Error Rebuilding Sales Stats: {str(e)}."
+
+
 def fetch_sales_product(conn, product_code):
     """Fetch product details by product code."""
     try:
@@ -229,18 +356,17 @@ def fetch_sales_last_24_hours(conn, username):
 
 def fetch_sales_by_month_and_user(conn, year, month, user=None):
     """Fetch total sales grouped by day for given month/ year.
-    Optionally filter by user."""
+    Optionally filter by user. Read from sales_daily_rollup."""
     try:
         with conn.cursor(dictionary=True) as cursor:
-            query = """
+            period, params = period_filter("sale_date", year, month)
+            query = f"""
                 SELECT
                     sale_date,
-                    SUM(total_amount) AS daily_total
-                FROM sales
-                WHERE YEAR(sale_date) = %s
-                    AND MONTH(sale_date) = %s
+                    SUM(gross - refunds) AS daily_total
+                FROM sales_daily_rollup
+                WHERE {period}
                 """
-            params = [year, month]
             # Optional filter
             if user:
                 query += " AND user = %s"
@@ -291,20 +417,17 @@ def fetch_sale_by_year(conn, year, month=None, user=None):
     user."""
     try:
         with conn.cursor(dictionary=True) as cursor:
-            query = """
+            period, params = period_filter("sale_date", year, month)
+            query = f"""
                 SELECT
                     sale_date,
                     receipt_no,
                     user,
                     total_amount
                 FROM sales
-                WHERE YEAR(sale_date) = %s
+                WHERE {period}
             """
-            params = [year]
             # Optional filters
-            if month:
-                query += " AND MONTH(sale_date) = %s"
-                params.append(month)
             if user:
                 query += " AND user = %s"
                 params.append(user)
@@ -316,6 +439,32 @@ def fetch_sale_by_year(conn, year, month=None, user=None):
         return [], str(e)
 
 
+def fetch_daily_sales_by_user(conn, year, month=None, user=None):
+    """Net sales per day and user from sales_daily_rollup, shaped like
+    fetch_sale_by_year rows (sale_date, user, total_amount) for charts."""
+    try:
+        with conn.cursor(dictionary=True) as cursor:
+            period, params = period_filter("sale_date", year, month)
+            query = f"""
+                SELECT
+                    sale_date,
+                    user,
+                    receipts,
+                    gross - refunds AS total_amount
+                FROM sales_daily_rollup
+                WHERE {period}
+            """
+            if user:
+                query += " AND user = %s"
+                params.append(user)
+            query += " ORDER BY sale_date ASC, user ASC"
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            return rows, None
+    except Exception as e:
+        return [], str(e)
+
+
 def fetch_filter_values(conn):
     """Fetch distinct product names and users from sales table."""
     try:
@@ -345,31 +494,33 @@ def fetch_filter_values(conn):
 def fetch_sales_summary_by_year(conn, year, month=None, user=None):
     """Fetch sales summary data for a given year, with option to filter
     by month and user. Group by product_code and product_name. Return
-    total quantity, unit cost and total amount for each product."""
+    total quantity, unit cost and total amount for each product.
+    Read from product_sales_monthly; unit cost is the average cost at
+    the time of sale."""
     try:
         with conn.cursor(dictionary=True) as cursor:
             query = """
                 SELECT
-                    si.product_code,
-                    si.product_name,
-                    SUM(si.quantity) AS total_quantity,
-                    SUM(si.total_amount) AS total_amount,
-                    p.cost AS unit_cost
-                FROM sale_items si
-                JOIN products p ON si.product_code = p.product_code
-                WHERE YEAR(date) = %s
+                    m.product_code,
+                    COALESCE(p.product_name, m.product_code) AS product_name,
+                    SUM(m.qty) AS total_quantity,
+                    SUM(m.revenue) AS total_amount,
+                    SUM(m.cogs) / SUM(m.qty) AS unit_cost
+                FROM product_sales_monthly m
+                LEFT JOIN products p ON m.product_code = p.product_code
+                WHERE m.year = %s
             """
-            params = [year]
+            params = [int(year)]
             # Optional filters
             if month:
-                query += " AND MONTH(si.date) = %s"
-                params.append(month)
+                query += " AND m.month = %s"
+                params.append(int(month))
             if user:
-                query += " AND si.user = %s"
+                query += " AND m.user = %s"
                 params.append(user)
             query += """
-                GROUP BY si.product_code, si.product_name, p.cost
-                HAVING SUM(si.quantity) > 0
+                GROUP BY m.product_code, p.product_name
+                HAVING SUM(m.qty) > 0
                 ORDER BY total_amount DESC"""
             cursor.execute(query, tuple(params))
             rows = cursor.fetchall()
@@ -378,43 +529,47 @@ def fetch_sales_summary_by_year(conn, year, month=None, user=None):
         return [], str(e)
 
 
+def sales_items_query(year, month=None, day=None, user=None):
+    """KeysetQuery over sale_items filtered like fetch_sales_items,
+    newest first."""
+    if day and not month:
+        # A day without a month cannot be a single range
+        period, params = period_filter("date", year)
+        period += " AND DAY(date) = %s"
+        params.append(day)
+    else:
+        period, params = period_filter("date", year, month, day)
+    period = f"quantity > 0 AND {period}"
+    if user:
+        period += " AND user = %s"
+        params.append(user)
+    return KeysetQuery("""
+        SELECT
+            id,
+            date,
+            time,
+            user,
+            receipt_no,
+            product_code,
+            product_name,
+            quantity,
+            unit_price,
+            total_amount
+        FROM sale_items
+    """, ["date", "time", "id"], period, params)
+
+
 def fetch_sales_items(conn, year, month=None, day=None, user=None):
     """Fetch sales items details by year with filters for: month, day
     and user. Returns a list of dicts."""
     try:
-        with conn.cursor(dictionary=True) as cursor:
-            query = """
-                SELECT
-                    date,
-                    user,
-                    receipt_no,
-                    product_code,
-                    product_name,
-                    quantity,
-                    unit_price,
-                    total_amount
-                FROM sale_items
-                WHERE quantity > 0 AND YEAR(date) = %s
-            """
-            params = [year]
-            if month:
-                query += " AND MONTH(date) = %s"
-                params.append(month)
-            if day:
-                query += " AND DAY(date) = %s"
-                params.append(day)
-            if user:
-                query += " AND user = %s"
-                params.append(user)
-            query += " ORDER BY date DESC, time DESC"
-
-            cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
-            return rows, None
+        rows = sales_items_query(year, month, day, user).all(conn)
+        return rows, None
     except Exception as e:
         return [], str(e)
 
 
+@transactional
 def insert_to_sale_control(conn, entries):
     try:
         now = datetime.datetime.today()
@@ -448,15 +603,16 @@ def insert_to_sale_control(conn, entries):
             desc = entry["description"]
             success, msg = insert_logs(conn, user, "Sales", desc)
             if not success:
-                conn.rollback()
+                rollback(conn)
                 return False, f"Error Recording Logs: {msg}."
-        conn.commit()
+        commit(conn)
         return True, None
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, str(e)
 
 
+@transactional
 def tag_reversal(conn, receipt, code, name, price, quantity, refund, user):
     try:
         s_date = datetime.datetime.today().date()
@@ -477,16 +633,17 @@ def tag_reversal(conn, receipt, code, name, price, quantity, refund, user):
             }
             success, err = insert_to_sale_control(conn, entry)
             if success:
-                conn.commit()
+                commit(conn)
                 return True, "Reversal Tagged Successfully."
             else:
-                conn.rollback()
+                rollback(conn)
                 return False, f"Error Tagging Reversal: {str(err)}"
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error: {str(e)}"
 
 
+@transactional
 def authorize_reversal(conn, receipt_no, product_code, username):
     try:
         with conn.cursor() as cursor:
@@ -504,16 +661,17 @@ def authorize_reversal(conn, receipt_no, product_code, username):
             }
             success, err = insert_to_sale_control(conn, entry)
             if success:
-                conn.commit()
+                commit(conn)
                 return True, "Reversal authorized successfully."
             else:
-                conn.rollback()
+                rollback(conn)
                 return False, f"Error Authorizing Reversal: {str(err)}"
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error authorizing reversal: {str(e)}"
 
 
+@transactional
 def reject_tagged_reversal(conn, receipt_no, product_code, username):
     """Reject tagged reversal instead of Authorizing it."""
     try:
@@ -535,16 +693,17 @@ def reject_tagged_reversal(conn, receipt_no, product_code, username):
             }
             success, err = insert_to_sale_control(conn, entry)
             if success:
-                conn.commit()
+                commit(conn)
                 return True, "Reversal Rejected Successfully."
             else:
-                conn.rollback()
+                rollback(conn)
                 return False, f"Error Rejecting Reversal: {str(err)}"
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Rejecting Reversal: {str(e)}"
 
 
+@transactional
 def delete_rejected_reversal(conn, receipt_no, product_code, username):
     """Delete a specific reversal where authorized = 'Rejected' using
     receipt, product code and user."""
@@ -566,16 +725,17 @@ def delete_rejected_reversal(conn, receipt_no, product_code, username):
             }
             success, err = insert_to_sale_control(conn, entry)
             if success:
-                conn.commit()
+                commit(conn)
                 return True, "Rejected Reversal Deleted Successfully."
             else:
-                conn.rollback()
+                rollback(conn)
                 return False, f"Error Deleting rejected Reversal: {str(err)}"
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Deleting Reversal: {str(e)}"
 
 
+@transactional
 def post_reversal(conn, receipt, code, user, qty, price):
     try:
         with conn.cursor(dictionary=True) as cursor:
@@ -597,7 +757,7 @@ def post_reversal(conn, receipt, code, user, qty, price):
             conn, receipt, code, qty, price, user
         )
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Failed to update sale item: {err}"
         with conn.cursor() as cursor:
             # Update posted column
@@ -615,21 +775,32 @@ def post_reversal(conn, receipt, code, user, qty, price):
         }
         success, err = insert_to_sale_control(conn, entry)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, f"Error Posting Reversal: {str(err)}."
         # Commit transaction
-        conn.commit()
+        commit(conn)
         return True, "Reversal Posted successfully."
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, f"Error Posting reversal: {str(e)}"
 
 
+def _sold_amount(cursor, receipt_no, code):
+    """Value of a product's sale_items rows on a receipt (dict cursor)."""
+    cursor.execute("""
+        SELECT COALESCE(SUM(quantity * unit_price), 0) AS amount
+        FROM sale_items WHERE receipt_no = %s AND product_code = %s
+    """, (receipt_no, code))
+    return cursor.fetchone()["amount"]
+
+
+@transactional
 def update_sale_item(conn, receipt_no, code, quantity, unit_price, user):
     """Updates product quantity after reversal, reducing quantity sold,
     total sale amount and increasing available quantity."""
     try:
         with conn.cursor(dictionary=True) as cursor:
+            sold_before = _sold_amount(cursor, receipt_no, code)
             # Update the sale items record
             cursor.execute("""
                 UPDATE sale_items
@@ -650,32 +821,53 @@ def update_sale_item(conn, receipt_no, code, quantity, unit_price, user):
                 SET quantity = quantity + %s
                 WHERE product_code = %s
             """, (quantity, code))
+            # Take reversed units off the period counters the sale was in
+            cursor.execute("""
+                UPDATE product_sales_stats ps
+                JOIN sale_items si ON si.product_code = ps.product_code
+                    AND si.receipt_no = %s
+                SET ps.units_mtd = IF(si.date >= ps.stats_month,
+                        GREATEST(ps.units_mtd - %s, 0), ps.units_mtd),
+                    ps.units_ytd = IF(YEAR(si.date) = YEAR(ps.stats_month),
+                        GREATEST(ps.units_ytd - %s, 0), ps.units_ytd)
+                WHERE ps.product_code = %s
+            """, (receipt_no, quantity, quantity, code))
+            record_daily_refund(
+                cursor, receipt_no, code, quantity, total_cost
+            )
+            # The row is repriced at unit_price, so the product's month
+            # loses what sale_items lost, matching a rollup rebuild
+            record_monthly_product_refund(
+                cursor, receipt_no, code, quantity,
+                sold_before - _sold_amount(cursor, receipt_no, code)
+            )
+        costs, error = get_costs_by_codes(conn, [code])
+        if error:
+            rollback(conn)
+            return False, error
+        cost = quantity * costs.get(code, 0.00)
         recorder = SalesJournalRecorder(conn, user)
         accounts = {
             "Sales Revenue": {"type": "Revenue",
                               "description": "Income from sales"},
             "Cash": {"type": "Asset", "description": "Cash In Hand"},
-            "Inventory": {"type": "Asset", "description": "Stock Value"}
+            "Inventory": {"type": "Asset", "description": "Stock Value"},
+            "Cost of Goods Sold": {
+                "type": "Expense", "description": "Expense of Sales"
+            }
         }
-        lines = [
-            {"account_name": "Cash", "debit": 0, "credit": total_cost,
-             "description": "Sales Reversal"},
-            {"account_name": "Sales Revenue", "debit": total_cost, "credit": 0,
-             "description": "Sales Reversal."},
-            {"account_name": "Inventory", "debit": total_cost, "credit": 0,
-             "description": "Sales Reversal."}
-        ]
+        lines = reversal_journal_lines(total_cost, cost)
         action = f"Sale Reversal of Product Code: {code}"
         success, error =recorder.record_sales(accounts, lines, receipt_no,
                                               action)
         if not success:
-            conn.rollback()
+            rollback(conn)
             return False, str(error)
         else:
-            conn.commit()
+            commit(conn)
             return True, None
     except Exception as e:
-        conn.rollback()
+        rollback(conn)
         return False, str(e)
 
 
@@ -734,17 +926,13 @@ def fetch_reversals_by_month(conn, year, month=None):
     """Fetch all reversals from sales reversals for a given year and month."""
     try:
         with conn.cursor(dictionary=True) as cursor:
-            query = """
+            period, params = period_filter("date", year, month)
+            query = f"""
             SELECT date, receipt_no, product_code, product_name, unit_price,
                 quantity, refund, tag, authorized, posted
             FROM sales_reversal
-            WHERE YEAR(date) = %s
+            WHERE {period}
             """
-            params = [year]
-            # Optional filters
-            if month:
-                query += " AND MONTH(date) = %s"
-                params.append(month)
             query += " ORDER BY date DESC;"
             cursor.execute(query, tuple(params))
             rows = cursor.fetchall()
@@ -767,33 +955,29 @@ def fetch_distinct_years(conn):
     except Exception as e:
         return None, str(e)
 
+def sales_logs_query(year, month=None, username=None):
+    """KeysetQuery over sales_control filtered like fetch_sales_logs,
+    newest first."""
+    period, params = period_filter("date", year, month)
+    # Optional filters
+    if username:
+        period += " AND user = %s"
+        params.append(username)
+    return KeysetQuery("""
+        SELECT id, date, time, product_code, receipt_no, description, user
+        FROM sales_control
+    """, ["date", "time", "id"], period, params)
+
+
 def fetch_sales_logs(conn, year, month=None, username=None):
     """Fetch logs from Finance logs table filtered by year, and optionally
     by month, username and section.
     Returns: (bool, list or str): (True, [rows]) on success,
     (False, error_msg) on failure."""
     try:
-        with conn.cursor(dictionary=True) as cursor:
-            query = """
-                SELECT date, time, product_code, receipt_no, description, user
-                FROM sales_control
-                WHERE YEAR(date) = %s
-            """
-            params = [year]
-
-            # Optional filters
-            if month:
-                query += " AND MONTH(date) = %s"
-                params.append(month)
-            if username:
-                query += " AND user = %s"
-                params.append(username)
-
-            # Order by most recent first
-            query += " ORDER BY date DESC, time DESC;"
-            cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
-            return True, rows
+        # Order by most recent first
+        rows = sales_logs_query(year, month, username).all(conn)
+        return True, rows
     except Exception as e:
         return False, f"Error: {str(e)}."
 
@@ -910,6 +1094,7 @@ class CashierControl:
             desc
         )
 
+    @transactional
     def return_to_treasury(self, details):
         """Records cash returned to treasury and balance carried forward."""
         try:
@@ -941,21 +1126,22 @@ class CashierControl:
                 f"Cash Returned by {username} to {self.user}."
             )
             if not ok:
-                self.conn.rollback()
+                rollback(self.conn)
                 return False, msg
             action = f"Received {amount:,.2f} Sales From Cashier {username}."
             success, msg = insert_logs(
                 self.conn, self.user, "Sales", action
             )
             if not success:
-                self.conn.rollback()
+                rollback(self.conn)
                 return False, f"Failed to Log Action: {msg}."
-            self.conn.commit()
+            commit(self.conn)
             return True, "Cash Returned to Treasury Successfully."
         except Exception as e:
-            self.conn.rollback()
+            rollback(self.conn)
             return False, f"Error Returning to Treasury: {str(e)}."
 
+    @transactional
     def end_transaction_day(self, details):
         """Ends cashier transaction day:
         - Records final cash
@@ -1009,19 +1195,19 @@ class CashierControl:
                 f"End Of Day cash for {username} to {self.user}."
             )
             if not ok:
-                self.conn.rollback()
+                rollback(self.conn)
                 return False, f"Error Recording Journal: {msg}"
             action = f"Ended Day For {username} with Ksh. {amount:,.2f}."
             success, msg = insert_logs(
                 self.conn, self.user, "Sales", action
             )
             if not success:
-                self.conn.rollback()
+                rollback(self.conn)
                 return False, f"Failed to Log Action: {msg}."
-            self.conn.commit()
+            commit(self.conn)
             return True, "Transaction Day Closed Successfully."
         except Exception as e:
-            self.conn.rollback()
+            rollback(self.conn)
             return False, f"Error Ending Transaction Day: {str(e)}."
 
 